@@ -18,7 +18,13 @@
 
 from qgis.core import QgsApplication, QgsMapLayer, QgsProject
 from qgis.PyQt.QtCore import QSettings, Qt, QTimer
-from qgis.PyQt.QtWidgets import QDialog, QHeaderView, QMessageBox, QTableView
+from qgis.PyQt.QtWidgets import (
+    QDialog,
+    QHeaderView,
+    QInputDialog,
+    QMessageBox,
+    QTableView,
+)
 
 import QgisModelBaker.libs.modelbaker.utils.db_utils as db_utils
 from QgisModelBaker.gui.basket_manager import BasketManagerDialog
@@ -30,7 +36,9 @@ from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbconfig import (
     Ili2DbCommandConfiguration,
 )
 from QgisModelBaker.libs.modelbaker.utils.globals import DbActionType
+from QgisModelBaker.libs.modelbaker.utils.qt_utils import OverrideCursor
 from QgisModelBaker.utils import gui_utils
+from QgisModelBaker.utils.dataset_utils import DatasetStore, DatasetStoreError
 from QgisModelBaker.utils.globals import displayDbIliMode
 from QgisModelBaker.utils.gui_utils import DatasetModel
 
@@ -66,13 +74,16 @@ class DatasetManagerDialog(QDialog, DIALOG_UI):
         self.db_frame.setHidden(wizard_embedded)
 
         self.dataset_model = DatasetModel()
+        self.dataset_tableview.setModel(self.dataset_model)
         self.dataset_tableview.horizontalHeader().setSectionResizeMode(
-            QHeaderView.Stretch
+            QHeaderView.ResizeToContents
+        )
+        self.dataset_tableview.horizontalHeader().setSectionResizeMode(
+            DatasetModel.Columns.DATASETNAME, QHeaderView.Stretch
         )
-        self.dataset_tableview.horizontalHeader().hide()
         self.dataset_tableview.verticalHeader().hide()
-        self.dataset_tableview.setSelectionMode(QTableView.SingleSelection)
-        self.dataset_tableview.setModel(self.dataset_model)
+        self.dataset_tableview.setSelectionMode(QTableView.ExtendedSelection)
+        self.dataset_tableview.setSelectionBehavior(QTableView.SelectRows)
 
         self._restore_configuration()
 
@@ -88,8 +99,18 @@ class DatasetManagerDialog(QDialog, DIALOG_UI):
 
         self._refresh_datasets(self._updated_configuration())
 
+        # filter on the database when the typing stops
+        self.filterTimer = QTimer()
+        self.filterTimer.setSingleShot(True)
+        self.filterTimer.timeout.connect(
+            lambda: self.dataset_model.set_filter_text(self.filter_line_edit.text())
+        )
+        self.filter_line_edit.textChanged.connect(lambda: self.filterTimer.start(300))
+
         self.add_button.clicked.connect(self._add_dataset)
         self.edit_button.clicked.connect(self._edit_dataset)
+        self.copy_button.clicked.connect(self._copy_datasets)
+        self.delete_button.clicked.connect(self._delete_datasets)
         self.basket_manager_button.clicked.connect(self._open_basket_manager)
         self.dataset_tableview.selectionModel().selectionChanged.connect(
             lambda: self._enable_dataset_handling(True)
@@ -97,6 +118,8 @@ class DatasetManagerDialog(QDialog, DIALOG_UI):
 
         self.add_button.setIcon(QgsApplication.getThemeIcon("/symbologyAdd.svg"))
         self.edit_button.setIcon(QgsApplication.getThemeIcon("/symbologyEdit.svg"))
+        self.copy_button.setIcon(QgsApplication.getThemeIcon("/mActionEditCopy.svg"))
+        self.delete_button.setIcon(QgsApplication.getThemeIcon("/symbologyRemove.svg"))
 
     def _close_editing(self):
         editable_layers = []
@@ -124,11 +147,27 @@ class DatasetManagerDialog(QDialog, DIALOG_UI):
         """
         return bool(self.dataset_tableview.selectedIndexes())
 
+    def _selected_datasets(self):
+        """
+        Returns the t_id and the name of the selected datasets
+        """
+        return [
+            (
+                index.data(int(DatasetModel.Roles.TID)),
+                index.data(int(DatasetModel.Roles.DATASETNAME)),
+            )
+            for index in self.dataset_tableview.selectionModel().selectedRows(
+                DatasetModel.Columns.DATASETNAME
+            )
+        ]
+
     def _enable_dataset_handling(self, enable):
         self.dataset_tableview.setEnabled(enable)
         self.add_button.setEnabled(enable)
         self.edit_button.setEnabled(self._valid_selection())
-        self.basket_manager_button.setEnabled(self._valid_selection())
+        self.copy_button.setEnabled(self._valid_selection())
+        self.delete_button.setEnabled(self._valid_selection())
+        self.basket_manager_button.setEnabled(len(self._selected_datasets()) == 1)
 
     def _type_changed(self):
         ili_mode = self.type_combo_box.currentData()
@@ -152,7 +191,10 @@ class DatasetManagerDialog(QDialog, DIALOG_UI):
         db_connector = db_utils.get_db_connector(configuration)
         if db_connector and db_connector.get_basket_handling:
             self._enable_dataset_handling(True)
-            return self.dataset_model.refresh_model(db_connector)
+            return self.dataset_model.refresh_model(
+                db_connector,
+                db_utils.get_schema_identificator_from_configuration(configuration),
+            )
         else:
             self._enable_dataset_handling(False)
             return self.dataset_model.clear()
@@ -166,7 +208,16 @@ class DatasetManagerDialog(QDialog, DIALOG_UI):
             self._jump_to_entry(edit_dataset_dialog.dataset_line_edit.text())
 
     def _edit_dataset(self):
-        if self._valid_selection():
+        if len(self._selected_datasets()) > 1:
+            datasets = self._selected_datasets()
+            datasetnames = self._new_datasetnames(
+                datasets, self.tr("Rename Datasets"), "{name}"
+            )
+            if datasetnames:
+                self._run_bulk_operation(
+                    self.tr("Rename Datasets"), "rename_datasets", datasetnames
+                )
+        elif self._valid_selection():
             db_connector = db_utils.get_db_connector(self._updated_configuration())
             if db_connector and db_connector.get_basket_handling:
                 dataset = (
@@ -182,6 +233,113 @@ class DatasetManagerDialog(QDialog, DIALOG_UI):
                 self._refresh_datasets(self._updated_configuration())
                 self._jump_to_entry(edit_dataset_dialog.dataset_line_edit.text())
 
+    def _copy_datasets(self):
+        datasets = self._selected_datasets()
+        if not datasets:
+            return
+        datasetnames = self._new_datasetnames(
+            datasets, self.tr("Copy Datasets"), "{name}_copy"
+        )
+        if datasetnames and self._confirm_bulk_operation(
+            datasets,
+            self.tr("Copy Datasets"),
+            self.tr(
+                "Copy {datasets} dataset(s) with {baskets} basket(s) and {objects} object(s) into new datasets?"
+            ),
+        ):
+            self._run_bulk_operation(
+                self.tr("Copy Datasets"), "copy_datasets", datasetnames
+            )
+            self._jump_to_entry(next(iter(datasetnames.values())))
+
+    def _delete_datasets(self):
+        datasets = self._selected_datasets()
+        if datasets and self._confirm_bulk_operation(
+            datasets,
+            self.tr("Delete Datasets"),
+            self.tr(
+                "Delete {datasets} dataset(s) with {baskets} basket(s) and {objects} object(s)?\nThis cannot be undone."
+            ),
+        ):
+            self._run_bulk_operation(
+                self.tr("Delete Datasets"),
+                "delete_datasets",
+                [tid for tid, _ in datasets],
+            )
+
+    def _new_datasetnames(self, datasets, title, default_pattern):
+        """
+        Asks for the new name of a single dataset or a name pattern for multiple datasets.
+        Returns a dict with the t_id and the new name.
+        """
+        if len(datasets) == 1:
+            tid, datasetname = datasets[0]
+            text, ok = QInputDialog.getText(
+                self,
+                title,
+                self.tr("Dataset name"),
+                text=default_pattern.replace("{name}", datasetname),
+            )
+            return {tid: text} if ok and text else {}
+        text, ok = QInputDialog.getText(
+            self,
+            title,
+            self.tr("Dataset names ({name} is replaced by the current name)"),
+            text=default_pattern,
+        )
+        if not ok or "{name}" not in text:
+            return {}
+        return {
+            tid: text.replace("{name}", datasetname) for tid, datasetname in datasets
+        }
+
+    def _dataset_store(self):
+        db_connector = db_utils.get_db_connector(self._updated_configuration())
+        if db_connector and db_connector.get_basket_handling:
+            return DatasetStore(db_connector)
+        return None
+
+    def _confirm_bulk_operation(self, datasets, title, question):
+        """
+        Shows the number of datasets, baskets and objects affected and asks to continue.
+        """
+        dataset_store = self._dataset_store()
+        if not dataset_store:
+            return False
+        with OverrideCursor(Qt.WaitCursor):
+            dataset_count, basket_count, object_count = dataset_store.affected_rows(
+                [tid for tid, _ in datasets]
+            )
+        return (
+            QMessageBox.question(
+                self,
+                title,
+                question.format(
+                    datasets=dataset_count, baskets=basket_count, objects=object_count
+                ),
+            )
+            == QMessageBox.Yes
+        )
+
+    def _run_bulk_operation(self, title, operation, *args):
+        """
+        Runs the DatasetStore operation in one transaction and refreshes the datasets.
+        """
+        dataset_store = self._dataset_store()
+        if not dataset_store:
+            return
+        try:
+            with OverrideCursor(Qt.WaitCursor):
+                getattr(dataset_store, operation)(*args)
+        except DatasetStoreError as e:
+            QMessageBox.critical(
+                self,
+                title,
+                self.tr("Nothing has been changed in the database: {}").format(e),
+            )
+        self.dataset_model.invalidate_counts()
+        self._refresh_datasets(self._updated_configuration())
+
     def _open_basket_manager(self):
         if self._valid_selection():
             db_connector = db_utils.get_db_connector(self._updated_configuration())
@@ -193,18 +351,14 @@ class DatasetManagerDialog(QDialog, DIALOG_UI):
                     self, db_connector, datasetname
                 )
                 basket_manager_dialog.exec_()
+                self.dataset_model.invalidate_counts()
 
     def _jump_to_entry(self, datasetname):
-        matches = self.dataset_model.match(
-            self.dataset_model.index(0, 0),
-            Qt.DisplayRole,
-            datasetname,
-            1,
-            Qt.MatchExactly,
-        )
-        if matches:
-            self.dataset_tableview.setCurrentIndex(matches[0])
-            self.dataset_tableview.scrollTo(matches[0])
+        row = self.dataset_model.fetch_until(datasetname)
+        if row >= 0:
+            index = self.dataset_model.index(row, DatasetModel.Columns.DATASETNAME)
+            self.dataset_tableview.setCurrentIndex(index)
+            self.dataset_tableview.scrollTo(index)
 
     def _restore_configuration(self):
         settings = QSettings()
@@ -16,10 +16,14 @@
  *                                                                         *
  ***************************************************************************/
 """
+import copy
+import os
+import pathlib
 import webbrowser
 
-from qgis.PyQt.QtCore import QLocale, QSettings
-from qgis.PyQt.QtWidgets import QDialog
+from qgis.core import QgsApplication, QgsTask
+from qgis.PyQt.QtCore import QLocale, QSettings, Qt
+from qgis.PyQt.QtWidgets import QDialog, QFileDialog, QMessageBox, QProgressDialog
 
 from QgisModelBaker.gui.custom_model_dir import CustomModelDirDialog
 from QgisModelBaker.libs.modelbaker.db_factory.db_simple_factory import DbSimpleFactory
@@ -30,19 +34,70 @@ from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbconfig import (
     SchemaImportConfiguration,
 )
 from QgisModelBaker.libs.modelbaker.utils import qt_utils
-from QgisModelBaker.libs.modelbaker.utils.qt_utils import FileValidator, Validators
+from QgisModelBaker.libs.modelbaker.utils.qt_utils import (
+    FileValidator,
+    OverrideCursor,
+    Validators,
+)
 from QgisModelBaker.utils import gui_utils
 from QgisModelBaker.utils.gui_utils import DropMode
+from QgisModelBaker.utils.mirror_utils import (
+    MirrorBundleCanceled,
+    MirrorBundleError,
+    RepositoryMirror,
+    offline_model_directories,
+)
+from QgisModelBaker.utils.repository_utils import (
+    RepositoryIndex,
+    repository_directories,
+)
 
 DIALOG_UI = gui_utils.get_ui_class("options.ui")
 
 
+class OfflineBundleExportTask(QgsTask):
+    """
+    Collects the files of the models in the repositories and writes the offline bundle in the background.
+    The repository index is created in the thread of the task, since its requests run in the thread creating it.
+    """
+
+    def __init__(self, repositories, models, archive_path, description):
+        QgsTask.__init__(self, description, QgsTask.CanCancel)
+        self.repositories = repositories
+        self.models = models
+        self.archive_path = archive_path
+        self.manifest = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.manifest = RepositoryMirror(RepositoryIndex()).export_bundle(
+                self.repositories, self.models, self.archive_path, self
+            )
+        except MirrorBundleCanceled:
+            self._remove_archive()
+            return False
+        except (MirrorBundleError, OSError) as e:
+            self.error = str(e)
+            self._remove_archive()
+            return False
+        return True
+
+    def _remove_archive(self):
+        try:
+            os.remove(self.archive_path)
+        except OSError:
+            pass
+
+
 class OptionsDialog(QDialog, DIALOG_UI):
     def __init__(self, configuration, parent=None):
         QDialog.__init__(self, parent)
         self.setupUi(self)
         self.configuration = configuration
         self.db_simple_factory = DbSimpleFactory()
+        self.export_task = None
+        self.export_progress_dialog = None
 
         self.pg_user_line_edit.setText(configuration.super_pg_user)
         self.pg_password_line_edit.setText(configuration.super_pg_password)
@@ -80,6 +135,8 @@ class OptionsDialog(QDialog, DIALOG_UI):
         self.buttonBox.accepted.connect(self.accepted)
         self.buttonBox.helpRequested.connect(self.help_requested)
         self.custom_models_dir_button.clicked.connect(self.show_custom_model_dir)
+        self.export_offline_bundle_button.clicked.connect(self.export_offline_bundle)
+        self.import_offline_bundle_button.clicked.connect(self.import_offline_bundle)
 
         for db_id in self.db_simple_factory.get_db_list(False):
             db_id |= DbIliMode.ili
@@ -127,6 +184,150 @@ class OptionsDialog(QDialog, DIALOG_UI):
         dlg = CustomModelDirDialog(self.custom_model_directories_line_edit.text(), self)
         dlg.exec_()
 
+    def export_offline_bundle(self):
+        archive_path, _ = QFileDialog.getSaveFileName(
+            self,
+            self.tr("Export Offline Bundle"),
+            "",
+            self.tr("Offline bundle (*.zip)"),
+        )
+        if not archive_path:
+            return
+        if not archive_path.lower().endswith(".zip"):
+            archive_path += ".zip"
+
+        # the repositories as currently set in the dialog
+        configuration = copy.copy(self.configuration)
+        configuration.custom_model_directories = (
+            self.custom_model_directories_line_edit.text()
+        )
+        configuration.custom_model_directories_enabled = (
+            self.custom_model_directories_box.isChecked()
+        )
+        models = [
+            model.strip()
+            for model in self.offline_bundle_models_line_edit.text().split(";")
+            if model.strip()
+        ]
+        if not models and (
+            QMessageBox.question(
+                self,
+                self.tr("Export Offline Bundle"),
+                self.tr(
+                    "No models given. Mirror all the models and datasets of all the repositories and their subsidiary sites?\nWith the default repositories this crawls the whole INTERLIS repository network and takes a long time."
+                ),
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            != QMessageBox.Yes
+        ):
+            return
+
+        self.export_task = OfflineBundleExportTask(
+            repository_directories(configuration),
+            models,
+            archive_path,
+            self.tr("Export Offline Bundle"),
+        )
+        self.export_progress_dialog = QProgressDialog(
+            self.tr("Collecting the files of the offline bundle…"),
+            self.tr("Cancel"),
+            0,
+            100,
+            self,
+        )
+        self.export_progress_dialog.setWindowTitle(self.tr("Export Offline Bundle"))
+        self.export_progress_dialog.setWindowModality(Qt.WindowModal)
+        self.export_progress_dialog.setAutoClose(False)
+        self.export_progress_dialog.setAutoReset(False)
+        self.export_progress_dialog.canceled.connect(self.export_task.cancel)
+        self.export_task.progressChanged.connect(
+            lambda progress: self.export_progress_dialog.setValue(int(progress))
+        )
+        self.export_task.taskCompleted.connect(self._offline_bundle_exported)
+        self.export_task.taskTerminated.connect(self._offline_bundle_exported)
+        self.export_progress_dialog.show()
+        QgsApplication.taskManager().addTask(self.export_task)
+
+    def _offline_bundle_exported(self):
+        task = self.export_task
+        self.export_task = None
+        # closing the progress dialog emits canceled
+        self.export_progress_dialog.canceled.disconnect()
+        self.export_progress_dialog.close()
+        if task.isCanceled():
+            return
+        if task.error:
+            QMessageBox.critical(
+                self,
+                self.tr("Export Offline Bundle"),
+                self.tr("Could not write the offline bundle: {}").format(task.error),
+            )
+            return
+
+        manifest = task.manifest
+        message = self.tr(
+            "{files} files of {models} models and {datasets} datasets written to {path}."
+        ).format(
+            files=len(manifest["files"]),
+            models=len(manifest["models"]),
+            datasets=len(manifest["datasets"]),
+            path=task.archive_path,
+        )
+        if manifest["failed"] or manifest["missing_datasets"]:
+            message += "\n\n" + self.tr("Not available:\n{}").format(
+                "\n".join(list(manifest["failed"]) + manifest["missing_datasets"])
+            )
+        QMessageBox.information(self, self.tr("Export Offline Bundle"), message)
+
+    def import_offline_bundle(self):
+        archive_path, _ = QFileDialog.getOpenFileName(
+            self,
+            self.tr("Import Offline Bundle"),
+            "",
+            self.tr("Offline bundle (*.zip)"),
+        )
+        if not archive_path:
+            return
+        parent_directory = QFileDialog.getExistingDirectory(
+            self,
+            self.tr("Select Folder for the Offline Repository"),
+            os.path.dirname(archive_path),
+        )
+        if not parent_directory:
+            return
+        target_directory = os.path.join(
+            parent_directory, pathlib.Path(archive_path).stem
+        )
+
+        try:
+            with OverrideCursor(Qt.WaitCursor):
+                manifest = RepositoryMirror().import_bundle(
+                    archive_path, target_directory
+                )
+        except MirrorBundleError as e:
+            QMessageBox.critical(self, self.tr("Import Offline Bundle"), str(e))
+            return
+
+        # the repositories are replaced by the offline repository
+        self.custom_model_directories_line_edit.setText(
+            offline_model_directories(
+                self.custom_model_directories_line_edit.text(), target_directory
+            )
+        )
+        self.custom_model_directories_box.setChecked(True)
+        QMessageBox.information(
+            self,
+            self.tr("Import Offline Bundle"),
+            self.tr(
+                "Offline repository with {models} models and {datasets} datasets extracted to {path}.\nIt's set as model directory instead of the repositories."
+            ).format(
+                models=len(manifest["models"]),
+                datasets=len(manifest["datasets"]),
+                path=target_directory,
+            ),
+        )
+
     def help_requested(self):
         os_language = QLocale(QSettings().value("locale/userLocale")).name()[:2]
         if os_language in ["es", "de"]:
@@ -25,6 +25,7 @@ from qgis.PyQt.QtCore import QAbstractTableModel, QModelIndex, Qt
 from qgis.PyQt.QtWidgets import QAbstractItemView, QHeaderView, QWidget
 
 import QgisModelBaker.utils.gui_utils as gui_utils
+from QgisModelBaker.utils.dataset_utils import DatasetStore
 from QgisModelBaker.utils.gui_utils import CheckDelegate
 
 WIDGET_UI = gui_utils.get_ui_class("basket_panel.ui")
@@ -163,19 +164,21 @@ class BasketModel(QAbstractTableModel):
     def load_basket_config(self, db_connector, dataset):
         self.beginResetModel()
         self.basket_settings.clear()
+        # the baskets of this dataset only, read once for all the topics
+        dataset_baskets = {
+            basket_record["topic"]: basket_record
+            for basket_record in DatasetStore(db_connector).baskets(dataset)
+        }
         for topic_record in db_connector.get_topics_info():
             basket_setting = {}
 
             topic_key = f"{topic_record['model']}.{topic_record['topic']}"
             # check if existing
-            existing = False
-            for basket_record in db_connector.get_baskets_info():
-                if (
-                    basket_record["datasetname"] == dataset
-                    and topic_key == basket_record["topic"]
-                ):
-                    existing = True
-                    basket_setting["bid_value"] = basket_record["basket_t_ili_tid"]
+            existing = topic_key in dataset_baskets
+            if existing:
+                basket_setting["bid_value"] = dataset_baskets[topic_key][
+                    "basket_t_ili_tid"
+                ]
 
             # if not existing "suggest" create if "relevant"
             basket_setting["existing"] = existing
@@ -18,6 +18,7 @@
 """
 
 
+from collections import OrderedDict
 from enum import Enum, IntEnum
 
 from qgis.core import QgsProject
@@ -70,12 +71,14 @@ class TIDModel(QAbstractTableModel):
     def __init__(self):
         super().__init__()
         self.oid_settings = {}
+        # the keys of oid_settings by row
+        self.oid_keys = []
 
     def columnCount(self, parent):
         return len(TIDModel.Columns)
 
     def rowCount(self, parent):
-        return len(self.oid_settings.keys())
+        return len(self.oid_keys)
 
     def flags(self, index):
         if index.column() == TIDModel.Columns.IN_FORM:
@@ -109,7 +112,7 @@ class TIDModel(QAbstractTableModel):
 
     def data(self, index, role):
         if role == int(Qt.DisplayRole) or role == int(Qt.EditRole):
-            key = list(self.oid_settings.keys())[index.row()]
+            key = self.oid_keys[index.row()]
             if index.column() == TIDModel.Columns.NAME:
                 return f"{key} ({self.oid_settings[key]['interlis_topic']})"
             if index.column() == TIDModel.Columns.OID_DOMAIN:
@@ -119,7 +122,7 @@ class TIDModel(QAbstractTableModel):
             if index.column() == TIDModel.Columns.IN_FORM:
                 return self.oid_settings[key]["in_form"]
         elif role == int(Qt.ToolTipRole):
-            key = list(self.oid_settings.keys())[index.row()]
+            key = self.oid_keys[index.row()]
             if index.column() == TIDModel.Columns.NAME:
                 return f"{key} ({self.oid_settings[key]['interlis_topic']})"
             if index.column() == TIDModel.Columns.OID_DOMAIN:
@@ -160,18 +163,18 @@ class TIDModel(QAbstractTableModel):
             if index.column() == TIDModel.Columns.IN_FORM:
                 return self.tr("Show t_ili_tid field (OID) in attribute form.")
         elif role == int(TIDModel.Roles.LAYER):
-            key = list(self.oid_settings.keys())[index.row()]
+            key = self.oid_keys[index.row()]
             return self.oid_settings[key]["layer"]
         return None
 
     def setData(self, index, data, role):
         if role == int(Qt.EditRole):
             if index.column() == TIDModel.Columns.DEFAULT_VALUE:
-                key = list(self.oid_settings.keys())[index.row()]
+                key = self.oid_keys[index.row()]
                 self.oid_settings[key]["default_value_expression"] = data
                 self.dataChanged.emit(index, index)
             if index.column() == TIDModel.Columns.IN_FORM:
-                key = list(self.oid_settings.keys())[index.row()]
+                key = self.oid_keys[index.row()]
                 self.oid_settings[key]["in_form"] = data
                 self.dataChanged.emit(index, index)
         return True
@@ -179,6 +182,7 @@ class TIDModel(QAbstractTableModel):
     def load_tid_config(self, qgis_project=None):
         self.beginResetModel()
         self.oid_settings = QgisProjectUtils(qgis_project).get_oid_settings()
+        self.oid_keys = list(self.oid_settings.keys())
         self.endResetModel()
 
     def save_tid_config(self, qgis_project=None):
@@ -187,39 +191,72 @@ class TIDModel(QAbstractTableModel):
 
 
 class FieldExpressionDelegate(QStyledItemDelegate):
+    """
+    Delegate editing the default value expression with a QgsFieldExpressionWidget.
+
+    The cells not in edit mode are painted with a pixmap of the widget. The widget is created once and the pixmaps are cached by expression, layer, size and palette, so scrolling does not render a widget per cell.
+    """
+
+    MAX_CACHED_PIXMAPS = 512
+
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
-        self.editor = None
+        self._paint_widget = None
+        self._pixmaps = OrderedDict()
 
     def createEditor(self, parent, option, index):
-        self.editor = QgsFieldExpressionWidget(parent)
+        editor = QgsFieldExpressionWidget(parent)
         layer = index.data(int(TIDModel.Roles.LAYER))
-        self.editor.setLayer(layer)
-        return self.editor
+        editor.setLayer(layer)
+        return editor
 
     def setEditorData(self, editor, index):
         value = index.data(int(Qt.DisplayRole))
-        self.editor.setExpression(value)
+        editor.setExpression(value)
 
     def setModelData(self, editor, model, index):
         value = editor.expression()
-        print(f"new exp{value}")
         model.setData(index, value, int(Qt.EditRole))
 
     def updateEditorGeometry(self, editor, option, index):
-        self.editor.setGeometry(option.rect)
+        editor.setGeometry(option.rect)
 
     def paint(self, painter, option, index):
-        opt = self.createEditor(self.parent, option, index)
-        opt.editable = False
         value = index.data(int(Qt.DisplayRole))
-        opt.setExpression(value)
-        opt.resize(option.rect.width(), option.rect.height())
-        pixmap = QPixmap(opt.width(), opt.height())
-        opt.render(pixmap)
+        layer = index.data(int(TIDModel.Roles.LAYER))
+        key = (
+            value,
+            layer.id() if layer else None,
+            option.rect.width(),
+            option.rect.height(),
+            option.palette.cacheKey(),
+        )
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self._render(
+                layer, value, option.rect.width(), option.rect.height()
+            )
+            self._pixmaps[key] = pixmap
+            if len(self._pixmaps) > self.MAX_CACHED_PIXMAPS:
+                self._pixmaps.popitem(last=False)
+        else:
+            self._pixmaps.move_to_end(key)
         painter.drawPixmap(option.rect, pixmap)
-        painter.restore()
+
+    def _render(self, layer, value, width, height):
+        if not self._paint_widget:
+            self._paint_widget = QgsFieldExpressionWidget(self.parent)
+            self._paint_widget.setVisible(False)
+        self._paint_widget.setLayer(layer)
+        self._paint_widget.setExpression(value)
+        self._paint_widget.resize(width, height)
+        pixmap = QPixmap(width, height)
+        self._paint_widget.render(pixmap)
+        return pixmap
+
+    def clear_cache(self):
+        self._pixmaps.clear()
 
 
 class LayerTIDsPanel(QWidget, WIDGET_UI):
@@ -247,13 +284,15 @@ class LayerTIDsPanel(QWidget, WIDGET_UI):
             TIDModel.Columns.IN_FORM,
             CheckDelegate(self, Qt.EditRole),
         )
+        self.field_expression_delegate = FieldExpressionDelegate(self)
         self.layer_tids_view.setItemDelegateForColumn(
             TIDModel.Columns.DEFAULT_VALUE,
-            FieldExpressionDelegate(self),
+            self.field_expression_delegate,
         )
         self.layer_tids_view.setEditTriggers(QAbstractItemView.AllEditTriggers)
 
     def load_tid_config(self, qgis_project=QgsProject.instance()):
+        self.field_expression_delegate.clear_cache()
         self.tid_model.load_tid_config(qgis_project)
 
     def save_tid_config(self, qgis_project=QgsProject.instance()):
@@ -18,23 +18,67 @@
 """
 
 import logging
+import os
+import tempfile
+from functools import partial
 
 from PyQt5.QtWidgets import QGridLayout, QProgressBar
 from qgis.core import Qgis
 from qgis.gui import QgsMessageBar
-from qgis.PyQt.QtCore import QSize, Qt
-from qgis.PyQt.QtGui import QColor
-from qgis.PyQt.QtWidgets import QGridLayout, QSizePolicy, QTextBrowser, QWidget
+from qgis.PyQt.QtCore import QSize, Qt, QTimer, QUrl
+from qgis.PyQt.QtGui import QColor, QDesktopServices, QTextCharFormat, QTextCursor
+from qgis.PyQt.QtWidgets import (
+    QGridLayout,
+    QSizePolicy,
+    QTextBrowser,
+    QToolButton,
+    QWidget,
+)
 
 from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbutils import color_log_text
 from QgisModelBaker.utils.gui_utils import LogColor
 
 
+class ColoredLines:
+    """
+    Collects the lines colored by color_log_text instead of appending them to a text edit.
+    """
+
+    def __init__(self):
+        # (text, color)
+        self.lines = []
+        self._color = None
+
+    def setTextColor(self, color):
+        self._color = color
+
+    def append(self, text):
+        self.lines.append((text, self._color))
+
+
+def _remove_full_log_file(full_log_file):
+    full_log_file.close()
+    try:
+        os.remove(full_log_file.name)
+    except OSError as e:
+        logging.warning(f"Could not remove the full log file: {e}")
+
+
 class LogPanel(QWidget):
-    def __init__(self, parent=None):
+    """
+    Panel showing the log output of the wizards.
+
+    The lines are buffered and appended to the text browser on a timer, so a verbose ili2db run does not lay out the text on every line.
+    Only the last max_lines are kept in the text browser. The full log is written to a file that can be opened with the "Open full log" button.
+    """
+
+    def __init__(self, parent=None, max_lines=5000, flush_interval=200):
         QWidget.__init__(self, parent)
 
+        self.max_lines = max_lines
+
         self.txtStdout = QTextBrowser()
+        self.txtStdout.document().setMaximumBlockCount(max_lines)
         self.bar = QgsMessageBar()
         self.bar.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
         self.txtStdout.setLayout(QGridLayout())
@@ -47,9 +91,28 @@ class LogPanel(QWidget):
         self.busy_bar.setTextVisible(True)
         self.busy_bar.setVisible(False)
 
+        self.open_full_log_button = QToolButton()
+        self.open_full_log_button.setText(self.tr("Open full log"))
+        self.open_full_log_button.setToolTip(
+            self.tr("The log panel shows the last {} lines only.").format(max_lines)
+        )
+        self.open_full_log_button.setEnabled(False)
+        self.open_full_log_button.clicked.connect(self.open_full_log)
+
+        # lines (text, color) not yet appended to the text browser
+        self._pending_lines = []
+        self._full_log_file = None
+        self._remove_full_log_on_destroy = None
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self.flush)
+
         layout = QGridLayout()
-        layout.addWidget(self.txtStdout)
-        layout.addWidget(self.busy_bar)
+        layout.addWidget(self.txtStdout, 0, 0, 1, 2)
+        layout.addWidget(self.busy_bar, 1, 0)
+        layout.addWidget(self.open_full_log_button, 1, 1, Qt.AlignRight)
 
         self.setLayout(layout)
 
@@ -59,8 +122,7 @@ class LogPanel(QWidget):
         )
 
     def print_info(self, text, text_color=LogColor.COLOR_INFO):
-        self.txtStdout.setTextColor(QColor(text_color))
-        self.txtStdout.append(text)
+        self._append_lines([(text, text_color)])
 
         if text_color == LogColor.COLOR_INFO:
             logging.info(text)
@@ -74,10 +136,97 @@ class LogPanel(QWidget):
             logging.info(text)
 
     def on_stderr(self, text):
-        color_log_text(text, self.txtStdout)
+        colored_lines = ColoredLines()
+        color_log_text(text, colored_lines)
+        self._append_lines(colored_lines.lines)
+
+    def set_text(self, text):
+        """
+        Replaces the content of the text browser (the full log keeps the previous lines).
+        """
+        self._pending_lines = []
+        self._write_full_log([text])
+        self.txtStdout.setText(text)
+
+    def clear(self):
+        """
+        Clears the text browser and removes the full log file. Called when the wizard dialog is finished.
+        """
+        self._flush_timer.stop()
+        self._pending_lines = []
+        self.txtStdout.clear()
+        if self._full_log_file:
+            self.destroyed.disconnect(self._remove_full_log_on_destroy)
+            _remove_full_log_file(self._full_log_file)
+            self._full_log_file = None
+            self._remove_full_log_on_destroy = None
+        self.open_full_log_button.setEnabled(False)
 
     def show_message(self, level, message):
         if level == Qgis.Warning:
             self.bar.pushMessage(message, Qgis.Info, 10)
         elif level == Qgis.Critical:
             self.bar.pushMessage(message, Qgis.Warning, 10)
+
+    def flush(self):
+        """
+        Appends the pending lines to the text browser in one edit block.
+        """
+        self._flush_timer.stop()
+        if not self._pending_lines:
+            return
+        lines = self._pending_lines[-self.max_lines :]
+        self._pending_lines = []
+
+        follow = self.scrollbar.value() == self.scrollbar.maximum()
+        document = self.txtStdout.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        char_format = QTextCharFormat()
+        new_block = not document.isEmpty()
+        for text, color in lines:
+            char_format.setForeground(QColor(color))
+            for textline in text.split("\n"):
+                if new_block:
+                    cursor.insertBlock()
+                cursor.insertText(textline, char_format)
+                new_block = True
+        cursor.endEditBlock()
+        if follow:
+            self.scrollbar.setValue(self.scrollbar.maximum())
+        if self._full_log_file:
+            self._full_log_file.flush()
+
+    def open_full_log(self):
+        if self._full_log_file:
+            self.flush()
+            QDesktopServices.openUrl(QUrl.fromLocalFile(self._full_log_file.name))
+
+    def _append_lines(self, lines):
+        self._write_full_log([text for text, _ in lines])
+        self._pending_lines.extend(lines)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _write_full_log(self, texts):
+        if not self._full_log_file:
+            try:
+                self._full_log_file = tempfile.NamedTemporaryFile(
+                    mode="w",
+                    encoding="utf-8",
+                    prefix="modelbaker_log_",
+                    suffix=".log",
+                    delete=False,
+                )
+            except OSError as e:
+                logging.warning(f"Could not create the full log file: {e}")
+                return
+            # not a method, it's called when the python wrapper might be gone already
+            self._remove_full_log_on_destroy = partial(
+                _remove_full_log_file, self._full_log_file
+            )
+            self.destroyed.connect(self._remove_full_log_on_destroy)
+            self.open_full_log_button.setEnabled(True)
+        for text in texts:
+            self._full_log_file.write(f"{text}\n")
@@ -36,6 +36,7 @@ from QgisModelBaker.libs.modelbaker.utils.globals import DbActionType
 from QgisModelBaker.libs.modelbaker.utils.qt_utils import OverrideCursor
 from QgisModelBaker.utils.globals import DEFAULT_DATASETNAME
 from QgisModelBaker.utils.gui_utils import LogColor
+from QgisModelBaker.utils.logging_utils import log_context, new_log_id
 
 WIDGET_UI = gui_utils.get_ui_class("workflow_wizard/session_panel.ui")
 
@@ -193,6 +194,7 @@ class SessionPanel(QWidget, WIDGET_UI):
             self.configuration.baskets = self.baskets
 
         self.is_skipped_or_done = False
+        self.is_skipped = False
 
     @property
     def id(self):
@@ -261,6 +263,7 @@ class SessionPanel(QWidget, WIDGET_UI):
         self.progress_bar.setTextVisible(True)
         self.setStyleSheet(gui_utils.INACTIVE_STYLE)
 
+        self.is_skipped = True
         self.is_skipped_or_done = True
         self.on_done_or_skipped.emit(self.id, True)
 
@@ -323,6 +326,16 @@ class SessionPanel(QWidget, WIDGET_UI):
             self.set_button_to_cancel()
             self.is_running = True
 
+        with log_context(
+            session_id=new_log_id(),
+            schema=db_utils.get_schema_identificator_from_configuration(
+                self.configuration
+            ),
+            phase=self.db_action_type.name,
+        ):
+            return self._run_session(edited_command)
+
+    def _run_session(self, edited_command=None):
         if self.db_action_type == DbActionType.GENERATE:
             self._pre_generate_project()
 
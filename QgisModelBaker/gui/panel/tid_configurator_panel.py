@@ -18,15 +18,25 @@
 """
 
 
-from qgis.PyQt.QtWidgets import QWidget
+from qgis.core import QgsDataSourceUri
+from qgis.PyQt.QtCore import Qt
+from qgis.PyQt.QtWidgets import QMessageBox, QWidget
 
 import QgisModelBaker.libs.modelbaker.utils.db_utils as db_utils
 from QgisModelBaker.gui.panel.layer_tids_panel import LayerTIDsPanel
 from QgisModelBaker.gui.panel.set_sequence_panel import SetSequencePanel
+from QgisModelBaker.libs.modelbaker.iliwrapper.globals import DbIliMode
 from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbconfig import (
     Ili2DbCommandConfiguration,
 )
+from QgisModelBaker.libs.modelbaker.utils.qt_utils import OverrideCursor
 from QgisModelBaker.utils import gui_utils
+from QgisModelBaker.utils.oid_utils import (
+    OidBackfiller,
+    OidBackfillError,
+    OidBackfillTable,
+    standardoid_prefix,
+)
 
 WIDGET_UI = gui_utils.get_ui_class("tid_configurator_panel.ui")
 
@@ -45,6 +55,7 @@ class TIDConfiguratorPanel(QWidget, WIDGET_UI):
         self.set_sequence_layout.addWidget(self.set_sequence_panel)
 
         self.reset_layer_tids_button.clicked.connect(self._reset_tid_configuration)
+        self.fill_missing_oids_button.clicked.connect(self.fill_missing_oids)
 
         self.qgis_project = None
         self.configuration = None
@@ -83,3 +94,146 @@ class TIDConfiguratorPanel(QWidget, WIDGET_UI):
             self.layer_tids_panel.save_tid_config(self.qgis_project)
             return True, message
         return False, message
+
+    def fill_missing_oids(self):
+        """
+        Counts the objects without OID in the database (dry run) and fills them after confirmation.
+        """
+        try:
+            with OverrideCursor(Qt.WaitCursor):
+                missing_oids, _ = self._run_oid_backfills(dry_run=True)
+        except OidBackfillError as e:
+            QMessageBox.critical(self, self.tr("Fill Missing OIDs"), str(e))
+            return
+
+        missing_oids = {name: count for name, count in missing_oids.items() if count}
+        if not missing_oids:
+            QMessageBox.information(
+                self,
+                self.tr("Fill Missing OIDs"),
+                self.tr("There are no objects without OID."),
+            )
+            return
+
+        if (
+            QMessageBox.question(
+                self,
+                self.tr("Fill Missing OIDs"),
+                self.tr(
+                    "Set the OID of {} objects according to the OID type in the database?\n - {}"
+                ).format(
+                    sum(missing_oids.values()),
+                    "\n - ".join(
+                        f"{name}: {count}" for name, count in missing_oids.items()
+                    ),
+                ),
+            )
+            != QMessageBox.Yes
+        ):
+            return
+
+        try:
+            with OverrideCursor(Qt.WaitCursor):
+                _, layers = self._run_oid_backfills()
+                for layer in layers:
+                    layer.reload()
+        except OidBackfillError as e:
+            QMessageBox.critical(
+                self,
+                self.tr("Fill Missing OIDs"),
+                self.tr("No OIDs have been set in this database: {}").format(e),
+            )
+
+    def _run_oid_backfills(self, dry_run=False):
+        """
+        Runs the OidBackfillers of all the databases and closes their connections.
+        Returns the missing (or filled) OIDs per table name and the layers of the filled tables.
+        """
+        missing_oids = {}
+        filled_layers = []
+        oid_backfills = []
+        try:
+            oid_backfills = self._oid_backfills()
+            for backfiller, tables, layers in oid_backfills:
+                if not tables:
+                    continue
+                missing_oids.update(backfiller.run(tables, dry_run=dry_run))
+                filled_layers.extend(layers)
+        finally:
+            for backfiller, _, _ in oid_backfills:
+                backfiller.close()
+        return missing_oids, filled_layers
+
+    def _oid_backfills(self):
+        """
+        Returns per database of the layers with an OID the OidBackfiller, the tables and the layers.
+        Layers sharing the same table are filled once. The caller closes the backfillers.
+        """
+        # schema identificator -> [OidBackfiller, (schema, table) -> OidBackfillTable, layers]
+        oid_backfills = {}
+        for name, oid_setting in self.layer_tids_panel.tid_model.oid_settings.items():
+            layer = oid_setting["layer"]
+            source_provider = layer.dataProvider() if layer else None
+            if not source_provider:
+                continue
+            schema_identificator = (
+                db_utils.get_schema_identificator_from_sourceprovider(source_provider)
+            )
+            if not schema_identificator:
+                continue
+            if schema_identificator not in oid_backfills:
+                oid_backfills[schema_identificator] = [
+                    self._oid_backfiller(source_provider),
+                    {},
+                    [],
+                ]
+            backfiller, tables, layers = oid_backfills[schema_identificator]
+            if not backfiller:
+                continue
+            if backfiller.dialect == OidBackfiller.GPKG:
+                uri_parts = source_provider.dataSourceUri().split("layername=")
+                if len(uri_parts) < 2:
+                    # e.g. a GeoPackage without layername, there is no table to fill
+                    continue
+                schema = None
+                table = uri_parts[1].split("|")[0].strip()
+            else:
+                layer_source = QgsDataSourceUri(source_provider.dataSourceUri())
+                schema = layer_source.schema()
+                table = layer_source.table()
+            if (schema, table) not in tables:
+                tables[(schema, table)] = OidBackfillTable(
+                    name,
+                    schema,
+                    table,
+                    oid_setting["oid_domain"],
+                    standardoid_prefix(oid_setting["default_value_expression"]),
+                )
+            layers.append(layer)
+        return [
+            (backfiller, list(tables.values()), layers)
+            for backfiller, tables, layers in oid_backfills.values()
+            if backfiller
+        ]
+
+    def _oid_backfiller(self, source_provider):
+        configuration = Ili2DbCommandConfiguration()
+        configuration.base_configuration = self.base_config
+        valid, mode = db_utils.get_configuration_from_sourceprovider(
+            source_provider, configuration
+        )
+        if not valid or not mode:
+            return None
+        configuration.tool = mode
+        db_connector = db_utils.get_db_connector(configuration)
+        if not db_connector:
+            return None
+        if mode & DbIliMode.pg:
+            dialect = OidBackfiller.POSTGRES
+        elif mode & DbIliMode.gpkg:
+            dialect = OidBackfiller.GPKG
+        else:
+            dialect = OidBackfiller.MSSQL
+        return OidBackfiller(
+            db_connector.conn, dialect, db_connector.tid, db_connector.tilitid
+        )
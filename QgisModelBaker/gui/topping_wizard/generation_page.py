@@ -17,20 +17,201 @@
  ***************************************************************************/
 """
 
-from qgis.core import QgsProject
-from qgis.PyQt.QtWidgets import QWizardPage
+import hashlib
+import os
+import shutil
+import tempfile
 
-import QgisModelBaker.utils.gui_utils as gui_utils
+from qgis.core import Qgis, QgsApplication, QgsProject, QgsTask
+from qgis.PyQt.QtCore import QEventLoop, Qt, pyqtSignal
+from qgis.PyQt.QtWidgets import QApplication, QWizardPage
+
+from QgisModelBaker.libs.modelbaker.ilitoppingmaker import ExportSettings, IliData
+from QgisModelBaker.libs.modelbaker.libs.toppingmaker import Target
+from QgisModelBaker.libs.modelbaker.utils.qt_utils import OverrideCursor
 from QgisModelBaker.utils import gui_utils
+from QgisModelBaker.utils.repository_utils import ILIDATA_FILE
+from QgisModelBaker.utils.topping_utils import ToppingManifest
 
 PAGE_UI = gui_utils.get_ui_class("topping_wizard/generation.ui")
 
 
+class ToppingGenerationCanceled(RuntimeError):
+    pass
+
+
+class ProgressExportSettings:
+    """
+    Passes the ExportSettings to the parsing of the project and calls node_parsing with every layer tree node before it's parsed.
+    """
+
+    def __init__(self, export_settings, node_parsing):
+        self.export_settings = export_settings
+        self.node_parsing = node_parsing
+
+    def get_setting(self, type, node=None, name=None, style_name=None):
+        # the definition setting is the first one requested for every node
+        if type == ExportSettings.ToppingType.DEFINITION and node is not None:
+            self.node_parsing(node)
+        return self.export_settings.get_setting(type, node, name, style_name)
+
+    def __getattr__(self, name):
+        return getattr(self.export_settings, name)
+
+
+class StagingTarget:
+    """
+    Adapter of the Target of a topping, generating the files to a staging folder instead of the main directory.
+    Every path passes path_resolving before it's resolved by the target, and toppings with the same content (like a style used by multiple layers) are stored once.
+    Everything else (like the toppingfileinfo_list) is the one of the wrapped target.
+    """
+
+    # the folders are created like the Target does, but in the staging folder
+    filedir_path = Target.filedir_path
+
+    def __init__(self, target, main_dir, path_resolving=None):
+        self.target = target
+        self.main_dir = main_dir
+        self.path_resolving = path_resolving
+        # type and content hash of a topping -> link to the already stored file
+        self._stored_links = {}
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+    def path_resolver(self, target, name, type):
+        if self.path_resolving:
+            self.path_resolving(name, type)
+        return self.target.path_resolver(target, name, type)
+
+    def toppingfile_link(self, type, path):
+        if not os.path.isfile(path):
+            return Target.toppingfile_link(self, type, path)
+        with open(path, "rb") as toppingfile:
+            key = (type, hashlib.sha256(toppingfile.read()).hexdigest())
+        if key not in self._stored_links:
+            self._stored_links[key] = Target.toppingfile_link(self, type, path)
+        return self._stored_links[key]
+
+
+class ToppingGenerationTask(QgsTask):
+    """
+    Writes the files of an already parsed IliProjectTopping (toppings like QML and QLR files, the project topping YAML, the metaconfig INI and the ilidata.xml) to the target folder.
+    Every written file passes the path resolver of the target, where the progress is reported and the cancelation is checked.
+
+    The files are generated to a staging folder and synced by the ToppingManifest of the target folder, so only the files with changed content are written.
+    Toppings with the same content (like a style used by multiple layers) are stored once and the same id is linked for all of them.
+    """
+
+    # done artifacts, expected artifacts, artifact (type and file name)
+    artifact_written = pyqtSignal(int, int, str)
+
+    def __init__(self, topping, description):
+        QgsTask.__init__(self, description, QgsTask.CanCancel)
+        self.topping = topping
+        self.ilidata_file = None
+        self.error = None
+        self.written_files = []
+        self.unchanged_files = []
+        self.removed_files = []
+        self.written_count = 0
+        self.expected_count = max(1, self.expected_artifact_count(topping))
+
+    @staticmethod
+    def expected_artifact_count(topping):
+        """
+        Counts the files the generation is going to write. It's used for the progress only, so it does not need to be exact.
+        """
+        count = 0
+        items = list(topping.layertree.items)
+        while items:
+            item = items.pop()
+            items.extend(item.items)
+            count += bool(item.properties.qmlstylefile)
+            count += bool(item.properties.definitionfile)
+            count += len(item.properties.styles)
+        count += len(topping.layouts)
+        count += len(
+            [
+                variable
+                for variable in topping.variables.values()
+                if variable and variable.get("ispath", False)
+            ]
+        )
+        ili2db_settings = topping.metaconfig.ili2db_settings
+        count += len(
+            [
+                path
+                for path in (topping.referencedata_paths or [])
+                + [
+                    ili2db_settings.metaattr_path,
+                    ili2db_settings.prescript_path,
+                    ili2db_settings.postscript_path,
+                ]
+                if path and os.path.isfile(path)
+            ]
+        )
+        # the project topping and the metaconfig file
+        return count + 2
+
+    def run(self):
+        main_dir = self.topping.target.main_dir
+        # the files of a previous (or canceled) run are not listed again in the ilidata.xml
+        self.topping.target.toppingfileinfo_list = []
+        staging_dir = tempfile.mkdtemp(prefix="modelbaker_topping_")
+        target = StagingTarget(self.topping.target, staging_dir, self._path_resolving)
+        try:
+            projecttopping_id = self.topping.generate_files(target)
+            self.topping.metaconfig.update_projecttopping_path(projecttopping_id)
+            if self.topping.metaconfig.generate_files(target):
+                self.topping.stdout.emit(
+                    self.tr("MetaConfig written to INI file."), Qgis.Info
+                )
+            if self.isCanceled():
+                raise ToppingGenerationCanceled()
+            if IliData().generate_file(
+                target, self.topping.models, self.topping.preferred_datasource
+            ):
+                (
+                    self.written_files,
+                    self.unchanged_files,
+                    self.removed_files,
+                ) = ToppingManifest(main_dir).sync(staging_dir)
+                self.ilidata_file = os.path.join(main_dir, ILIDATA_FILE)
+                self.topping.stdout.emit(
+                    self.tr("IliData written to XML file: {}").format(
+                        self.ilidata_file
+                    ),
+                    Qgis.Info,
+                )
+        except ToppingGenerationCanceled:
+            return False
+        except Exception as exception:
+            self.error = str(exception)
+            return False
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        return bool(self.ilidata_file)
+
+    def _path_resolving(self, name, type):
+        if self.isCanceled():
+            raise ToppingGenerationCanceled()
+        self.written_count += 1
+        self.setProgress(min(99.0, 100.0 * self.written_count / self.expected_count))
+        self.artifact_written.emit(
+            self.written_count, self.expected_count, f"{type}: {name}"
+        )
+
+
 class GenerationPage(QWizardPage, PAGE_UI):
     def __init__(self, parent, title):
         QWizardPage.__init__(self)
 
         self.topping_wizard = parent
+        self.generation_task = None
+        # layer tree nodes parsed and to parse
+        self._parsed_nodes = 0
+        self._node_count = 0
 
         self.setupUi(self)
 
@@ -38,19 +219,130 @@ class GenerationPage(QWizardPage, PAGE_UI):
         self.setStyleSheet(gui_utils.DEFAULT_STYLE)
         self.info_text_box.setStyleSheet(f"background-color: lightgray;")
         self.run_generate_button.clicked.connect(self.generate)
+        self.cancel_generate_button.clicked.connect(self.cancel_generation)
+
+    def isComplete(self):
+        return self.generation_task is None
 
     def generate(self):
+        if self.generation_task:
+            return
+
+        self.run_generate_button.setEnabled(False)
+        self.progress_bar.setTextVisible(False)
+        self._parsed_nodes = 0
+        self._node_count = self._count_child_nodes(
+            QgsProject.instance().layerTreeRoot()
+        )
+        self.progress_bar.setRange(0, max(1, self._node_count))
+        self.progress_bar.setValue(0)
+        self.info_text_box.clear()
+        QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+
+        # parsing exports the styles and definitions of the layers, so it cannot run in the background
+        with OverrideCursor(Qt.WaitCursor):
+            topping = self.topping_wizard.topping
+            # the layertree of a previous (or canceled) run is not parsed twice
+            topping.layertree.items = []
+            parsed = topping.parse_project(
+                QgsProject.instance(),
+                ProgressExportSettings(topping.export_settings, self._node_parsing),
+            )
+            if parsed:
+                topping.append_iliproperties(QgsProject.instance())
+
+        if not parsed:
+            self._generation_finished(None)
+            return
+
+        self.generation_task = ToppingGenerationTask(
+            topping, self.tr("Generate Topping Files")
+        )
+        self.generation_task.artifact_written.connect(self._artifact_written)
+        self.generation_task.progressChanged.connect(self._progress_changed)
+        self.generation_task.taskCompleted.connect(self._generation_completed)
+        self.generation_task.taskTerminated.connect(self._generation_terminated)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.cancel_generate_button.setEnabled(True)
+        self.completeChanged.emit()
+        self.topping_wizard.log_panel.print_info(
+            self.tr("Generating {} topping files...").format(
+                self.generation_task.expected_count
+            )
+        )
+        QgsApplication.taskManager().addTask(self.generation_task)
+
+    def _count_child_nodes(self, node):
+        return sum(1 + self._count_child_nodes(child) for child in node.children())
+
+    def _node_parsing(self, node):
+        """
+        Reports the progress of the parsing before every layer tree node (but the root) and keeps the GUI responsive in between.
+        """
+        if not node.parent():
+            return
+        self._parsed_nodes += 1
+        self.progress_bar.setValue(min(self._parsed_nodes, self._node_count))
+        self.topping_wizard.log_panel.print_info(
+            self.tr("Parse {} ({}/{})").format(
+                node.name(), self._parsed_nodes, self._node_count
+            )
+        )
+        QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+
+    def cancel_generation(self):
+        if self.generation_task:
+            self.cancel_generate_button.setEnabled(False)
+            self.generation_task.cancel()
+
+    def _progress_changed(self, progress):
+        self.progress_bar.setValue(int(progress))
+
+    def _generation_completed(self):
+        self._generation_finished(self.generation_task.ilidata_file)
+
+    def _generation_terminated(self):
+        self._generation_finished(None)
+
+    def _artifact_written(self, written_count, expected_count, artifact):
+        self.topping_wizard.log_panel.print_info(
+            self.tr("Generated {} ({}/{})").format(
+                artifact, written_count, expected_count
+            )
+        )
+
+    def _generation_finished(self, ilidata_file):
         result_message = ""
-        ilidata_file = self.topping_wizard.topping.makeit(QgsProject.instance())
+        color = gui_utils.LogColor.COLOR_SUCCESS
+        task = self.generation_task
+        self.generation_task = None
+        self.progress_bar.setRange(0, 100)
         if ilidata_file:
             self.progress_bar.setValue(100)
             result_message = self.tr("Topping generated 🧁")
             self.info_text_box.setHtml(f"Find the ilidata.xml here:\n\n{ilidata_file}")
+            self.topping_wizard.log_panel.print_info(
+                self.tr(
+                    "{} files written, {} files unchanged and {} outdated files removed."
+                ).format(
+                    len(task.written_files),
+                    len(task.unchanged_files),
+                    len(task.removed_files),
+                )
+            )
         else:
             self.progress_bar.setValue(0)
-            result_message = self.tr("Topping not generated 💩")
+            color = gui_utils.LogColor.COLOR_FAIL
+            if task and task.isCanceled():
+                result_message = self.tr("Topping generation canceled")
+            else:
+                result_message = self.tr("Topping not generated 💩")
+            if task and task.error:
+                self.topping_wizard.log_panel.print_info(task.error, color)
         self.progress_bar.setFormat(result_message)
         self.progress_bar.setTextVisible(True)
-        self.topping_wizard.log_panel.print_info(
-            result_message, gui_utils.LogColor.COLOR_SUCCESS
-        )
+        self.run_generate_button.setEnabled(True)
+        self.cancel_generate_button.setEnabled(False)
+        self.completeChanged.emit()
+        self.topping_wizard.log_panel.print_info(result_message, color)
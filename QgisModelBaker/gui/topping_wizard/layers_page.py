@@ -18,6 +18,8 @@
 """
 
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import IntEnum
 
 from qgis.core import (
@@ -28,7 +30,7 @@ from qgis.core import (
     QgsMapLayer,
     QgsProject,
 )
-from qgis.PyQt.QtCore import QModelIndex, Qt, pyqtSignal
+from qgis.PyQt.QtCore import QModelIndex, QPersistentModelIndex, Qt, pyqtSignal
 from qgis.PyQt.QtGui import QColor, QPalette
 from qgis.PyQt.QtWidgets import (
     QCheckBox,
@@ -84,6 +86,45 @@ class LayerStyleWidget(QWidget):
         self.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
 
 
+class ExportSettingsBatch:
+    """
+    Collects changes of the ExportSettings to apply them in one pass.
+    It provides the same set_setting_values as the ExportSettings, and multiple changes of the same setting are collapsed to the last one.
+    """
+
+    def __init__(self, export_settings):
+        self.export_settings = export_settings
+        # (type, node or name, style name) -> [type, node, name, export, categories, style name]
+        self._changes = {}
+
+    def set_setting_values(
+        self,
+        type: ExportSettings.ToppingType,
+        node=None,
+        name: str = None,
+        export=True,
+        categories=None,
+        style_name: str = None,
+    ) -> bool:
+        if not node and not name:
+            return False
+        key = (type, node or name, style_name)
+        change = self._changes.get(key)
+        if change:
+            change[3] = export
+            change[4] = categories or change[4]
+        else:
+            self._changes[key] = [type, node, name, export, categories, style_name]
+        return True
+
+    def apply(self):
+        for type, node, name, export, categories, style_name in self._changes.values():
+            self.export_settings.set_setting_values(
+                type, node, name, export, categories, style_name
+            )
+        self._changes = {}
+
+
 class LayerModel(QgsLayerTreeModel):
     """
     Model providing the layer tree and the settings.
@@ -98,6 +139,13 @@ class LayerModel(QgsLayerTreeModel):
         USE_DEFINITION = 2
         USE_SOURCE = 3
 
+    class LayerClassification(IntEnum):
+        INTERLIS = 0
+        OTHER = 1
+
+    # maximum of schemas probed at the same time
+    MAX_PROBING_CONNECTIONS = 8
+
     def __init__(self, layertree: QgsLayerTree, export_settings=ExportSettings()):
         super().__init__(layertree)
         self.export_settings = export_settings
@@ -105,9 +153,30 @@ class LayerModel(QgsLayerTreeModel):
         self.use_source_nodes = {}
         self.use_definition_nodes = {}
         self.ili_schema_identificators = []
+        # schema identificator -> if it's an INTERLIS schema
+        self._probed_schemas = {}
+        # layer id -> LayerClassification
+        self.layer_classifications = {}
+        # the ExportSettingsBatch and the changed nodes of the current batch update
+        self._batch = None
+        self._changed_nodes = []
+
+        QgsProject.instance().layersAdded.connect(self._classify_layers)
+        QgsProject.instance().layersRemoved.connect(self._unclassify_layers)
+        self._project_connected = True
 
         self.reload(True)
 
+    def disconnect_project(self):
+        """
+        Stops classifying the layers added to the project, called when the wizard is closed.
+        """
+        if not self._project_connected:
+            return
+        QgsProject.instance().layersAdded.disconnect(self._classify_layers)
+        QgsProject.instance().layersRemoved.disconnect(self._unclassify_layers)
+        self._project_connected = False
+
     def columnCount(self, parent=None):
         return len(LayerModel.Columns)
 
@@ -185,11 +254,10 @@ class LayerModel(QgsLayerTreeModel):
             if QgsLayerTree.isGroup(node):
                 return QColor(Qt.gray)
             else:
-                layer = QgsProject.instance().mapLayersByName(node.name())[0]
-                if layer:
-                    if layer.type() == QgsMapLayer.VectorLayer:
-                        if self._is_ili_schema(layer):
-                            return QColor(gui_utils.BLUE)
+                classification = self._node_classification(node)
+                if classification == LayerModel.LayerClassification.INTERLIS:
+                    return QColor(gui_utils.BLUE)
+                if classification == LayerModel.LayerClassification.OTHER:
                     return QColor(gui_utils.GREEN)
 
         if (
@@ -212,83 +280,8 @@ class LayerModel(QgsLayerTreeModel):
         if role == Qt.CheckStateRole:
             node = self.index2node(index)
             if node:
-                if (
-                    index.column() == LayerModel.Columns.USE_STYLE
-                    and not QgsLayerTree.isGroup(node)
-                ):
-                    self._set_export_settings_values_for_all_styles(
-                        ExportSettings.ToppingType.QMLSTYLE,
-                        node,
-                        None,
-                        bool(data),
-                    )
-
-                    if bool(data):
-                        # when the style or source get's checked, the definition become unchecked
-                        self.export_settings.set_setting_values(
-                            ExportSettings.ToppingType.DEFINITION,
-                            node,
-                            None,
-                            False,
-                        )
-
-                        # when something is checked, the parent's definition become unchecked
-                        self._disable_parent_definition(index)
-
-                if index.column() == LayerModel.Columns.USE_DEFINITION:
-                    self.export_settings.set_setting_values(
-                        ExportSettings.ToppingType.DEFINITION,
-                        node,
-                        None,
-                        bool(data),
-                    )
-
-                    if bool(data):
-                        # when the definition is checked the others become unchecked
-                        self._set_export_settings_values_for_all_styles(
-                            ExportSettings.ToppingType.QMLSTYLE,
-                            node,
-                            None,
-                            False,
-                        )
-                        self.export_settings.set_setting_values(
-                            ExportSettings.ToppingType.SOURCE,
-                            node,
-                            None,
-                            False,
-                        )
-
-                        # when something is checked, the parent's definition become unchecked
-                        self._disable_parent_definition(index)
-
-                        # when definition is checked, che children's columns become all unchecked
-                        self._disable_children(index)
-                if (
-                    index.column() == LayerModel.Columns.USE_SOURCE
-                    and not QgsLayerTree.isGroup(node)
-                ):
-                    self.export_settings.set_setting_values(
-                        ExportSettings.ToppingType.SOURCE,
-                        node,
-                        None,
-                        bool(data),
-                    )
-                    if bool(data):
-                        # when the style or source get's checked, the definition become unchecked
-                        self.export_settings.set_setting_values(
-                            ExportSettings.ToppingType.DEFINITION,
-                            node,
-                            None,
-                            False,
-                        )
-
-                        # when something is checked, the parent's definition become unchecked
-                        self._disable_parent_definition(index)
-
-                self.dataChanged.emit(
-                    self.index(index.row(), 0),
-                    self.index(index.row(), self.columnCount()),
-                )
+                with self.batch_update():
+                    self._set_check_state(index.column(), node, bool(data))
                 return True
 
         if (
@@ -297,13 +290,126 @@ class LayerModel(QgsLayerTreeModel):
         ):
             node = self.index2node(index)
             if node:
-                self._set_export_settings_values_for_all_styles(
-                    ExportSettings.ToppingType.QMLSTYLE, node, None, True, data
-                )
+                with self.batch_update():
+                    self._set_export_settings_values_for_all_styles(
+                        ExportSettings.ToppingType.QMLSTYLE, node, None, True, data
+                    )
                 return True
 
         return QgsLayerTreeModel.setData(self, index, role, data)
 
+    @contextmanager
+    def batch_update(self, emit_data_changed=True):
+        """
+        Collects all the changes of the export settings made in this context and applies them in one pass at the end.
+        Instead of a signal per changed cell, one dataChanged is emitted per parent of the changed nodes, covering their rows.
+        Nested batch updates are part of the outer one.
+        """
+        if self._batch:
+            yield self._batch
+            return
+        self._batch = ExportSettingsBatch(self.export_settings)
+        self._changed_nodes = []
+        try:
+            yield self._batch
+        finally:
+            self._batch.apply()
+            self._batch = None
+            changed_nodes = self._changed_nodes
+            self._changed_nodes = []
+            if emit_data_changed:
+                self._emit_data_changed(changed_nodes)
+
+    def _settings(self):
+        return self._batch or self.export_settings
+
+    def _emit_data_changed(self, nodes):
+        # parent index -> rows of the changed nodes
+        changed_rows = {}
+        for node in nodes:
+            index = self.node2index(node)
+            if index.isValid():
+                changed_rows.setdefault(
+                    QPersistentModelIndex(index.parent()), []
+                ).append(index.row())
+        for parent, rows in changed_rows.items():
+            parent_index = QModelIndex(parent)
+            self.dataChanged.emit(
+                self.index(min(rows), 0, parent_index),
+                self.index(max(rows), self.columnCount() - 1, parent_index),
+            )
+
+    def _set_check_state(self, column, node, checked):
+        settings = self._settings()
+        self._changed_nodes.append(node)
+        if column == LayerModel.Columns.USE_STYLE and not QgsLayerTree.isGroup(node):
+            self._set_export_settings_values_for_all_styles(
+                ExportSettings.ToppingType.QMLSTYLE,
+                node,
+                None,
+                checked,
+            )
+
+            if checked:
+                # when the style or source get's checked, the definition become unchecked
+                settings.set_setting_values(
+                    ExportSettings.ToppingType.DEFINITION,
+                    node,
+                    None,
+                    False,
+                )
+
+                # when something is checked, the parent's definition become unchecked
+                self._disable_parent_definition(node)
+
+        if column == LayerModel.Columns.USE_DEFINITION:
+            settings.set_setting_values(
+                ExportSettings.ToppingType.DEFINITION,
+                node,
+                None,
+                checked,
+            )
+
+            if checked:
+                # when the definition is checked the others become unchecked
+                self._set_export_settings_values_for_all_styles(
+                    ExportSettings.ToppingType.QMLSTYLE,
+                    node,
+                    None,
+                    False,
+                )
+                settings.set_setting_values(
+                    ExportSettings.ToppingType.SOURCE,
+                    node,
+                    None,
+                    False,
+                )
+
+                # when something is checked, the parent's definition become unchecked
+                self._disable_parent_definition(node)
+
+                # when definition is checked, che children's columns become all unchecked
+                self._disable_children(node)
+
+        if column == LayerModel.Columns.USE_SOURCE and not QgsLayerTree.isGroup(node):
+            settings.set_setting_values(
+                ExportSettings.ToppingType.SOURCE,
+                node,
+                None,
+                checked,
+            )
+            if checked:
+                # when the style or source get's checked, the definition become unchecked
+                settings.set_setting_values(
+                    ExportSettings.ToppingType.DEFINITION,
+                    node,
+                    None,
+                    False,
+                )
+
+                # when something is checked, the parent's definition become unchecked
+                self._disable_parent_definition(node)
+
     def check(self, index):
         if index.flags() & (Qt.ItemIsUserCheckable | Qt.ItemIsEnabled):
             if self.data(index, Qt.CheckStateRole) == Qt.Checked:
@@ -312,92 +418,160 @@ class LayerModel(QgsLayerTreeModel):
                 self.setData(index, Qt.CheckStateRole, Qt.Checked)
 
     def reload(self, load_defaults=False):
-        self._load_ili_schema_identificators()
+        self._load_layer_classifications()
         if load_defaults:
             self._set_default_values()
 
-    def _disable_children(self, parent: QModelIndex):
-        for child_row in range(self.rowCount(parent)):
-            self.setData(
-                self.index(child_row, LayerModel.Columns.USE_STYLE, parent),
-                Qt.CheckStateRole,
-                False,
-            )
-            self.setData(
-                self.index(child_row, LayerModel.Columns.USE_DEFINITION, parent),
-                Qt.CheckStateRole,
-                False,
-            )
-            self.setData(
-                self.index(child_row, LayerModel.Columns.USE_SOURCE, parent),
-                Qt.CheckStateRole,
-                False,
-            )
-            self._disable_children(
-                self.index(child_row, LayerModel.Columns.USE_DEFINITION, parent)
+    def _disable_children(self, parent):
+        settings = self._settings()
+        nodes = list(parent.children())
+        while nodes:
+            node = nodes.pop()
+            self._changed_nodes.append(node)
+            settings.set_setting_values(
+                ExportSettings.ToppingType.DEFINITION, node, None, False
             )
+            if QgsLayerTree.isGroup(node):
+                nodes.extend(node.children())
+            else:
+                self._set_export_settings_values_for_all_styles(
+                    ExportSettings.ToppingType.QMLSTYLE, node, None, False
+                )
+                settings.set_setting_values(
+                    ExportSettings.ToppingType.SOURCE, node, None, False
+                )
 
-    def _disable_parent_definition(self, index: QModelIndex):
-        if index.parent() == QModelIndex():
-            # parent of index is root
-            return
-        parent_definition_index = self.index(
-            index.parent().row(),
-            LayerModel.Columns.USE_DEFINITION,
-            index.parent().parent(),
-        )
-        self.setData(parent_definition_index, Qt.CheckStateRole, False)
-        if index.parent() != QModelIndex():
-            self._disable_parent_definition(index.parent())
+    def _disable_parent_definition(self, node):
+        settings = self._settings()
+        root = self.rootGroup()
+        parent = node.parent()
+        while parent and parent != root:
+            self._changed_nodes.append(parent)
+            settings.set_setting_values(
+                ExportSettings.ToppingType.DEFINITION, parent, None, False
+            )
+            parent = parent.parent()
 
-    def _load_ili_schema_identificators(self):
+    def _load_layer_classifications(self):
         """
         Checks all the layers if it's based on an interlis class.
-        This is not done every time the layertree changes, so not realtime to have better performance.
+        This is not done every time the layertree changes, so not realtime to have better performance. Only added layers are checked additionally.
         """
         self.ili_schema_identificators = []
-        checked_schema_identificator = []
-        for layer in QgsProject.instance().mapLayers().values():
-            if layer.type() == QgsMapLayer.VectorLayer:
-                source_provider = layer.dataProvider()
-                if not source_provider:
-                    continue
-                schema_identificator = (
-                    db_utils.get_schema_identificator_from_sourceprovider(
-                        source_provider
-                    )
-                )
-                if (
-                    not schema_identificator
-                    or schema_identificator in checked_schema_identificator
-                ):
-                    continue
+        self._probed_schemas = {}
+        self.layer_classifications = {}
+        self._classify_layers(QgsProject.instance().mapLayers().values())
 
-                checked_schema_identificator.append(schema_identificator)
+    def _classify_layers(self, layers):
+        """
+        Classifies the layers by their source. Every schema not probed yet is checked once, where the schemas are probed in parallel.
+        """
+        # schema identificator -> ids of the layers in this schema
+        unprobed_schema_layers = {}
+        # schema identificator -> configuration to connect
+        unprobed_schema_configurations = {}
+        for layer in layers:
+            self.layer_classifications[
+                layer.id()
+            ] = LayerModel.LayerClassification.OTHER
+            if layer.type() != QgsMapLayer.VectorLayer:
+                continue
+            source_provider = layer.dataProvider()
+            if not source_provider or not source_provider.isValid():
+                continue
+            schema_identificator = (
+                db_utils.get_schema_identificator_from_sourceprovider(source_provider)
+            )
+            if not schema_identificator:
+                continue
+            if schema_identificator in self._probed_schemas:
+                if self._probed_schemas[schema_identificator]:
+                    self.layer_classifications[
+                        layer.id()
+                    ] = LayerModel.LayerClassification.INTERLIS
+                continue
+            unprobed_schema_layers.setdefault(schema_identificator, []).append(
+                layer.id()
+            )
+            if schema_identificator not in unprobed_schema_configurations:
                 configuration = Ili2DbCommandConfiguration()
                 valid, mode = db_utils.get_configuration_from_sourceprovider(
                     source_provider, configuration
                 )
                 if valid and mode:
                     configuration.tool = mode
-                    db_connector = db_utils.get_db_connector(configuration)
+                    unprobed_schema_configurations[schema_identificator] = configuration
+                else:
+                    unprobed_schema_configurations[schema_identificator] = None
 
-                    if (
-                        db_connector
-                        and db_connector.db_or_schema_exists()
-                        and db_connector.metadata_exists()
-                    ):
-                        self.ili_schema_identificators.append(schema_identificator)
+        if not unprobed_schema_layers:
+            return
 
-    def _is_ili_schema(self, layer):
-        if not layer or not layer.dataProvider() or not layer.dataProvider().isValid():
+        schema_identificators = list(unprobed_schema_layers.keys())
+        with ThreadPoolExecutor(
+            max_workers=min(len(schema_identificators), self.MAX_PROBING_CONNECTIONS)
+        ) as executor:
+            probe_results = executor.map(
+                self._is_ili_schema,
+                [
+                    unprobed_schema_configurations[schema_identificator]
+                    for schema_identificator in schema_identificators
+                ],
+            )
+            for schema_identificator, is_ili_schema in zip(
+                schema_identificators, probe_results
+            ):
+                self._probed_schemas[schema_identificator] = is_ili_schema
+                if is_ili_schema:
+                    self.ili_schema_identificators.append(schema_identificator)
+                    for layer_id in unprobed_schema_layers[schema_identificator]:
+                        self.layer_classifications[
+                            layer_id
+                        ] = LayerModel.LayerClassification.INTERLIS
+
+    def _unclassify_layers(self, layer_ids):
+        for layer_id in layer_ids:
+            self.layer_classifications.pop(layer_id, None)
+
+    @staticmethod
+    def _is_ili_schema(configuration):
+        """
+        Probes the database schema of the configuration. Runs in a worker thread with an own connection, that is only used in this thread and closed at the end.
+        """
+        if not configuration:
             return False
-
-        source_provider = layer.dataProvider()
-        schema_identificator = db_utils.get_schema_identificator_from_sourceprovider(
-            source_provider
-        )
-        return schema_identificator in self.ili_schema_identificators
+        db_connector = None
+        try:
+            db_connector = db_utils.get_db_connector(configuration)
+            return bool(
+                db_connector
+                and db_connector.db_or_schema_exists()
+                and db_connector.metadata_exists()
+            )
+        except Exception:
+            return False
+        finally:
+            connection = getattr(db_connector, "conn", None)
+            if connection:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+    def _layer_classification(self, layer):
+        if not layer:
+            return None
+        if layer.id() not in self.layer_classifications:
+            self._classify_layers([layer])
+        return self.layer_classifications[layer.id()]
+
+    def _node_classification(self, node):
+        layer = node.layer() if isinstance(node, QgsLayerTreeLayer) else None
+        if not layer:
+            # workaround when layer has not been detected as QgsLayerTreeLayer.
+            layers = QgsProject.instance().mapLayersByName(node.name())
+            layer = layers[0] if layers else None
+        return self._layer_classification(layer)
 
     def _set_default_values(self):
         """
@@ -409,64 +583,33 @@ class LayerModel(QgsLayerTreeModel):
         groupnodes = root.findGroups(True)
 
         self.beginResetModel()
-        for layernode in layernodes:
-            if self._is_ili_schema(layernode.layer()):
-                self._set_export_settings_values_for_all_styles(
-                    ExportSettings.ToppingType.QMLSTYLE,
-                    layernode,
-                    None,
-                    bool(True),
-                )
-                self.export_settings.set_setting_values(
-                    ExportSettings.ToppingType.DEFINITION,
-                    layernode,
-                    None,
-                    bool(False),
+        with self.batch_update(emit_data_changed=False) as settings:
+            for layernode in layernodes:
+                is_ili_layer = (
+                    self._layer_classification(layernode.layer())
+                    == LayerModel.LayerClassification.INTERLIS
                 )
-                self.export_settings.set_setting_values(
-                    ExportSettings.ToppingType.SOURCE,
-                    layernode,
-                    None,
-                    bool(False),
-                )
-            else:
                 self._set_export_settings_values_for_all_styles(
                     ExportSettings.ToppingType.QMLSTYLE,
                     layernode,
                     None,
-                    bool(False),
+                    is_ili_layer,
                 )
-                self.export_settings.set_setting_values(
+                settings.set_setting_values(
                     ExportSettings.ToppingType.DEFINITION,
                     layernode,
                     None,
-                    bool(False),
+                    False,
                 )
-                self.export_settings.set_setting_values(
+                settings.set_setting_values(
                     ExportSettings.ToppingType.SOURCE,
                     layernode,
                     None,
-                    bool(True),
+                    not is_ili_layer,
                 )
-        for groupnode in groupnodes:
-            self.export_settings.set_setting_values(
-                ExportSettings.ToppingType.QMLSTYLE,
-                groupnode,
-                None,
-                bool(False),
-            )
-            self.export_settings.set_setting_values(
-                ExportSettings.ToppingType.DEFINITION,
-                groupnode,
-                None,
-                bool(False),
-            )
-            self.export_settings.set_setting_values(
-                ExportSettings.ToppingType.SOURCE,
-                groupnode,
-                None,
-                bool(False),
-            )
+            for groupnode in groupnodes:
+                for type in ExportSettings.ToppingType:
+                    settings.set_setting_values(type, groupnode, None, False)
         self.endResetModel()
 
     def _set_export_settings_values_for_all_styles(
@@ -481,9 +624,10 @@ class LayerModel(QgsLayerTreeModel):
         Currently individual settings per style is not supported by the exporter.
         So we have this function applying the setting (export True/False and category) on each style.
         """
-        if isinstance(node, QgsLayerTreeLayer):
+        if isinstance(node, QgsLayerTreeLayer) and node.layer():
+            settings = self._settings()
             for style_name in node.layer().styleManager().styles():
-                self.export_settings.set_setting_values(
+                settings.set_setting_values(
                     type, node, name, export, categories, style_name
                 )
 
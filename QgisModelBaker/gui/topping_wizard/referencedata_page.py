@@ -22,7 +22,7 @@ import pathlib
 
 from qgis.core import QgsApplication
 from qgis.PyQt.QtCore import QEventLoop, Qt, QTimer
-from qgis.PyQt.QtWidgets import QCompleter, QWizardPage
+from qgis.PyQt.QtWidgets import QWizardPage
 
 import QgisModelBaker.utils.gui_utils as gui_utils
 from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import (
@@ -80,15 +80,15 @@ class ReferencedataPage(QWizardPage, PAGE_UI):
         self.input_line_edit.setPlaceholderText(
             self.tr("[Search referenced data files from Repositories or Local System]")
         )
-        completer = QCompleter(
-            self.ilireferencedatacache.sorted_model,
+        self.ilireferencedata_completer = gui_utils.FuzzyCompleter(
             self.input_line_edit,
+            roles=gui_utils.ILIDATA_COMPLETER_ROLES,
+            delegate=self.ilireferencedata_delegate,
         )
-        completer.setCaseSensitivity(Qt.CaseInsensitive)
-        completer.setModelSorting(QCompleter.ModelSorting.CaseInsensitivelySortedModel)
-        completer.setFilterMode(Qt.MatchContains)
-        completer.popup().setItemDelegate(self.ilireferencedata_delegate)
-        self.input_line_edit.setCompleter(completer)
+        self.ilireferencedata_completer.set_source_model(
+            self.ilireferencedatacache.sorted_model
+        )
+        self.input_line_edit.setCompleter(self.ilireferencedata_completer)
         self.input_line_edit.textChanged.connect(self._complete_referencedata_completer)
         self.input_line_edit.punched.connect(self._complete_referencedata_completer)
         self.input_line_edit.textChanged.emit(self.input_line_edit.text())
@@ -158,44 +158,11 @@ class ReferencedataPage(QWizardPage, PAGE_UI):
 
     def _complete_referencedata_completer(self):
         if self.input_line_edit.hasFocus():
-            if not self.input_line_edit.text():
-                self.input_line_edit.completer().setCompletionMode(
-                    QCompleter.UnfilteredPopupCompletion
-                )
-                self.input_line_edit.completer().complete()
-            else:
-                match_contains = (
-                    self.input_line_edit.completer()
-                    .completionModel()
-                    .match(
-                        self.input_line_edit.completer().completionModel().index(0, 0),
-                        Qt.DisplayRole,
-                        self.input_line_edit.text(),
-                        -1,
-                        Qt.MatchContains,
-                    )
-                )
-                if len(match_contains) > 1:
-                    self.input_line_edit.completer().setCompletionMode(
-                        QCompleter.PopupCompletion
-                    )
-                    self.input_line_edit.completer().complete()
-            self.input_line_edit.completer().popup().scrollToTop()
+            self.ilireferencedata_completer.search(self.input_line_edit.text())
 
     def _valid_source(self):
-        match_contains = (
-            self.input_line_edit.completer()
-            .completionModel()
-            .match(
-                self.input_line_edit.completer().completionModel().index(0, 0),
-                Qt.DisplayRole,
-                self.input_line_edit.text(),
-                -1,
-                Qt.MatchExactly,
-            )
-        )
         return (
-            len(match_contains) == 1
+            self.ilireferencedata_completer.has_exact_match(self.input_line_edit.text())
             or self.fileValidator.validate(self.input_line_edit.text(), 0)[0]
             == QValidator.Acceptable
         )
@@ -216,12 +183,16 @@ class ReferencedataPage(QWizardPage, PAGE_UI):
 
     def append_dropped_files(self, dropped_files):
         if dropped_files:
-            for dropped_file in dropped_files:
-                self.add_source(
-                    dropped_file, self.tr("Added by user with drag'n'drop.")
-                )
+            origin_info = self.tr("Added by user with drag'n'drop.")
+            self.source_model.add_sources(
+                self._source_entry(dropped_file, origin_info)
+                for dropped_file in dropped_files
+            )
 
     def add_source(self, source, origin_info):
+        return self.source_model.add_source(*self._source_entry(source, origin_info))
+
+    def _source_entry(self, source, origin_info):
         if os.path.isfile(source):
             name = pathlib.Path(source).name
             type = pathlib.Path(source).suffix[1:]
@@ -244,7 +215,7 @@ class ReferencedataPage(QWizardPage, PAGE_UI):
                         model_index, int(IliDataItemModel.Roles.ID)
                     )
                 )
-        return self.source_model.add_source(name, type, path, origin_info)
+        return name, type, path, origin_info
 
     def _all_paths_from_model(self):
         paths = []
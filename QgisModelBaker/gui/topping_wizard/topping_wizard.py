@@ -130,6 +130,10 @@ class ToppingWizardDialog(QDialog):
         self.topping_wizard.show()
 
         self.topping_wizard.finished.connect(self.done)
+        self.finished.connect(
+            self.topping_wizard.layers_page.layermodel.disconnect_project
+        )
+        self.finished.connect(self.log_panel.clear)
         layout = QVBoxLayout()
         splitter = QSplitter(Qt.Vertical)
         splitter.addWidget(self.topping_wizard)
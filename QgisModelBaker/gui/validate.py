@@ -57,6 +57,7 @@ from QgisModelBaker.utils.gui_utils import (
     SchemaDatasetsModel,
     SchemaModelsModel,
 )
+from QgisModelBaker.utils.logging_utils import log_context, new_log_id
 
 DIALOG_UI = gui_utils.get_ui_class("validator.ui")
 
@@ -388,10 +389,15 @@ class ValidateDock(QDockWidget, DIALOG_UI):
         validation_result_state = False
         with OverrideCursor(Qt.WaitCursor):
             try:
-                self._validator_stdout(f"Run: {validator.command(True)}")
-                validation_result_state = (
-                    validator.run(edited_command) == ilivalidator.Validator.SUCCESS
-                )
+                with log_context(
+                    session_id=new_log_id(),
+                    schema=self.current_schema_identificator,
+                    phase="VALIDATE",
+                ):
+                    self._validator_stdout(f"Run: {validator.command(True)}")
+                    validation_result_state = (
+                        validator.run(edited_command) == ilivalidator.Validator.SUCCESS
+                    )
             except JavaNotFoundError as e:
                 self.progress_bar.setValue(0)
                 self.progress_bar.setFormat(self.tr("Ili2db validation problems"))
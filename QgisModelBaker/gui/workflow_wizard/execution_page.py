@@ -18,8 +18,10 @@
 """
 
 import copy
+import sqlite3
+import time
 
-from qgis.PyQt.QtCore import QCoreApplication, QEventLoop
+from qgis.PyQt.QtCore import QCoreApplication, QEventLoop, QSettings
 from qgis.PyQt.QtWidgets import (
     QSizePolicy,
     QSpacerItem,
@@ -30,8 +32,10 @@ from qgis.PyQt.QtWidgets import (
 
 import QgisModelBaker.libs.modelbaker.utils.db_utils as db_utils
 from QgisModelBaker.gui.panel.session_panel import SessionPanel
+from QgisModelBaker.libs.modelbaker.iliwrapper.globals import DbIliMode
 from QgisModelBaker.libs.modelbaker.utils.globals import DbActionType
 from QgisModelBaker.utils import gui_utils
+from QgisModelBaker.utils.gpkg_utils import GpkgBulkLoad, GpkgBulkLoadError
 from QgisModelBaker.utils.gui_utils import LogColor
 
 PAGE_UI = gui_utils.get_ui_class("workflow_wizard/execution.ui")
@@ -74,6 +78,23 @@ class ExecutionPage(QWizardPage, PAGE_UI):
         self.is_complete = False
         self.pending_sessions = []
 
+        self.configuration = None
+        settings = QSettings()
+        self.gpkg_bulk_load_checkbox.setChecked(
+            settings.value("QgisModelBaker/ili2gpkg/bulk_load", False, bool)
+        )
+        self.gpkg_defer_spatial_index_checkbox.setChecked(
+            settings.value(
+                "QgisModelBaker/ili2gpkg/bulk_load_defer_spatial_index", True, bool
+            )
+        )
+        self.gpkg_vacuum_checkbox.setChecked(
+            settings.value("QgisModelBaker/ili2gpkg/bulk_load_vacuum", False, bool)
+        )
+        self.gpkg_bulk_load_checkbox.toggled.connect(self._gpkg_bulk_load_toggled)
+        self._gpkg_bulk_load_toggled(self.gpkg_bulk_load_checkbox.isChecked())
+        self._set_gpkg_bulk_load_visible(False)
+
     def isComplete(self):
         return self.is_complete
 
@@ -87,7 +108,52 @@ class ExecutionPage(QWizardPage, PAGE_UI):
             return -1
         return self.workflow_wizard.next_id()
 
+    def _set_gpkg_bulk_load_visible(self, visible):
+        self.gpkg_bulk_load_checkbox.setVisible(visible)
+        self.gpkg_defer_spatial_index_checkbox.setVisible(visible)
+        self.gpkg_vacuum_checkbox.setVisible(visible)
+
+    def _gpkg_bulk_load_toggled(self, checked):
+        self.gpkg_defer_spatial_index_checkbox.setEnabled(checked)
+        self.gpkg_vacuum_checkbox.setEnabled(checked)
+
+    def _gpkg_bulk_load_available(self):
+        return bool(
+            self.db_action_type == DbActionType.IMPORT_DATA
+            and self.configuration
+            and self.configuration.tool & DbIliMode.gpkg
+        )
+
+    def _gpkg_bulk_load(self):
+        """
+        Returns the GpkgBulkLoad for the data import when it's requested, otherwise None.
+        """
+        if not self._gpkg_bulk_load_available():
+            return None
+        settings = QSettings()
+        settings.setValue(
+            "QgisModelBaker/ili2gpkg/bulk_load",
+            self.gpkg_bulk_load_checkbox.isChecked(),
+        )
+        if not self.gpkg_bulk_load_checkbox.isChecked():
+            return None
+        settings.setValue(
+            "QgisModelBaker/ili2gpkg/bulk_load_defer_spatial_index",
+            self.gpkg_defer_spatial_index_checkbox.isChecked(),
+        )
+        settings.setValue(
+            "QgisModelBaker/ili2gpkg/bulk_load_vacuum",
+            self.gpkg_vacuum_checkbox.isChecked(),
+        )
+        return GpkgBulkLoad(
+            self.configuration.dbfile,
+            defer_spatial_index=self.gpkg_defer_spatial_index_checkbox.isChecked(),
+            vacuum=self.gpkg_vacuum_checkbox.isChecked(),
+        )
+
     def setup_sessions(self, configuration, sessions):
+        self.configuration = configuration
+        self._set_gpkg_bulk_load_visible(self._gpkg_bulk_load_available())
         new_sessions = []
 
         for key in sessions:
@@ -169,12 +235,86 @@ class ExecutionPage(QWizardPage, PAGE_UI):
         self.setComplete(not self.pending_sessions)
 
     def _run(self):
+        bulk_load = self._gpkg_bulk_load()
+        if bulk_load is None:
+            self._run_sessions()
+            return
+        try:
+            prepared = bulk_load.prepare()
+        except (GpkgBulkLoadError, OSError, ImportError, sqlite3.Error) as exception:
+            self.workflow_wizard.log_panel.print_info(
+                self.tr("Could not prepare the GeoPackage bulk load: {}").format(
+                    exception
+                ),
+                LogColor.COLOR_FAIL,
+            )
+            self._run_sessions()
+            return
+        if not prepared:
+            self._run_sessions()
+            return
+
+        start = time.perf_counter()
+        success = False
+        try:
+            success = self._run_sessions()
+        finally:
+            import_time = time.perf_counter() - start
+            self.workflow_wizard.log_panel.print_info(
+                self.tr("Optimize the GeoPackage after the bulk load…"),
+                LogColor.COLOR_INFO,
+            )
+            finished = False
+            try:
+                bulk_load.finish(success)
+                finished = True
+            except (
+                GpkgBulkLoadError,
+                OSError,
+                ImportError,
+                sqlite3.Error,
+            ) as exception:
+                self.workflow_wizard.log_panel.print_info(
+                    self.tr("Could not finish the GeoPackage bulk load: {}").format(
+                        exception
+                    ),
+                    LogColor.COLOR_FAIL,
+                )
+            if success and finished:
+                self.workflow_wizard.log_panel.print_info(
+                    self.tr(
+                        "Imported in {:.2f}s with the GeoPackage bulk load."
+                    ).format(import_time),
+                    LogColor.COLOR_SUCCESS,
+                )
+                for line in bulk_load.report():
+                    self.workflow_wizard.log_panel.print_info(
+                        line, LogColor.COLOR_SUCCESS
+                    )
+            elif not success:
+                self.workflow_wizard.log_panel.print_info(
+                    self.tr(
+                        "Not all the imports with the GeoPackage bulk load were successful, the spatial indexes have been rebuilt and the settings restored, but the GeoPackage was not optimized."
+                    ),
+                    LogColor.COLOR_FAIL,
+                )
+
+    def _run_sessions(self):
+        """
+        Runs the sessions and returns whether all of them have been successful (and not skipped).
+        """
+        success = True
         loop = QEventLoop()
         for session_widget in self.session_widget_list:
             session_widget.on_done_or_skipped.connect(lambda: loop.quit())
-            # fall in a loop on fail untill the user skipped it or it has been successful
+            # fall in a loop on fail untill the user skipped it or it has been successful (a failed retry keeps it in the loop)
             if not session_widget.run():
-                loop.exec()
+                while not session_widget.is_skipped_or_done:
+                    loop.exec()
+                # the final outcome counts, not the first attempt
+                if session_widget.is_skipped:
+                    success = False
+        return success
 
     def _on_process_started(self, command):
         self.workflow_wizard.log_panel.print_info(command, "#000000")
@@ -188,6 +328,8 @@ class ExecutionPage(QWizardPage, PAGE_UI):
                 message = self.tr(
                     "Interlis model(s) successfully imported into the database!"
                 )
+                # the models in the database changed, so the referenced data can be looked up meanwhile
+                self.workflow_wizard.prefetch_referencedata()
             elif self.db_action_type == DbActionType.IMPORT_DATA:
                 message = self.tr(
                     "Transfer data successfully imported into the database!"
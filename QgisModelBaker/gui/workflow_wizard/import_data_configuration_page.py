@@ -25,7 +25,6 @@ from qgis.PyQt.QtGui import QIcon, QPixmap
 from qgis.PyQt.QtWidgets import (
     QAbstractItemView,
     QComboBox,
-    QCompleter,
     QHeaderView,
     QStyledItemDelegate,
     QTextEdit,
@@ -119,6 +118,12 @@ class ImportDataConfigurationPage(QWizardPage, PAGE_UI):
             self._on_referencedata_failed
         )
         self.ilireferencedata_delegate = IliDataFileCompleterDelegate()
+        self.ilireferencedata_completer = gui_utils.FuzzyCompleter(
+            self.ilireferencedata_line_edit,
+            roles=gui_utils.ILIDATA_COMPLETER_ROLES,
+            delegate=self.ilireferencedata_delegate,
+        )
+        self.ilireferencedata_line_edit.setCompleter(self.ilireferencedata_completer)
         self.ilireferencedata_line_edit.setPlaceholderText(
             self.tr("[Search referenced data files from UsabILIty Hub]")
         )
@@ -288,61 +293,22 @@ class ImportDataConfigurationPage(QWizardPage, PAGE_UI):
 
     def _complete_referencedata_completer(self):
         if self.ilireferencedata_line_edit.hasFocus():
-            if not self.ilireferencedata_line_edit.text():
-                self.ilireferencedata_line_edit.completer().setCompletionMode(
-                    QCompleter.UnfilteredPopupCompletion
-                )
-                self.ilireferencedata_line_edit.completer().complete()
-            else:
-                match_contains = (
-                    self.ilireferencedata_line_edit.completer()
-                    .completionModel()
-                    .match(
-                        self.ilireferencedata_line_edit.completer()
-                        .completionModel()
-                        .index(0, 0),
-                        Qt.DisplayRole,
-                        self.ilireferencedata_line_edit.text(),
-                        -1,
-                        Qt.MatchContains,
-                    )
-                )
-                if len(match_contains) > 1:
-                    self.ilireferencedata_line_edit.completer().setCompletionMode(
-                        QCompleter.PopupCompletion
-                    )
-                    self.ilireferencedata_line_edit.completer().complete()
-            self.ilireferencedata_line_edit.completer().popup().scrollToTop()
+            self.ilireferencedata_completer.search(
+                self.ilireferencedata_line_edit.text()
+            )
 
     def _valid_referencedata(self):
-        match_contains = (
-            self.ilireferencedata_line_edit.completer()
-            .completionModel()
-            .match(
-                self.ilireferencedata_line_edit.completer()
-                .completionModel()
-                .index(0, 0),
-                Qt.DisplayRole,
-                self.ilireferencedata_line_edit.text(),
-                -1,
-                Qt.MatchExactly,
-            )
+        return self.ilireferencedata_completer.has_exact_match(
+            self.ilireferencedata_line_edit.text()
         )
-        return len(match_contains) == 1
 
     def _valid_selection(self):
         return bool(self.file_table_view.selectedIndexes())
 
     def _update_referencedata_completer(self):
-        completer = QCompleter(
-            self.workflow_wizard.ilireferencedatacache.sorted_model,
-            self.ilireferencedata_line_edit,
+        self.ilireferencedata_completer.set_source_model(
+            self.workflow_wizard.ilireferencedatacache.sorted_model
         )
-        completer.setCaseSensitivity(Qt.CaseInsensitive)
-        completer.setModelSorting(QCompleter.ModelSorting.CaseInsensitivelySortedModel)
-        completer.setFilterMode(Qt.MatchContains)
-        completer.popup().setItemDelegate(self.ilireferencedata_delegate)
-        self.ilireferencedata_line_edit.setCompleter(completer)
         self.ilireferencedata_line_edit.setEnabled(
             bool(self.workflow_wizard.ilireferencedatacache.model.rowCount())
         )
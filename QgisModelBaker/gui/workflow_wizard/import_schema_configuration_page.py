@@ -24,7 +24,7 @@ import re
 
 from qgis.core import QgsCoordinateReferenceSystem
 from qgis.PyQt.QtCore import QSettings, Qt
-from qgis.PyQt.QtWidgets import QCompleter, QWizardPage
+from qgis.PyQt.QtWidgets import QWizardPage
 
 from QgisModelBaker.gui.ili2db_options import Ili2dbOptionsDialog
 from QgisModelBaker.libs.modelbaker.iliwrapper.globals import DbIliMode
@@ -36,6 +36,7 @@ from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import (
 from QgisModelBaker.utils import gui_utils
 from QgisModelBaker.utils.globals import CRS_PATTERNS
 from QgisModelBaker.utils.gui_utils import LogColor
+from QgisModelBaker.utils.topping_utils import ToppingFileResolver
 
 PAGE_UI = gui_utils.get_ui_class("workflow_wizard/import_schema_configuration.ui")
 
@@ -73,6 +74,12 @@ class ImportSchemaConfigurationPage(QWizardPage, PAGE_UI):
             self.workflow_wizard.import_schema_configuration.base_configuration
         )
         self.metaconfig_delegate = IliDataFileCompleterDelegate()
+        self.metaconfig_completer = gui_utils.FuzzyCompleter(
+            self.ili_metaconfig_line_edit,
+            roles=gui_utils.ILIDATA_COMPLETER_ROLES,
+            delegate=self.metaconfig_delegate,
+        )
+        self.ili_metaconfig_line_edit.setCompleter(self.metaconfig_completer)
         self.metaconfig = configparser.ConfigParser()
         self.current_models = []
         self.current_metaconfig_id = None
@@ -254,41 +261,10 @@ class ImportSchemaConfigurationPage(QWizardPage, PAGE_UI):
     def _complete_metaconfig_completer(self):
         if not self.ili_metaconfig_line_edit.text():
             self._clean_metaconfig()
-            self.ili_metaconfig_line_edit.completer().setCompletionMode(
-                QCompleter.UnfilteredPopupCompletion
-            )
-            self.ili_metaconfig_line_edit.completer().complete()
-        else:
-            match_contains = (
-                self.ili_metaconfig_line_edit.completer()
-                .completionModel()
-                .match(
-                    self.ili_metaconfig_line_edit.completer()
-                    .completionModel()
-                    .index(0, 0),
-                    Qt.DisplayRole,
-                    self.ili_metaconfig_line_edit.text(),
-                    -1,
-                    Qt.MatchContains,
-                )
-            )
-            if len(match_contains) > 1:
-                self.ili_metaconfig_line_edit.completer().setCompletionMode(
-                    QCompleter.PopupCompletion
-                )
-                self.ili_metaconfig_line_edit.completer().complete()
-
-            self.ili_metaconfig_line_edit.completer().popup().scrollToTop()
+        self.metaconfig_completer.search(self.ili_metaconfig_line_edit.text())
 
     def _update_metaconfig_completer(self, rows):
-        completer = QCompleter(
-            self.ilimetaconfigcache.sorted_model, self.ili_metaconfig_line_edit
-        )
-        completer.setCaseSensitivity(Qt.CaseInsensitive)
-        completer.setModelSorting(QCompleter.ModelSorting.CaseInsensitivelySortedModel)
-        completer.setFilterMode(Qt.MatchContains)
-        completer.popup().setItemDelegate(self.metaconfig_delegate)
-        self.ili_metaconfig_line_edit.setCompleter(completer)
+        self.metaconfig_completer.set_source_model(self.ilimetaconfigcache.sorted_model)
         self.ili_metaconfig_line_edit.setEnabled(bool(rows))
         self.workflow_wizard.busy(self, False)
 
@@ -411,14 +387,11 @@ class ImportSchemaConfigurationPage(QWizardPage, PAGE_UI):
                     ]
                 )
 
-        for linked_model in linked_models:
-            if self.workflow_wizard.source_model.add_source(
-                linked_model,
-                "model",
-                None,
-                self.tr("Linked model referenced over ilidata repository."),
-            ):
-                self.workflow_wizard.refresh_import_models()
+        origin_info = self.tr("Linked model referenced over ilidata repository.")
+        if self.workflow_wizard.source_model.add_sources(
+            (linked_model, "model", None, origin_info) for linked_model in linked_models
+        ):
+            self.workflow_wizard.refresh_import_models()
 
     def _load_crs_from_metaconfig(self, ili2db_metaconfig):
         srs_auth = self.srs_auth
@@ -437,6 +410,10 @@ class ImportSchemaConfigurationPage(QWizardPage, PAGE_UI):
 
     def _load_metaconfig(self):
         self.workflow_wizard.busy(self, True, "Load metaconfiguration...")
+        # collect all the referenced topping files to resolve and download them in one batch
+        self.workflow_wizard.prefetch_topping_files(
+            ToppingFileResolver.metaconfig_topping_ids(self.metaconfig)
+        )
         # load ili2db parameters to the GUI
         if "ch.ehi.ili2db" in self.metaconfig.sections():
             self.workflow_wizard.log_panel.print_info(
@@ -456,13 +433,11 @@ class ImportSchemaConfigurationPage(QWizardPage, PAGE_UI):
                 )
 
             if "models" in ili2db_metaconfig:
-                for model in ili2db_metaconfig.get("models").strip().split(";"):
-                    self.workflow_wizard.source_model.add_source(
-                        model,
-                        "model",
-                        None,
-                        self.tr("Model defined in metaconfigurationfile."),
-                    )
+                origin_info = self.tr("Model defined in metaconfigurationfile.")
+                self.workflow_wizard.source_model.add_sources(
+                    (model, "model", None, origin_info)
+                    for model in ili2db_metaconfig.get("models").strip().split(";")
+                )
                 self.workflow_wizard.log_panel.print_info(
                     self.tr("- Loaded models"), LogColor.COLOR_TOPPING
                 )
@@ -548,6 +523,10 @@ class ImportSchemaConfigurationPage(QWizardPage, PAGE_UI):
                 referencedata_file_path_list = (
                     self.workflow_wizard.get_topping_file_list(reference_data_list)
                 )
+                referencedata_sources = []
+                origin_info = self.tr(
+                    "Datafile referenced in the metaconfigurationfile."
+                )
                 for referencedata_file_path in referencedata_file_path_list:
                     if os.path.isfile(referencedata_file_path):
                         name = pathlib.Path(referencedata_file_path).name
@@ -558,13 +537,8 @@ class ImportSchemaConfigurationPage(QWizardPage, PAGE_UI):
                             ),
                             LogColor.COLOR_TOPPING,
                         )
-                        self.workflow_wizard.source_model.add_source(
-                            name,
-                            type,
-                            referencedata_file_path,
-                            self.tr(
-                                "Datafile referenced in the metaconfigurationfile."
-                            ),
+                        referencedata_sources.append(
+                            (name, type, referencedata_file_path, origin_info)
                         )
                     else:
                         self.workflow_wizard.log_panel.print_info(
@@ -573,6 +547,7 @@ class ImportSchemaConfigurationPage(QWizardPage, PAGE_UI):
                             ),
                             LogColor.COLOR_TOPPING,
                         )
+                self.workflow_wizard.source_model.add_sources(referencedata_sources)
             self.workflow_wizard.refresh_import_models()
 
         self.workflow_wizard.busy(self, False)
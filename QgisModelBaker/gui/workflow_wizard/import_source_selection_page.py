@@ -18,15 +18,12 @@
 """
 
 
+import os
+import urllib.parse
+
 from qgis.core import QgsApplication
 from qgis.PyQt.QtCore import Qt
-from qgis.PyQt.QtWidgets import (
-    QApplication,
-    QCompleter,
-    QMessageBox,
-    QPushButton,
-    QWizardPage,
-)
+from qgis.PyQt.QtWidgets import QApplication, QMessageBox, QPushButton, QWizardPage
 
 from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import (
     IliCache,
@@ -41,6 +38,12 @@ from QgisModelBaker.libs.modelbaker.utils.qt_utils import (
     make_file_selector,
 )
 from QgisModelBaker.utils import gui_utils
+from QgisModelBaker.utils.repository_utils import (
+    ILIMODELS_FILE,
+    is_url,
+    repository_directories,
+    shared_repository_index,
+)
 
 PAGE_UI = gui_utils.get_ui_class("workflow_wizard/import_source_selection.ui")
 
@@ -74,7 +77,17 @@ class ImportSourceSelectionPage(QWizardPage, PAGE_UI):
         self.ilicache = IliCache(
             self.workflow_wizard.import_schema_configuration.base_configuration
         )
+        self.ilicache.new_message.connect(self.workflow_wizard.log_panel.show_message)
+        # the repositories the ilicache is loaded for
+        self._loaded_repositories = None
+        # the information files of the repositories are revalidated in the background and the ilicache is only refreshed when they changed
+        self.repository_index = shared_repository_index()
+        self.repository_index.revalidated.connect(self._on_repositories_revalidated)
         self.model_delegate = ModelCompleterDelegate()
+        self.models_completer = gui_utils.FuzzyCompleter(
+            self.input_line_edit, delegate=self.model_delegate
+        )
+        self.input_line_edit.setCompleter(self.models_completer)
         self.input_line_edit.setPlaceholderText(
             self.tr("[Browse for file or search model from repository]")
         )
@@ -100,6 +113,10 @@ class ImportSourceSelectionPage(QWizardPage, PAGE_UI):
         self.source_list_view.files_dropped.connect(
             self.workflow_wizard.append_dropped_files
         )
+        self.source_list_view.accept_containers = True
+        self.source_list_view.containers_dropped.connect(
+            self.workflow_wizard.append_dropped_containers
+        )
 
         self.clear_cache_button = QPushButton(self.tr("Clear ilicache"), self)
         self.clear_cache_button.clicked.connect(self._clear_cache_button_clicked)
@@ -108,53 +125,65 @@ class ImportSourceSelectionPage(QWizardPage, PAGE_UI):
         return self.workflow_wizard.next_id()
 
     def initializePage(self) -> None:
-        self._refresh_ili_models_cache()
+        repositories = self._repositories()
+        if repositories == self._loaded_repositories and self.ilicache.model.rowCount():
+            # serve the loaded models meanwhile
+            self.repository_index.revalidate(repositories)
+        elif self.repository_index.has_content(repositories):
+            # serve the stored (possibly stale) models of a previous session meanwhile
+            self._load_ili_models_cache_from_index(repositories)
+            self.repository_index.revalidate(repositories)
+        else:
+            self._refresh_ili_models_cache()
+
+    def _repositories(self):
+        return repository_directories(
+            self.workflow_wizard.import_schema_configuration.base_configuration
+        )
 
     def _refresh_ili_models_cache(self):
-        self.ilicache.new_message.connect(self.workflow_wizard.log_panel.show_message)
         self.ilicache.refresh()
         self.update_models_completer()
+        self._loaded_repositories = self._repositories()
+        self.repository_index.revalidate(self._loaded_repositories)
+
+    def _load_ili_models_cache_from_index(self, repositories):
+        """
+        Fills the ilicache with the ilimodels.xml files stored in the repository index, without any request.
+        """
+        for repository in self.repository_index.repository_tree(repositories):
+            if not is_url(repository):
+                if os.path.isdir(repository):
+                    self.ilicache.process_model_directory(repository)
+                continue
+            ilimodels_file = self.repository_index.stored_file(
+                repository, ILIMODELS_FILE
+            )
+            if ilimodels_file:
+                # the key of the repository like the ilicache uses it after a download
+                parsed_url = urllib.parse.urlparse(repository)
+                self.ilicache._process_informationfile(
+                    ilimodels_file, parsed_url.netloc + parsed_url.path, repository
+                )
+        self.update_models_completer()
+        self._loaded_repositories = repositories
+
+    def _on_repositories_revalidated(self, changed_repositories):
+        if self._loaded_repositories and set(changed_repositories) & set(
+            self.repository_index.repository_tree(self._loaded_repositories)
+        ):
+            self.workflow_wizard.log_panel.print_info(
+                self.tr("Repository content changed, refresh ilicache...")
+            )
+            self._refresh_ili_models_cache()
 
     def _complete_models_completer(self):
         if self.input_line_edit.hasFocus():
-            if not self.input_line_edit.text():
-                self.input_line_edit.completer().setCompletionMode(
-                    QCompleter.UnfilteredPopupCompletion
-                )
-                self.input_line_edit.completer().complete()
-            else:
-                match_contains = (
-                    self.input_line_edit.completer()
-                    .completionModel()
-                    .match(
-                        self.input_line_edit.completer().completionModel().index(0, 0),
-                        Qt.DisplayRole,
-                        self.input_line_edit.text(),
-                        -1,
-                        Qt.MatchContains,
-                    )
-                )
-                if len(match_contains) > 1:
-                    self.input_line_edit.completer().setCompletionMode(
-                        QCompleter.PopupCompletion
-                    )
-                    self.input_line_edit.completer().complete()
-            self.input_line_edit.completer().popup().scrollToTop()
+            self.models_completer.search(self.input_line_edit.text())
 
     def _valid_source(self):
-        match_contains = (
-            self.input_line_edit.completer()
-            .completionModel()
-            .match(
-                self.input_line_edit.completer().completionModel().index(0, 0),
-                Qt.DisplayRole,
-                self.input_line_edit.text(),
-                -1,
-                Qt.MatchExactly,
-            )
-        )
         return (
-            len(match_contains) == 1
+            self.models_completer.has_exact_match(self.input_line_edit.text())
             or self.fileValidator.validate(self.input_line_edit.text(), 0)[0]
             == QValidator.Acceptable
         )
@@ -163,12 +192,8 @@ class ImportSourceSelectionPage(QWizardPage, PAGE_UI):
         return bool(self.source_list_view.selectedIndexes())
 
     def update_models_completer(self):
-        completer = QCompleter(self.ilicache.sorted_model, self.input_line_edit)
-        completer.setCaseSensitivity(Qt.CaseInsensitive)
-        completer.setModelSorting(QCompleter.ModelSorting.CaseInsensitivelySortedModel)
-        completer.setFilterMode(Qt.MatchContains)
-        completer.popup().setItemDelegate(self.model_delegate)
-        self.input_line_edit.setCompleter(completer)
+        # the index of the completer is updated with the changes of the model only
+        self.models_completer.set_source_model(self.ilicache.sorted_model)
 
     def _add_row(self):
         source = self.input_line_edit.text()
@@ -185,6 +210,8 @@ class ImportSourceSelectionPage(QWizardPage, PAGE_UI):
 
     def _clear_cache_button_clicked(self):
         with OverrideCursor(Qt.WaitCursor):
+            self.repository_index.clear()
+            self._loaded_repositories = None
 
             try:
                 IliCache.clear_cache()
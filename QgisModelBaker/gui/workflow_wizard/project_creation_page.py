@@ -24,7 +24,7 @@ import re
 import yaml
 from qgis.core import Qgis, QgsProject
 from qgis.PyQt.QtCore import Qt
-from qgis.PyQt.QtWidgets import QCompleter, QWizardPage
+from qgis.PyQt.QtWidgets import QWizardPage
 
 import QgisModelBaker.libs.modelbaker.utils.db_utils as db_utils
 from QgisModelBaker.libs.modelbaker.dataobjects.project import Project
@@ -36,7 +36,6 @@ from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import (
     IliDataCache,
     IliDataFileCompleterDelegate,
     IliDataItemModel,
-    IliToppingFileItemModel,
 )
 from QgisModelBaker.libs.modelbaker.utils.globals import OptimizeStrategy
 from QgisModelBaker.libs.modelbaker.utils.qt_utils import (
@@ -46,6 +45,8 @@ from QgisModelBaker.libs.modelbaker.utils.qt_utils import (
 from QgisModelBaker.utils import gui_utils
 from QgisModelBaker.utils.globals import CATALOGUE_DATASETNAME
 from QgisModelBaker.utils.gui_utils import TRANSFERFILE_MODELS_BLACKLIST, LogColor
+from QgisModelBaker.utils.topping_utils import ToppingFileResolver, apply_qml_styles
+from QgisModelBaker.yamltools.loader import safe_load_cached
 
 PAGE_UI = gui_utils.get_ui_class("workflow_wizard/project_creation.ui")
 
@@ -86,6 +87,11 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
 
         self.ilitoppingcache = IliDataCache(None)
         self.ilitopping_delegate = IliDataFileCompleterDelegate()
+        self.topping_completer = gui_utils.FuzzyCompleter(
+            self.topping_line_edit,
+            roles=gui_utils.ILIDATA_COMPLETER_ROLES,
+            delegate=self.ilitopping_delegate,
+        )
         self.topping_line_edit.setPlaceholderText(
             self.tr("[Search project toppings on the repositories or the local system]")
         )
@@ -168,17 +174,8 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
             self._enable_optimize_combo(True)
             self.ilitoppingcache.refresh()
 
-            completer = QCompleter(
-                self.ilitoppingcache.sorted_model,
-                self.topping_line_edit,
-            )
-            completer.setCaseSensitivity(Qt.CaseInsensitive)
-            completer.setModelSorting(
-                QCompleter.ModelSorting.CaseInsensitivelySortedModel
-            )
-            completer.setFilterMode(Qt.MatchContains)
-            completer.popup().setItemDelegate(self.ilitopping_delegate)
-            self.topping_line_edit.setCompleter(completer)
+            self.topping_completer.set_source_model(self.ilitoppingcache.sorted_model)
+            self.topping_line_edit.setCompleter(self.topping_completer)
 
     def _enable_topping_selection(self, state):
         # doublecheck if meanwhile user checked box again
@@ -197,31 +194,7 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
 
     def _complete_completer(self):
         if self.topping_line_edit.hasFocus() and self.topping_line_edit.completer():
-            if not self.topping_line_edit.text():
-                self.topping_line_edit.completer().setCompletionMode(
-                    QCompleter.UnfilteredPopupCompletion
-                )
-                self.topping_line_edit.completer().complete()
-            else:
-                match_contains = (
-                    self.topping_line_edit.completer()
-                    .completionModel()
-                    .match(
-                        self.topping_line_edit.completer()
-                        .completionModel()
-                        .index(0, 0),
-                        Qt.DisplayRole,
-                        self.topping_line_edit.text(),
-                        -1,
-                        Qt.MatchContains,
-                    )
-                )
-                if len(match_contains) > 1:
-                    self.topping_line_edit.completer().setCompletionMode(
-                        QCompleter.PopupCompletion
-                    )
-                    self.topping_line_edit.completer().complete()
-            self.topping_line_edit.completer().popup().scrollToTop()
+            self.topping_completer.search(self.topping_line_edit.text())
 
     def _on_completer_activated(self, text=None):
         self._clean_topping()
@@ -310,7 +283,7 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
             generator.new_message.connect(self.workflow_wizard.log_panel.show_message)
             self.progress_bar.setValue(30)
         except DBConnectorError as db_connector_error:
-            self.workflow_wizard.log_panel.txtStdout.setText(
+            self.workflow_wizard.log_panel.set_text(
                 self.tr(
                     "There was an error connecting to the database. Check connection parameters. Error details: {}".format(
                         db_connector_error
@@ -320,7 +293,7 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
             self.progress_bar.setValue(0)
             return
         except FileNotFoundError as file_not_found_error:
-            self.workflow_wizard.log_panel.txtStdout.setText(
+            self.workflow_wizard.log_panel.set_text(
                 self.tr(
                     "There was an error connecting to the database. Check connection parameters. Error details: {}".format(
                         file_not_found_error
@@ -331,7 +304,7 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
             return
 
         if not generator.db_or_schema_exists():
-            self.workflow_wizard.log_panel.txtStdout.setText(
+            self.workflow_wizard.log_panel.set_text(
                 self.tr(
                     "Source {} does not exist. Check connection parameters."
                 ).format(db_factory.get_specific_messages()["db_or_schema"])
@@ -342,7 +315,7 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
         res, message = db_factory.post_generate_project_validations(self.configuration)
 
         if not res:
-            self.workflow_wizard.log_panel.txtStdout.setText(message)
+            self.workflow_wizard.log_panel.set_text(message)
             self.progress_bar.setValue(0)
             return
 
@@ -357,7 +330,7 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
                 db_factory.get_specific_messages()["layers_source"]
             )
 
-            self.workflow_wizard.log_panel.txtStdout.setText(text)
+            self.workflow_wizard.log_panel.set_text(text)
             self.progress_bar.setValue(0)
             return
 
@@ -394,7 +367,12 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
                 )
                 with open(projecttopping_file_path) as stream:
                     try:
-                        projecttopping_data = yaml.safe_load(stream)
+                        projecttopping_data = safe_load_cached(stream)
+
+                        # collect all the referenced files to resolve and download them in one batch
+                        self.workflow_wizard.prefetch_topping_files(
+                            ToppingFileResolver.projecttopping_ids(projecttopping_data)
+                        )
 
                         # layertree / legend
                         layertree_key = "layertree"
@@ -547,34 +525,49 @@ class ProjectCreationPage(QWizardPage, PAGE_UI):
                 LogColor.COLOR_TOPPING,
             )
             qml_section = dict(self.configuration.metaconfig["qgis.modelbaker.qml"])
-            qml_file_model = self.workflow_wizard.get_topping_file_model(
+            # index the (lowercase) aliases once - the keys can be quoted, but the unquoted ones have priority
+            qml_ids = {
+                key.strip('"'): value
+                for key, value in qml_section.items()
+                if key.startswith('"')
+            }
+            qml_ids.update(
+                {
+                    key: value
+                    for key, value in qml_section.items()
+                    if not key.startswith('"')
+                }
+            )
+            qml_file_paths = self.workflow_wizard.get_topping_file_paths(
                 list(qml_section.values())
             )
+
+            layer_styles = []
             for layer in project.layers:
                 if layer.alias:
-                    if any(layer.alias.lower() == s for s in qml_section):
-                        layer_qml = layer.alias.lower()
-                    elif any(f'"{layer.alias.lower()}"' == s for s in qml_section):
-                        layer_qml = f'"{layer.alias.lower()}"'
-                    else:
-                        continue
-                    matches = qml_file_model.match(
-                        qml_file_model.index(0, 0),
-                        Qt.DisplayRole,
-                        qml_section[layer_qml],
-                        1,
+                    style_file_path = qml_file_paths.get(
+                        qml_ids.get(layer.alias.lower())
                     )
-                    if matches:
-                        style_file_path = matches[0].data(
-                            int(IliToppingFileItemModel.Roles.LOCALFILEPATH)
-                        )
+                    if style_file_path:
                         self.workflow_wizard.log_panel.print_info(
                             self.tr("Apply QML topping on layer {}:{}…").format(
                                 layer.alias, style_file_path
                             ),
                             LogColor.COLOR_TOPPING,
                         )
-                        layer.layer.loadNamedStyle(style_file_path)
+                        layer_styles.append((layer.layer, style_file_path))
+
+            # apply all the styles in one batch with only one repaint at the end
+            failed_styles = apply_qml_styles(
+                layer_styles, self.workflow_wizard.iface.mapCanvas()
+            )
+            for layer, style_file_path, error_msg in failed_styles:
+                self.workflow_wizard.log_panel.print_info(
+                    self.tr("Could not apply QML topping on layer {}:{} ({})").format(
+                        layer.name(), style_file_path, error_msg
+                    ),
+                    LogColor.COLOR_TOPPING,
+                )
 
         self.progress_bar.setValue(100)
         self.setStyleSheet(gui_utils.SUCCESS_STYLE)
@@ -20,6 +20,7 @@ import logging
 import os
 import pathlib
 import re
+import shutil
 
 from qgis.PyQt.QtCore import QEventLoop, QSize, Qt, QTimer
 from qgis.PyQt.QtWidgets import QDialog, QSplitter, QVBoxLayout, QWizard
@@ -60,6 +61,7 @@ from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import (
 )
 from QgisModelBaker.libs.modelbaker.utils.globals import DbActionType
 from QgisModelBaker.utils import gui_utils
+from QgisModelBaker.utils.drop_utils import DroppedFilesScanner
 from QgisModelBaker.utils.gui_utils import (
     FileDropListView,
     ImportDataModel,
@@ -73,6 +75,9 @@ from QgisModelBaker.utils.gui_utils import (
     SourceModel,
     TransferExtensions,
 )
+from QgisModelBaker.utils.logging_utils import new_log_id, update_log_context
+from QgisModelBaker.utils.repository_utils import repository_directories
+from QgisModelBaker.utils.topping_utils import ToppingFileResolver
 
 
 class WorkflowWizard(QWizard):
@@ -84,6 +89,8 @@ class WorkflowWizard(QWizard):
         self.setOption(QWizard.NoCancelButtonOnLastPage)
 
         self.current_id = 0
+        # correlates the log records of this wizard run
+        self.workflow_id = new_log_id()
 
         self.iface = iface
         self.log_panel = parent.log_panel
@@ -105,6 +112,12 @@ class WorkflowWizard(QWizard):
         # the source_model keeps all the sources (files or repositories) used and the dataset property
         self.source_model = SourceModel()
         self.source_model.print_info.connect(self.log_panel.print_info)
+        # the scanners of dropped directories and zip archives running in the background
+        self._dropped_files_scanners = []
+        # the INI/TOML files found by a scanner, applied when it's finished
+        self._scanned_ini_files = {}
+        # the directories the dropped zip archives are extracted to, removed when the wizard is finished
+        self._drop_extract_directories = []
 
         # the import_models_model keeps every single model as entry and a checked state
         self.import_models_model = ImportModelsModel()
@@ -121,6 +134,26 @@ class WorkflowWizard(QWizard):
             "referenceData",
         )
         self.ilireferencedatacache.new_message.connect(self.log_panel.show_message)
+        # the referenced data lookups are memoized: key (repositories, models, type) of the state the ilireferencedatacache is refreshed (or refreshing) to
+        self._referencedata_cache_key = None
+        self._referencedata_cache_fresh = False
+        self.ilireferencedatacache.model_refreshed.connect(
+            self._on_referencedata_cache_refreshed
+        )
+        # schema identificator -> model names in the database
+        self._db_modelnames_cache = {}
+
+        # the topping_file_resolver resolves and downloads the topping files (metaconfig, project topping) in batches and keeps them for the wizard run
+        self.topping_file_resolver = ToppingFileResolver(
+            self.import_schema_configuration.base_configuration
+        )
+        self.topping_file_resolver.file_progress.connect(self._topping_file_progress)
+        self.topping_file_resolver.file_failed.connect(
+            lambda topping_id, error_msg: self.log_panel.print_info(
+                self.tr("- - Could not get {}: {}").format(topping_id, error_msg),
+                LogColor.COLOR_TOPPING,
+            )
+        )
 
         # the current_models_model keeps every single model found in the current database and keeps the selected models
         self.current_models_model = SchemaModelsModel()
@@ -214,6 +247,7 @@ class WorkflowWizard(QWizard):
         self.setPage(PageIds.ExportDataExecution, self.export_data_execution_page)
 
         self.currentIdChanged.connect(self.id_changed)
+        self.finished.connect(lambda: update_log_context(workflow_id=None, phase=None))
 
     def sizeHint(self):
         return QSize(
@@ -234,6 +268,8 @@ class WorkflowWizard(QWizard):
             if self.current_id == PageIds.ImportDatabaseSelection:
                 if self.import_database_selection_page.is_valid():
                     self._update_configurations(self.import_database_selection_page)
+                    # the database might have changed meanwhile
+                    self._db_modelnames_cache.clear()
                     if self.refresh_import_models(True):
                         # when there are models to import, we go to the configuration page for schema import
                         return PageIds.ImportSchemaConfiguration
@@ -391,6 +427,10 @@ class WorkflowWizard(QWizard):
     def id_changed(self, new_id):
         self.current_id = new_id
 
+        update_log_context(
+            workflow_id=self.workflow_id, phase=self._page_log_name(self.current_id)
+        )
+
         self.log_panel.print_info(
             self.tr(f" > ---------- {self._current_page_title(self.current_id)}")
         )
@@ -510,6 +550,12 @@ class WorkflowWizard(QWizard):
         # and use schema config to save (db settings and the schema settings)
         page.save_configuration(self.import_schema_configuration)
 
+    def _page_log_name(self, id):
+        for name, page_id in vars(PageIds).items():
+            if page_id == id and not name.startswith("_"):
+                return name
+        return None
+
     def _current_page_title(self, id):
         if id == PageIds.ImportSourceSelection:
             return self.tr("Source Selection")
@@ -566,22 +612,55 @@ class WorkflowWizard(QWizard):
             self.source_model, db_connector, silent
         )
 
+    def prefetch_topping_files(self, id_list):
+        """
+        Resolves and downloads all the passed topping files in one batch, so the later requests of single files are served from the resolved ones.
+        """
+        if id_list:
+            self.log_panel.print_info(
+                self.tr("- - Resolve {} topping files…").format(len(id_list)),
+                LogColor.COLOR_TOPPING,
+            )
+            self.topping_file_resolver.resolve(id_list)
+
+    def get_topping_file_paths(self, id_list):
+        """
+        Returns a dict with the topping file ids as keys and the paths of the local files as values.
+        """
+        file_paths = self.topping_file_resolver.resolve(id_list)
+
+        # what is not resolved by the batch resolver (like file: ids) is got by the ilitoppingfilecache
+        missing_file_ids = [file_id for file_id in id_list if file_id not in file_paths]
+        if missing_file_ids:
+            topping_file_model = self.get_topping_file_model(missing_file_ids)
+            for row in range(topping_file_model.rowCount()):
+                index = topping_file_model.index(row, 0)
+                file_paths.setdefault(
+                    index.data(Qt.DisplayRole),
+                    index.data(int(topping_file_model.Roles.LOCALFILEPATH)),
+                )
+        return file_paths
+
     def get_topping_file_list(self, id_list):
-        topping_file_model = self.get_topping_file_model(id_list)
+        file_paths = self.get_topping_file_paths(id_list)
         file_path_list = []
-
         for file_id in id_list:
-            matches = topping_file_model.match(
-                topping_file_model.index(0, 0), Qt.DisplayRole, file_id, 1
-            )
-            if matches:
-                file_path = matches[0].data(int(topping_file_model.Roles.LOCALFILEPATH))
+            file_path = file_paths.get(file_id)
+            if file_path:
                 self.log_panel.print_info(
                     self.tr("- - Got file {}").format(file_path), LogColor.COLOR_TOPPING
                 )
                 file_path_list.append(file_path)
         return file_path_list
 
+    def _topping_file_progress(self, topping_id, received, total):
+        if self.log_panel.busy_bar.isVisible():
+            self.log_panel.busy_bar.setFormat(
+                self.tr("Downloading {} ({} of {} kB)…").format(
+                    topping_id, received // 1024, max(total, 0) // 1024
+                )
+            )
+
     def get_topping_file_model(self, id_list):
         topping_file_cache = IliToppingFileCache(
             self.import_schema_configuration.base_configuration, id_list
@@ -626,24 +705,59 @@ class WorkflowWizard(QWizard):
         return topping_file_cache.model
 
     def update_referecedata_cache_model(self, filter_models, type):
-        # updates the model and waits for the end
-        loop = QEventLoop()
-        self.ilireferencedatacache.model_refreshed.connect(lambda: loop.quit())
-        timer = QTimer()
-        timer.setSingleShot(True)
-        timer.timeout.connect(lambda: loop.quit())
-        timer.start(2000)
+        # updates the model and waits for the end - if it's not already refreshed for the same repositories and models
         self.refresh_referencedata_cache(filter_models, type)
-        loop.exec()
+        if not self._referencedata_cache_fresh:
+            loop = QEventLoop()
+            self.ilireferencedatacache.model_refreshed.connect(loop.quit)
+            timer = QTimer()
+            timer.setSingleShot(True)
+            timer.timeout.connect(loop.quit)
+            timer.start(2000)
+            loop.exec()
+            self.ilireferencedatacache.model_refreshed.disconnect(loop.quit)
         return self.ilireferencedatacache.model
 
     def refresh_referencedata_cache(self, filter_models, type):
+        key = (
+            tuple(repository_directories(self.base_config)),
+            frozenset(filter_models or []),
+            type,
+        )
+        if key == self._referencedata_cache_key:
+            # already refreshed or refreshing for the same repositories and models
+            return
+        self._referencedata_cache_key = key
+        self._referencedata_cache_fresh = False
         self.ilireferencedatacache.base_configuration = self.base_config
         self.ilireferencedatacache.filter_models = filter_models
         self.ilireferencedatacache.type = type
         self.ilireferencedatacache.refresh()
 
+    def prefetch_referencedata(self):
+        """
+        Starts the lookup of the referenced data for the models in the database without waiting for it.
+        Called when the models in the database changed (after the schema import), so the result is ready when the user continues.
+        """
+        self._db_modelnames_cache.clear()
+        self.refresh_referencedata_cache(
+            self._db_modelnames(self.import_data_configuration), "referenceData"
+        )
+
+    def _on_referencedata_cache_refreshed(self):
+        self._referencedata_cache_fresh = True
+
     def _db_modelnames(self, configuration):
+        schema_identificator = db_utils.get_schema_identificator_from_configuration(
+            configuration
+        )
+        if schema_identificator not in self._db_modelnames_cache:
+            self._db_modelnames_cache[schema_identificator] = self._read_db_modelnames(
+                configuration
+            )
+        return list(self._db_modelnames_cache[schema_identificator])
+
+    def _read_db_modelnames(self, configuration):
         db_connector = db_utils.get_db_connector(configuration)
         modelnames = list()
         if db_connector:
@@ -656,6 +770,17 @@ class WorkflowWizard(QWizard):
         return modelnames
 
     def add_source(self, source, origin_info):
+        return bool(self.add_sources([source], origin_info))
+
+    def add_sources(self, sources, origin_info):
+        """
+        Adds the files or model names in one batch to the source model and returns the number of added sources.
+        """
+        return self.source_model.add_sources(
+            self._source_entry(source, origin_info) for source in sources
+        )
+
+    def _source_entry(self, source, origin_info):
         if os.path.isfile(source):
             name = pathlib.Path(source).name
             type = pathlib.Path(source).suffix[1:]
@@ -664,7 +789,7 @@ class WorkflowWizard(QWizard):
             name = source
             type = "model"
             path = None
-        return self.source_model.add_source(name, type, path, origin_info)
+        return name, type, path, origin_info
 
     def remove_sources(self, indices):
         # if it's a ini/toml file that should be removed, then remove it from the config
@@ -677,11 +802,14 @@ class WorkflowWizard(QWizard):
 
     def append_dropped_files(self, dropped_files, dropped_ini_files):
         if dropped_files or dropped_ini_files:
-            for dropped_file in dropped_files + dropped_ini_files:
-                self.add_source(
-                    dropped_file, self.tr("Added by user with drag'n'drop.")
-                )
+            self.add_sources(
+                dropped_files + dropped_ini_files,
+                self.tr("Added by user with drag'n'drop."),
+            )
+
+        self._apply_dropped_ini_files(dropped_ini_files)
 
+    def _apply_dropped_ini_files(self, dropped_ini_files):
         if dropped_ini_files:
             if len(dropped_ini_files) > 1:
                 logging.warning(
@@ -694,12 +822,72 @@ class WorkflowWizard(QWizard):
                 dropped_ini_files[0]
             )
 
+    def append_dropped_containers(self, dropped_containers):
+        """
+        Scans the dropped directories and zip archives in the background and appends the found files batch by batch.
+        """
+        scanner = DroppedFilesScanner(dropped_containers, self)
+        scanner.files_found.connect(
+            lambda dropped_files, dropped_xml_files, dropped_ini_files: self._append_scanned_files(
+                scanner, dropped_files, dropped_xml_files, dropped_ini_files
+            )
+        )
+        scanner.finished.connect(lambda: self._dropped_files_scanned(scanner))
+        self._dropped_files_scanners.append(scanner)
+        self._scanned_ini_files[scanner] = []
+        self.log_panel.print_info(
+            self.tr("Scan {} for INTERLIS files…").format(", ".join(dropped_containers))
+        )
+        scanner.start()
+
+    def _append_scanned_files(
+        self, scanner, dropped_files, dropped_xml_files, dropped_ini_files
+    ):
+        # the INI/TOML files are listed as sources batch by batch, but only one is applied when the scan is finished
+        self.add_sources(
+            dropped_files + dropped_xml_files + dropped_ini_files,
+            self.tr("Added by user with drag'n'drop."),
+        )
+        self._scanned_ini_files.setdefault(scanner, []).extend(dropped_ini_files)
+
+    def _dropped_files_scanned(self, scanner):
+        if scanner not in self._dropped_files_scanners:
+            # already handled by stop_scanning
+            return
+        self._dropped_files_scanners.remove(scanner)
+        if scanner.extract_directory:
+            self._drop_extract_directories.append(scanner.extract_directory)
+        self._apply_dropped_ini_files(self._scanned_ini_files.pop(scanner, []))
+        self.log_panel.print_info(
+            self.tr("Scan of {} finished, found {} files.").format(
+                ", ".join(scanner.paths), scanner.found_count
+            )
+        )
+        scanner.deleteLater()
+
+    def stop_scanning(self):
+        """
+        Interrupts the running scans and removes the files extracted from the dropped zip archives.
+        """
+        for scanner in self._dropped_files_scanners:
+            scanner.requestInterruption()
+        for scanner in self._dropped_files_scanners:
+            scanner.wait()
+            if scanner.extract_directory:
+                self._drop_extract_directories.append(scanner.extract_directory)
+        self._dropped_files_scanners = []
+        self._scanned_ini_files = {}
+        for extract_directory in self._drop_extract_directories:
+            shutil.rmtree(extract_directory, ignore_errors=True)
+        self._drop_extract_directories = []
+
     def busy(self, page, busy, text="Busy..."):
         page.setEnabled(not busy)
         self.log_panel.busy_bar.setVisible(busy)
         if busy:
             self.log_panel.busy_bar.setFormat(text)
         else:
+            self.log_panel.flush()
             self.log_panel.scrollbar.setValue(self.log_panel.scrollbar.maximum())
 
 
@@ -717,6 +905,8 @@ class WorkflowWizardDialog(QDialog):
         self.workflow_wizard.setWindowFlags(Qt.Widget)
         self.workflow_wizard.show()
         self.workflow_wizard.finished.connect(self.done)
+        self.finished.connect(self.workflow_wizard.stop_scanning)
+        self.finished.connect(self.log_panel.clear)
 
         layout = QVBoxLayout()
         splitter = QSplitter(Qt.Vertical)
@@ -725,10 +915,15 @@ class WorkflowWizardDialog(QDialog):
         layout.addWidget(splitter)
         self.setLayout(layout)
 
-    def append_dropped_files(self, dropped_files, dropped_ini_files):
+    def append_dropped_files(
+        self, dropped_files, dropped_ini_files, dropped_containers=None
+    ):
         """
         Appends the files, restarts the wizard and jumps to the next page (what is ImportSourceSelection)
+        The content of dropped directories and zip archives is appended in the background.
         """
         self.workflow_wizard.append_dropped_files(dropped_files, dropped_ini_files)
+        if dropped_containers:
+            self.workflow_wizard.append_dropped_containers(dropped_containers)
         self.workflow_wizard.restart()
         self.workflow_wizard.next()
@@ -20,7 +20,6 @@ import configparser
 import datetime
 import locale
 import logging
-import logging.handlers
 import os
 import pathlib
 import webbrowser
@@ -37,6 +36,7 @@ from qgis.PyQt.QtCore import (
     QSettings,
     QStandardPaths,
     Qt,
+    QTimer,
     QTranslator,
     QUrl,
 )
@@ -44,18 +44,10 @@ from qgis.PyQt.QtGui import QDesktopServices, QIcon
 from qgis.PyQt.QtWidgets import QAction, QMessageBox
 from qgis.utils import available_plugins
 
-from QgisModelBaker.gui.dataset_manager import DatasetManagerDialog
-from QgisModelBaker.gui.drop_message import DropMessageDialog
-from QgisModelBaker.gui.options import OptionsDialog
-from QgisModelBaker.gui.panel.dataset_selector import DatasetSelector
-from QgisModelBaker.gui.tid_manager import TIDManagerDialog
-from QgisModelBaker.gui.topping_wizard.topping_wizard import ToppingWizardDialog
-from QgisModelBaker.gui.validate import ValidateDock
-from QgisModelBaker.gui.workflow_wizard.workflow_wizard import WorkflowWizardDialog
-from QgisModelBaker.libs.modelbaker.dataobjects.project import Project
-from QgisModelBaker.libs.modelbaker.generator.generator import Generator
-from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbconfig import BaseConfiguration
-from QgisModelBaker.utils.gui_utils import DropMode, FileDropListView
+from QgisModelBaker.utils.logging_utils import start_logging, stop_logging
+
+# The dialogs, the dock and the modelbaker library (with the database drivers and all the .ui forms)
+# are imported on their first use, so they do not slow down the start of QGIS.
 
 
 class QgisModelBakerPlugin(QObject):
@@ -96,16 +88,26 @@ class QgisModelBakerPlugin(QObject):
         self.translator.load(qgis_locale, "QgisModelBaker", "_", locale_path)
         QCoreApplication.installTranslator(self.translator)
 
-        self.ili2db_configuration = BaseConfiguration()
-        settings = QSettings()
-        settings.beginGroup("QgisModelBaker/ili2db")
-        self.ili2db_configuration.restore(settings)
+        self._ili2db_configuration = None
 
         self.logsDirectory = "{}/logs".format(basepath)
         self._initLogger()
 
         self.event_filter = DropFileFilter(self)
 
+    @property
+    def ili2db_configuration(self):
+        if not self._ili2db_configuration:
+            from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbconfig import (
+                BaseConfiguration,
+            )
+
+            self._ili2db_configuration = BaseConfiguration()
+            settings = QSettings()
+            settings.beginGroup("QgisModelBaker/ili2db")
+            self._ili2db_configuration.restore(settings)
+        return self._ili2db_configuration
+
     def register_event_filter(self):
         if not self.event_filter:
             self.event_filter = DropFileFilter(self)
@@ -117,10 +119,9 @@ class QgisModelBakerPlugin(QObject):
             self.event_filter.deleteLater()
 
     def initGui(self):
-        pyplugin_installer.installer.initPluginInstaller()
-        pyplugin_installer.installer_data.plugins.rebuild()
-
         if "projectgenerator" in available_plugins:
+            pyplugin_installer.installer.initPluginInstaller()
+            pyplugin_installer.installer_data.plugins.rebuild()
             pyplugin_installer.instance().uninstallPlugin(
                 "projectgenerator", quiet=True
             )
@@ -174,7 +175,6 @@ class QgisModelBakerPlugin(QObject):
         )
         self.__configseparator = QAction(None)
         self.__configseparator.setSeparator(True)
-        self.__dataset_selector_action = QAction(self.tr("Dataset Selector"))
         self.__configure_action = QAction(self.tr("Settings"), None)
         self.__infoseparator = QAction(None)
         self.__infoseparator.setSeparator(True)
@@ -242,16 +242,34 @@ class QgisModelBakerPlugin(QObject):
         self.toolbar.setObjectName("ModelBakerToolbar")
         self.toolbar.setToolTip(self.tr("Model Baker Toolbar"))
         self.toolbar.addAction(self.__workflow_wizard_action)
-        self.__dataset_selector = DatasetSelector()
-        self.__dataset_selector_action = self.toolbar.addWidget(self.__dataset_selector)
-        # connect trigger to refresh model of dataset combobox when layer changed
+        self.toolbar.addAction(self.__datasetmanager_action)
+        # the dataset selector is created with the first current layer and the validate dock when it's shown
         self.iface.layerTreeView().currentLayerChanged.connect(
-            self.__dataset_selector.set_current_layer
+            self.current_layer_changed
         )
-        self.toolbar.addAction(self.__datasetmanager_action)
-        self.init_validate_dock()
+        if QSettings().value(
+            "QgisModelBaker/validate_dock/isVisible", False, type=bool
+        ):
+            # restore the dock when QGIS is up
+            QTimer.singleShot(0, self.init_validate_dock)
         self.register_event_filter()
 
+    def current_layer_changed(self, layer):
+        if layer and not self.__dataset_selector:
+            self.init_dataset_selector()
+        if self.__dataset_selector:
+            self.__dataset_selector.set_current_layer(layer)
+        if self.__validate_dock:
+            self.__validate_dock.set_current_layer(layer)
+
+    def init_dataset_selector(self):
+        from QgisModelBaker.gui.panel.dataset_selector import DatasetSelector
+
+        self.__dataset_selector = DatasetSelector()
+        self.__dataset_selector_action = self.toolbar.insertWidget(
+            self.__datasetmanager_action, self.__dataset_selector
+        )
+
     def unload(self):
         self.unregister_event_filter()
         self.iface.removePluginDatabaseMenu(
@@ -271,10 +289,11 @@ class QgisModelBakerPlugin(QObject):
         self.iface.removePluginDatabaseMenu(
             self.tr("Model Baker"), self.__show_logs_folder_action
         )
-        self.toolbar.removeAction(self.__dataset_selector_action)
+        if self.__dataset_selector_action:
+            self.toolbar.removeAction(self.__dataset_selector_action)
 
         self.iface.layerTreeView().currentLayerChanged.disconnect(
-            self.__dataset_selector.set_current_layer
+            self.current_layer_changed
         )
         del self.__workflow_wizard_action
         del self.__datasetmanager_action
@@ -290,12 +309,19 @@ class QgisModelBakerPlugin(QObject):
         # remove the toolbar
         del self.toolbar
 
-        self.remove_validate_dock()
+        if self.__validate_dock:
+            self.remove_validate_dock()
+
+        stop_logging()
 
     def show_workflow_wizard_dialog(self):
         if self.workflow_wizard_dlg:
             self.workflow_wizard_dlg.reject()
         else:
+            from QgisModelBaker.gui.workflow_wizard.workflow_wizard import (
+                WorkflowWizardDialog,
+            )
+
             self.workflow_wizard_dlg = WorkflowWizardDialog(
                 self.iface, self.ili2db_configuration, self.iface.mainWindow()
             )
@@ -317,6 +343,10 @@ class QgisModelBakerPlugin(QObject):
         if self.topping_wizard_dlg:
             self.topping_wizard_dlg.reject()
         else:
+            from QgisModelBaker.gui.topping_wizard.topping_wizard import (
+                ToppingWizardDialog,
+            )
+
             self.topping_wizard_dlg = ToppingWizardDialog(
                 self.iface, self.ili2db_configuration, self.iface.mainWindow()
             )
@@ -338,6 +368,8 @@ class QgisModelBakerPlugin(QObject):
         if self.datasetmanager_dlg:
             self.datasetmanager_dlg.reject()
         else:
+            from QgisModelBaker.gui.dataset_manager import DatasetManagerDialog
+
             self.datasetmanager_dlg = DatasetManagerDialog(
                 self.iface, self.iface.mainWindow()
             )
@@ -352,7 +384,10 @@ class QgisModelBakerPlugin(QObject):
             self.__datasetmanager_action.setChecked(True)
 
     def datasetmanager_dialog_finished(self):
-        self.__dataset_selector.reset_model(self.iface.layerTreeView().currentLayer())
+        if self.__dataset_selector:
+            self.__dataset_selector.reset_model(
+                self.iface.layerTreeView().currentLayer()
+            )
         self.__datasetmanager_action.setChecked(False)
         self.datasetmanager_dlg = None
 
@@ -360,6 +395,8 @@ class QgisModelBakerPlugin(QObject):
         if self.tidmanager_dlg:
             self.tidmanager_dlg.reject()
         else:
+            from QgisModelBaker.gui.tid_manager import TIDManagerDialog
+
             self.tidmanager_dlg = TIDManagerDialog(
                 self.iface, self.iface.mainWindow(), self.ili2db_configuration
             )
@@ -376,9 +413,15 @@ class QgisModelBakerPlugin(QObject):
         self.tidmanager_dlg = None
 
     def show_validate_dock(self):
+        if not self.__validate_dock:
+            self.init_validate_dock()
+            if self.__validate_dock.isVisible():
+                return
         self.__validate_dock.setVisible(not self.__validate_dock.isVisible())
 
     def show_options_dialog(self):
+        from QgisModelBaker.gui.options import OptionsDialog
+
         dlg = OptionsDialog(self.ili2db_configuration)
         if dlg.exec_():
             settings = QSettings()
@@ -425,6 +468,10 @@ class QgisModelBakerPlugin(QObject):
         self.msg.exec_()
 
     def init_validate_dock(self):
+        if self.__validate_dock:
+            return
+        from QgisModelBaker.gui.validate import ValidateDock
+
         settings = QSettings()
         self.__validate_dock = ValidateDock(self.ili2db_configuration, self.iface)
         self.iface.addDockWidget(
@@ -439,8 +486,8 @@ class QgisModelBakerPlugin(QObject):
         self.__validate_dock.setVisible(
             settings.value("QgisModelBaker/validate_dock/isVisible", False, type=bool)
         )
-        self.iface.layerTreeView().currentLayerChanged.connect(
-            self.__validate_dock.set_current_layer
+        self.__validate_dock.set_current_layer(
+            self.iface.layerTreeView().currentLayer()
         )
 
     def remove_validate_dock(self):
@@ -454,12 +501,11 @@ class QgisModelBakerPlugin(QObject):
         )
         self.__validate_dock.setVisible(False)
         self.iface.removeDockWidget(self.__validate_dock)
-        self.iface.layerTreeView().currentLayerChanged.disconnect(
-            self.__validate_dock.set_current_layer
-        )
         del self.__validate_dock
 
     def get_generator(self):
+        from QgisModelBaker.libs.modelbaker.generator.generator import Generator
+
         return Generator
 
     def create_project(
@@ -487,6 +533,8 @@ class QgisModelBakerPlugin(QObject):
                                         provider side when requested and not
                                         when committed. (from QGIS docs)
         """
+        from QgisModelBaker.libs.modelbaker.dataobjects.project import Project
+
         project = Project(auto_transaction, evaluate_default_values)
         project.layers = layers
         project.relations = relations
@@ -496,11 +544,15 @@ class QgisModelBakerPlugin(QObject):
         qgis_project = QgsProject.instance()
         project.create(None, qgis_project, group)
 
-    def handle_dropped_files(self, dropped_files, dropped_ini_files):
+    def handle_dropped_files(
+        self, dropped_files, dropped_ini_files, dropped_containers=None
+    ):
         if not self.workflow_wizard_dlg:
             self._set_dropped_file_configuration()
             self.show_workflow_wizard_dialog()
-        self.workflow_wizard_dlg.append_dropped_files(dropped_files, dropped_ini_files)
+        self.workflow_wizard_dlg.append_dropped_files(
+            dropped_files, dropped_ini_files, dropped_containers
+        )
         return True
 
     def _set_dropped_file_configuration(self):
@@ -525,23 +577,13 @@ class QgisModelBakerPlugin(QObject):
         if directory.exists():
             logfile = QFileInfo(directory, "ModelBaker.log")
 
-            # Handler for files rotation, create one log per day
-            rotationHandler = logging.handlers.TimedRotatingFileHandler(
-                logfile.filePath(), when="midnight", backupCount=10
-            )
-
-            # Configure logging
-            logging.basicConfig(
-                level=logging.DEBUG,
-                format="%(asctime)s %(levelname)-7s %(message)s",
-                handlers=[rotationHandler],
-            )
+            # JSON lines written in the background, rotated per day and by size
+            start_logging(logfile.filePath())
         else:
             logging.error(
                 "Can't create log files directory '{}'.".format(self.logsDirectory)
             )
 
-        logging.info("")
         logging.info("Starting Model Baker plugin version {}".format(self.__version__))
 
 
@@ -551,6 +593,9 @@ class DropFileFilter(QObject):
         self.parent = parent
 
     def _is_handling_requested(self, dropped_files):
+        from QgisModelBaker.gui.drop_message import DropMessageDialog
+        from QgisModelBaker.utils.gui_utils import DropMode
+
         settings = QSettings()
         drop_mode = DropMode[
             settings.value("QgisModelBaker/drop_mode", DropMode.ASK.name, str)
@@ -565,18 +610,30 @@ class DropFileFilter(QObject):
         When files are dropped, then ask to use it in the model baker.
         """
         if event.type() == QEvent.Drop:
+            from QgisModelBaker.utils.drop_utils import contains_interlis_files
+            from QgisModelBaker.utils.gui_utils import FileDropListView
+
+            urls = event.mimeData().urls()
             (
                 dropped_files,
                 dropped_xml_files,
                 dropped_ini_files,
-            ) = FileDropListView.extractDroppedFiles(event.mimeData().urls())
+            ) = FileDropListView.extractDroppedFiles(urls)
+            # directories and zip archives are only taken when their names show interlis files, their content is scanned in the wizard
+            dropped_containers = [
+                container
+                for container in FileDropListView.extractDroppedContainers(urls)
+                if contains_interlis_files(container)
+            ]
 
             # Outside wizard, accept drops only for "real" interlis files, as xml and ini are too generic to assume must be handled by MB
-            if dropped_files:
+            if dropped_files or dropped_containers:
                 dropped_files.extend(dropped_xml_files)
-                if self._is_handling_requested(dropped_files + dropped_ini_files):
+                if self._is_handling_requested(
+                    dropped_files + dropped_ini_files + dropped_containers
+                ):
                     if self.parent.handle_dropped_files(
-                        dropped_files, dropped_ini_files
+                        dropped_files, dropped_ini_files, dropped_containers
                     ):
                         return True
         return False
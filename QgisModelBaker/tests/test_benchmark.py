@@ -0,0 +1,180 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import shutil
+import tempfile
+
+import yaml
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.tests.utils import (
+    BENCHMARK_MODEL,
+    BenchmarkBaseline,
+    generate_ili_folder,
+    generate_itf,
+    generate_projecttopping,
+    generate_xtf,
+)
+from QgisModelBaker.utils.gui_utils import ImportModelsModel, SourceModel
+from QgisModelBaker.yamltools.loader import InheritanceLoader, safe_load_cached
+
+start_app()
+
+# The benchmarks run only when MODELBAKER_BENCHMARK is set, e.g.
+# MODELBAKER_BENCHMARK=1 MODELBAKER_BENCHMARK_BASELINE=~/baseline.json MODELBAKER_BENCHMARK_SIZES=1,256,4096 python -m pytest QgisModelBaker/tests/test_benchmark.py -s
+# - MODELBAKER_BENCHMARK_SIZES: sizes of the generated transfer files in MB (default 1,64)
+# - MODELBAKER_BENCHMARK_ILI_FILES: number of generated ili files (default 200)
+# - MODELBAKER_BENCHMARK_THRESHOLD: allowed factor to the baseline before failing (default 1.25)
+# - MODELBAKER_BENCHMARK_BASELINE: the JSON file with the baseline timings of this machine (required, the benchmarks are skipped without it)
+# - MODELBAKER_BENCHMARK_UPDATE: write the current timings to the baseline file instead of comparing them
+BENCHMARK_ENABLED = bool(os.environ.get("MODELBAKER_BENCHMARK"))
+BENCHMARK_BASELINE = os.environ.get("MODELBAKER_BENCHMARK_BASELINE")
+BENCHMARK_UPDATE = bool(os.environ.get("MODELBAKER_BENCHMARK_UPDATE"))
+BENCHMARK_SIZES = [
+    float(size)
+    for size in os.environ.get("MODELBAKER_BENCHMARK_SIZES", "1,64").split(",")
+]
+BENCHMARK_ILI_FILES = int(os.environ.get("MODELBAKER_BENCHMARK_ILI_FILES", 200))
+# the header within and beyond the 100 lines the xtf detection reads
+HEADER_OFFSETS = [0, 50, 500]
+
+
+@unittest.skipUnless(BENCHMARK_ENABLED, "Set MODELBAKER_BENCHMARK to run benchmarks")
+class BenchmarkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not BENCHMARK_BASELINE:
+            raise unittest.SkipTest(
+                "Set MODELBAKER_BENCHMARK_BASELINE to the baseline timings of this machine"
+            )
+        if not BENCHMARK_UPDATE and not os.path.isfile(BENCHMARK_BASELINE):
+            raise unittest.SkipTest(
+                f"No baseline {BENCHMARK_BASELINE}, record it with MODELBAKER_BENCHMARK_UPDATE"
+            )
+        cls.baseline = BenchmarkBaseline(
+            BENCHMARK_BASELINE,
+            float(os.environ.get("MODELBAKER_BENCHMARK_THRESHOLD", 1.25)),
+            BENCHMARK_UPDATE,
+        )
+        cls.basetestpath = tempfile.mkdtemp()
+        cls.transfer_files = {}
+        for size_mb in BENCHMARK_SIZES:
+            for header_offset in HEADER_OFFSETS:
+                for kind, generate in [("xtf", generate_xtf), ("itf", generate_itf)]:
+                    cls.transfer_files[(kind, size_mb, header_offset)] = generate(
+                        os.path.join(
+                            cls.basetestpath,
+                            f"benchmark_{size_mb:g}mb_{header_offset}.{kind}",
+                        ),
+                        size_mb,
+                        header_offset,
+                    )
+        cls.ili_files = generate_ili_folder(
+            os.path.join(cls.basetestpath, "models"), BENCHMARK_ILI_FILES
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.baseline.save()
+        shutil.rmtree(cls.basetestpath, ignore_errors=True)
+
+    def assertBenchmark(self, name, function, repeat=3):
+        seconds = BenchmarkBaseline.measure(function, repeat)
+        within_threshold, baseline = self.baseline.check(name, seconds)
+        self.assertIsNotNone(
+            baseline,
+            f"{name} has no baseline in {self.baseline.path}, record it with MODELBAKER_BENCHMARK_UPDATE",
+        )
+        print(f"{name}: {seconds:.4f}s (baseline {baseline:.4f}s)")
+        self.assertTrue(
+            within_threshold,
+            f"{name} took {seconds:.4f}s, more than {self.baseline.threshold} times the baseline of {baseline:.4f}s",
+        )
+
+    def test_transfer_file_models(self):
+        import_models_model = ImportModelsModel()
+        for (kind, size_mb, header_offset), path in self.transfer_files.items():
+            models = import_models_model._transfer_file_models(path)
+            if kind == "itf" or header_offset < 100:
+                self.assertEqual([model["name"] for model in models], [BENCHMARK_MODEL])
+            self.assertBenchmark(
+                f"transfer_file_models_{kind}_{size_mb:g}mb_header_{header_offset}",
+                lambda: import_models_model._transfer_file_models(path),
+            )
+
+    def test_add_source(self):
+        def add_sources():
+            source_model = SourceModel()
+            for path in self.ili_files:
+                source_model.add_source(
+                    os.path.splitext(os.path.basename(path))[0], "ili", path
+                )
+            return source_model
+
+        self.assertEqual(add_sources().rowCount(), len(self.ili_files))
+        self.assertBenchmark(f"add_source_{len(self.ili_files)}", add_sources)
+
+    def test_add_sources(self):
+        def add_sources():
+            source_model = SourceModel()
+            source_model.add_sources(
+                (os.path.splitext(os.path.basename(path))[0], "ili", path, None)
+                for path in self.ili_files + self.ili_files
+            )
+            return source_model
+
+        self.assertEqual(add_sources().rowCount(), len(self.ili_files))
+        self.assertBenchmark(f"add_sources_{len(self.ili_files)}", add_sources)
+
+    def test_refresh_model(self):
+        source_model = SourceModel()
+        for path in self.ili_files:
+            source_model.add_source(
+                os.path.splitext(os.path.basename(path))[0], "ili", path
+            )
+        for (kind, size_mb, header_offset), path in self.transfer_files.items():
+            if size_mb == BENCHMARK_SIZES[0]:
+                source_model.add_source(os.path.basename(path), kind, path)
+
+        import_models_model = ImportModelsModel()
+        import_models_model.refresh_model(source_model, silent=True)
+        self.assertGreaterEqual(import_models_model.rowCount(), len(self.ili_files))
+        self.assertBenchmark(
+            f"refresh_model_{len(self.ili_files)}_ili_files",
+            lambda: import_models_model.refresh_model(source_model, silent=True),
+        )
+
+    def test_inheritance_loader(self):
+        document = generate_projecttopping(2000, with_inheritance=True)
+        data = yaml.load(document, Loader=InheritanceLoader)
+        self.assertEqual(len(data["layerorder"]), 2000)
+        self.assertBenchmark(
+            "inheritance_loader_2000_layers",
+            lambda: yaml.load(document, Loader=InheritanceLoader),
+        )
+
+    def test_safe_load(self):
+        document = generate_projecttopping(500)
+        self.assertEqual(len(safe_load_cached(document)["layerorder"]), 500)
+        self.assertBenchmark("safe_load_500_layers", lambda: yaml.safe_load(document))
+        # the first call in measure fills the cache
+        self.assertBenchmark(
+            "safe_load_cached_500_layers", lambda: safe_load_cached(document)
+        )
@@ -0,0 +1,196 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import platform
+import shutil
+import tempfile
+
+from qgis.core import QgsProject
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.libs.modelbaker.dataobjects.project import Project
+from QgisModelBaker.libs.modelbaker.db_factory.gpkg_command_config_manager import (
+    GpkgCommandConfigManager,
+)
+from QgisModelBaker.libs.modelbaker.generator.generator import Generator
+from QgisModelBaker.libs.modelbaker.iliwrapper import (
+    iliexecutable,
+    iliexporter,
+    iliimporter,
+    ilivalidator,
+)
+from QgisModelBaker.libs.modelbaker.iliwrapper.globals import DbIliMode
+from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbconfig import (
+    BaseConfiguration,
+    ExportConfiguration,
+    ImportDataConfiguration,
+    SchemaImportConfiguration,
+    ValidateConfiguration,
+)
+from QgisModelBaker.libs.modelbaker.utils.globals import OptimizeStrategy
+from QgisModelBaker.tests.utils import (
+    BENCHMARK_MODEL,
+    BenchmarkPhases,
+    generate_benchmark_model,
+    generate_xtf,
+)
+from QgisModelBaker.utils.globals import CATALOGUE_DATASETNAME
+
+start_app()
+
+# The end-to-end benchmark runs only when MODELBAKER_BENCHMARK_GPKG is set, e.g.
+# MODELBAKER_BENCHMARK_GPKG=1 MODELBAKER_BENCHMARK_GPKG_SIZE=512 python -m pytest QgisModelBaker/tests/test_benchmark_gpkg.py -s
+# - MODELBAKER_BENCHMARK_GPKG_SIZE: size of the generated transfer file in MB (default 10)
+# - MODELBAKER_BENCHMARK_GPKG_REPORT: the JSON file with the per phase results (default benchmark_gpkg.json in the temp directory)
+# It needs Java, ili2gpkg and ilivalidator are downloaded on the first run.
+BENCHMARK_GPKG_ENABLED = bool(os.environ.get("MODELBAKER_BENCHMARK_GPKG"))
+BENCHMARK_GPKG_SIZE = float(os.environ.get("MODELBAKER_BENCHMARK_GPKG_SIZE", 10))
+
+
+@unittest.skipUnless(
+    BENCHMARK_GPKG_ENABLED, "Set MODELBAKER_BENCHMARK_GPKG to run the benchmark"
+)
+class GpkgBenchmarkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.basetestpath = tempfile.mkdtemp()
+        cls.model_directory = os.path.join(cls.basetestpath, "models")
+        os.makedirs(cls.model_directory)
+        cls.ilifile = generate_benchmark_model(
+            os.path.join(cls.model_directory, f"{BENCHMARK_MODEL}.ili")
+        )
+        cls.xtffile = generate_xtf(
+            os.path.join(cls.basetestpath, "benchmark.xtf"), BENCHMARK_GPKG_SIZE
+        )
+        cls.dbfile = os.path.join(cls.basetestpath, "benchmark.gpkg")
+        cls.report = os.environ.get(
+            "MODELBAKER_BENCHMARK_GPKG_REPORT",
+            os.path.join(tempfile.gettempdir(), "benchmark_gpkg.json"),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        QgsProject.instance().clear()
+        shutil.rmtree(cls.basetestpath, ignore_errors=True)
+
+    def _configure(self, configuration):
+        """
+        The settings shared by all ili2db runs, like the session panels and the validate dock get them.
+        """
+        configuration.base_configuration = BaseConfiguration()
+        configuration.base_configuration.custom_model_directories_enabled = True
+        configuration.base_configuration.custom_model_directories = self.model_directory
+        configuration.tool = DbIliMode.ili2gpkg
+        configuration.dbfile = self.dbfile
+        configuration.ilimodels = BENCHMARK_MODEL
+        return configuration
+
+    def _run(self, porter, configuration):
+        # like SessionPanel._get_porter and SessionPanel.run
+        porter.tool = configuration.tool
+        porter.configuration = configuration
+        self.assertEqual(porter.run(), iliexecutable.IliExecutable.SUCCESS)
+
+    def _schema_import(self):
+        configuration = self._configure(SchemaImportConfiguration())
+        configuration.ilifile = self.ilifile
+        configuration.inheritance = "smart2"
+        self._run(iliimporter.Importer(), configuration)
+
+    def _data_import(self):
+        configuration = self._configure(ImportDataConfiguration())
+        configuration.xtffile = self.xtffile
+        self._run(iliimporter.Importer(dataImport=True), configuration)
+
+    def _create_project(self):
+        # like ProjectCreationPage._create_project without toppings
+        configuration = self._configure(SchemaImportConfiguration())
+        configuration.inheritance = "smart2"
+        config_manager = GpkgCommandConfigManager(configuration)
+        generator = Generator(
+            configuration.tool,
+            config_manager.get_uri(qgis=True),
+            configuration.inheritance,
+            configuration.dbschema,
+            mgmt_uri=config_manager.get_uri(),
+            consider_basket_handling=True,
+            optimize_strategy=OptimizeStrategy.NONE,
+        )
+        available_layers = generator.layers()
+        relations, bags_of_enum = generator.relations(available_layers)
+        legend = generator.legend(available_layers)
+
+        project = Project(
+            auto_transaction="Disabled",
+            context={"catalogue_datasetname": CATALOGUE_DATASETNAME},
+            optimize_strategy=OptimizeStrategy.NONE,
+        )
+        project.layers = available_layers
+        project.relations = relations
+        project.bags_of_enum = bags_of_enum
+        project.legend = legend
+        project.post_generate()
+        project.create(None, QgsProject.instance())
+        return len(available_layers)
+
+    def _validate(self):
+        # like ValidateDock.run
+        configuration = self._configure(ValidateConfiguration())
+        configuration.xtflog = os.path.join(self.basetestpath, "validation.xtf")
+        configuration.dataset = ""
+        configuration.baskets = []
+        configuration.iliexportmodels = ""
+        configuration.skip_geometry_errors = False
+        self._run(ilivalidator.Validator(), configuration)
+
+    def _export(self):
+        configuration = self._configure(ExportConfiguration())
+        configuration.xtffile = os.path.join(self.basetestpath, "export.xtf")
+        self._run(iliexporter.Exporter(), configuration)
+        return configuration.xtffile
+
+    def test_end_to_end(self):
+        phases = BenchmarkPhases(self.dbfile)
+        with phases.phase("schema_import"):
+            self._schema_import()
+        with phases.phase("data_import"):
+            self._data_import()
+        with phases.phase("project_creation"):
+            self.assertGreater(self._create_project(), 0)
+        with phases.phase("validation"):
+            self._validate()
+        with phases.phase("export"):
+            exported_xtffile = self._export()
+        self.assertTrue(os.path.isfile(exported_xtffile))
+
+        phases.save(
+            self.report,
+            transfer_file_size_mb=BENCHMARK_GPKG_SIZE,
+            machine=platform.machine(),
+            processor=platform.processor(),
+            cpu_count=os.cpu_count(),
+            python=platform.python_version(),
+        )
+        for phase in phases.phases:
+            print(
+                "{phase}: {wall_time:.2f}s, peak RSS {peak_rss_mb} MB (ili2db {peak_children_rss_mb} MB), database {db_size_mb:.1f} MB".format(
+                    **phase
+                )
+            )
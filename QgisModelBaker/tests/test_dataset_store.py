@@ -0,0 +1,244 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import sqlite3
+import uuid
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.utils.dataset_utils import DatasetStore, DatasetStoreError
+from QgisModelBaker.utils.gui_utils import DatasetModel
+
+start_app()
+
+
+class GpkgConnector:
+    """
+    The attributes of the GeoPackage db connector used by the DatasetStore.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.tid = "T_Id"
+        self.tilitid = "T_Ili_Tid"
+        self.dataset_table_name = "T_ILI2DB_DATASET"
+        self.basket_table_name = "T_ILI2DB_BASKET"
+
+
+class TestDatasetStore(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.executescript(
+            """
+            CREATE TABLE T_ILI2DB_DATASET (T_Id INTEGER PRIMARY KEY, datasetname TEXT UNIQUE);
+            CREATE TABLE T_ILI2DB_BASKET (T_Id INTEGER PRIMARY KEY, dataset INTEGER, topic TEXT, T_Ili_Tid TEXT, attachmentKey TEXT);
+            CREATE TABLE T_KEY_OBJECT (T_Key TEXT PRIMARY KEY, T_LastUniqueId INTEGER, T_LastChange TEXT, T_CreateDate TEXT, T_User TEXT);
+            CREATE TABLE building (T_Id INTEGER PRIMARY KEY, T_basket INTEGER, T_Ili_Tid TEXT, street INTEGER REFERENCES street (T_Id) DEFERRABLE INITIALLY DEFERRED);
+            CREATE TABLE street (T_Id INTEGER PRIMARY KEY, T_basket INTEGER, T_Ili_Tid TEXT);
+            INSERT INTO T_ILI2DB_DATASET VALUES (1, 'Catalogueset');
+            INSERT INTO T_KEY_OBJECT VALUES ('T_Id', 5000, NULL, '2026-01-01', 'ili2db');
+            """
+        )
+        self.connection.executemany(
+            "INSERT INTO T_ILI2DB_DATASET VALUES (?, ?)",
+            [(tid, f"delivery_{tid:04}") for tid in range(2, 502)]
+            + [(600, "100%_done")],
+        )
+        self.connection.executemany(
+            "INSERT INTO T_ILI2DB_BASKET VALUES (?, ?, ?, ?, 'ili2db')",
+            [
+                (1000, 2, "Model.Buildings", "0d4d6a4e-3a4f-4f10-9a62-a1f1a4a8a6c1"),
+                (1001, 2, "Model.Streets", "1001"),
+                (1002, 3, "Model.Buildings", "b3"),
+            ],
+        )
+        self.connection.executemany(
+            "INSERT INTO street VALUES (?, ?, ?)",
+            [(3000, 1001, "3000"), (3001, 1001, "3001")],
+        )
+        # the buildings of the first dataset reference its street, the ones of the second dataset reference it too
+        self.connection.executemany(
+            "INSERT INTO building VALUES (?, ?, ?, 3000)",
+            [
+                (tid, 1000 if tid < 2005 else 1002, str(uuid.uuid4()))
+                for tid in range(2000, 2010)
+            ],
+        )
+        self.connection.commit()
+        self.store = DatasetStore(GpkgConnector(self.connection))
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_paging(self):
+        datasets = []
+        page = self.store.datasets(limit=200)
+        while page:
+            datasets.extend(page)
+            page = self.store.datasets(after=page[-1][1], limit=200)
+        self.assertEqual(len(datasets), 501)
+        self.assertEqual(datasets[0], (600, "100%_done"))
+        self.assertNotIn("Catalogueset", [name for _, name in datasets])
+        self.assertEqual(self.store.dataset_count(), 501)
+
+    def test_model_fetch_until(self):
+        model = DatasetModel(page_size=100)
+        model.refresh_model(GpkgConnector(self.connection))
+        self.assertEqual(model.rowCount(), 100)
+        self.assertEqual(model.fetch_until("delivery_0250"), 249)
+        self.assertEqual(model.rowCount(), 300)
+        self.assertEqual(model.fetch_until("DELIVERY_0250"), -1)
+        self.assertFalse(model.canFetchMore())
+        self.assertEqual(model.rowCount(), 501)
+
+    def test_filter(self):
+        self.assertEqual(self.store.datasets("%_"), [(600, "100%_done")])
+        self.assertEqual(self.store.dataset_count("DELIVERY_00"), 98)
+        self.assertEqual(
+            self.store.datasets("delivery_01", limit=2),
+            [(100, "delivery_0100"), (101, "delivery_0101")],
+        )
+
+    def test_counts(self):
+        self.assertEqual(self.store.basket_tables(), ["building", "street"])
+        counts = self.store.counts()
+        self.assertEqual(counts[2], (2, 7))
+        self.assertEqual(counts[3], (1, 5))
+        self.assertEqual(counts[4], (0, 0))
+
+    def test_baskets(self):
+        self.assertEqual(
+            sorted(basket["topic"] for basket in self.store.baskets("delivery_0002")),
+            ["Model.Buildings", "Model.Streets"],
+        )
+
+    def count(self, statement, parameters=()):
+        return self.connection.execute(statement, parameters).fetchone()[0]
+
+    def test_delete(self):
+        self.assertEqual(self.store.affected_rows([2, 3]), (2, 3, 12))
+        self.store.delete_datasets([2, 3])
+        self.assertEqual(self.count("SELECT COUNT(*) FROM T_ILI2DB_BASKET"), 0)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM building"), 0)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM street"), 0)
+        self.assertEqual(self.store.dataset_count(), 499)
+
+    def test_rename(self):
+        self.store.rename_datasets({2: "first", 3: "second"})
+        self.assertEqual(self.store.datasets("first"), [(2, "first")])
+        with self.assertRaises(DatasetStoreError):
+            self.store.rename_datasets({4: "third", 5: "first"})
+        self.assertEqual(self.store.datasets("third"), [])
+
+    def test_copy(self):
+        self.store.copy_datasets({2: "copy"})
+        copy_tid = self.store.datasets("copy")[0][0]
+        self.assertEqual(copy_tid, 5001)
+        self.assertEqual(self.store.counts()[copy_tid], (2, 7))
+        # the original stays untouched
+        self.assertEqual(self.store.counts()[2], (2, 7))
+        baskets = self.connection.execute(
+            "SELECT T_Id, T_Ili_Tid, attachmentKey FROM T_ILI2DB_BASKET WHERE dataset = ? ORDER BY T_Id",
+            [copy_tid],
+        ).fetchall()
+        self.assertEqual([basket[0] for basket in baskets], [5002, 5003])
+        self.assertNotEqual(baskets[0][1], "0d4d6a4e-3a4f-4f10-9a62-a1f1a4a8a6c1")
+        self.assertEqual(len(baskets[0][1]), 36)
+        self.assertEqual(baskets[1][1:], ("5003", "ili2db"))
+        # the copied buildings reference the copied street
+        self.assertEqual(
+            self.connection.execute(
+                "SELECT DISTINCT street FROM building WHERE T_basket = 5002"
+            ).fetchall(),
+            [(7002,)],
+        )
+        # the copied objects get new OIDs of the same kind
+        for table in ["building", "street"]:
+            self.assertEqual(
+                self.count(f"SELECT COUNT(DISTINCT T_Ili_Tid) FROM {table}"),
+                self.count(f"SELECT COUNT(*) FROM {table}"),
+            )
+        self.assertEqual(
+            [
+                len(record[0])
+                for record in self.connection.execute(
+                    "SELECT T_Ili_Tid FROM building WHERE T_basket = 5002"
+                )
+            ],
+            [36] * 5,
+        )
+        self.assertEqual(
+            self.connection.execute(
+                "SELECT T_Id, T_Ili_Tid FROM street WHERE T_basket = 5003 ORDER BY T_Id"
+            ).fetchall(),
+            [(7002, "7002"), (7003, "7003")],
+        )
+        self.assertEqual(
+            self.count("SELECT T_LastUniqueId FROM T_KEY_OBJECT WHERE T_Key = 'T_Id'"),
+            max(
+                self.count("SELECT MAX(T_Id) FROM building"),
+                self.count("SELECT MAX(T_Id) FROM street"),
+            ),
+        )
+
+    def test_copy_oid_domains(self):
+        self.connection.executescript(
+            """
+            CREATE TABLE parcel (T_Id INTEGER PRIMARY KEY, T_basket INTEGER, T_Ili_Tid TEXT);
+            CREATE TABLE area (T_Id INTEGER PRIMARY KEY, T_basket INTEGER, T_Ili_Tid TEXT);
+            INSERT INTO parcel VALUES (4000, 1001, 'ch10000000004000'), (4001, 1001, 'ch100000xy4001ab');
+            INSERT INTO area VALUES (4002, 1001, '_0d4d6a4e-3a4f-4f10-9a62-a1f1a4a8a6c1'), (4003, 1001, 'area.1'), (4004, 1001, NULL);
+            """
+        )
+        self.connection.commit()
+        self.store.copy_datasets({2: "copy"})
+        # STANDARDOID: the prefix is kept and the new t_id padded
+        self.assertEqual(
+            self.connection.execute(
+                "SELECT T_Id, T_Ili_Tid FROM parcel WHERE T_basket = 5003 ORDER BY T_Id"
+            ).fetchall()[0],
+            (8002, "ch10000000008002"),
+        )
+        # ANYOID: an underscore and a new UUID, also for a value that is no STANDARDOID
+        area_oids = [
+            record[0]
+            for record in self.connection.execute(
+                "SELECT T_Ili_Tid FROM area WHERE T_basket = 5003 ORDER BY T_Id"
+            )
+        ]
+        parcel_oid = self.connection.execute(
+            "SELECT T_Ili_Tid FROM parcel WHERE T_Id = 8003"
+        ).fetchone()[0]
+        for oid in area_oids[:2] + [parcel_oid]:
+            self.assertTrue(oid.startswith("_"))
+            self.assertEqual(len(oid), 37)
+            self.assertNotEqual(oid, "_0d4d6a4e-3a4f-4f10-9a62-a1f1a4a8a6c1")
+        self.assertIsNone(area_oids[2])
+
+    def test_copy_without_key_object(self):
+        self.connection.execute("DELETE FROM T_KEY_OBJECT")
+        self.connection.commit()
+        self.store.copy_datasets({2: "copy"})
+        # the t_ids continue after the biggest existing one (the last street)
+        self.assertEqual(self.store.datasets("copy")[0][0], 3002)
+        self.assertEqual(
+            self.count("SELECT COUNT(*) FROM building"),
+            self.count("SELECT COUNT(DISTINCT T_Id) FROM building"),
+        )
+        self.assertEqual(self.store.counts()[3002], (2, 7))
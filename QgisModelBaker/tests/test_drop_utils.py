@@ -0,0 +1,151 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import shutil
+import tempfile
+import zipfile
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.utils.drop_utils import (
+    INI_FILE,
+    INTERLIS_FILE,
+    XML_FILE,
+    DroppedFilesScanner,
+    contains_interlis_files,
+    sniff_file_kind,
+)
+
+start_app()
+
+ILI = b"""!! a model
+/* with a comment
+   INTERLIS 1.0; */
+INTERLIS 2.3;
+MODEL Test (en) AT "https://modelbaker.ch" VERSION "2026-10-19" =
+END Test.
+"""
+XTF = b"""<?xml version="1.0" encoding="UTF-8"?>
+<TRANSFER xmlns="http://www.interlis.ch/INTERLIS2.3">
+<HEADERSECTION SENDER="test" VERSION="2.3"><MODELS><MODEL NAME="Test"/></MODELS></HEADERSECTION>
+"""
+ILIMODELS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<TRANSFER xmlns="http://www.interlis.ch/INTERLIS2.3">
+<HEADERSECTION SENDER="ili2c" VERSION="2.3"><MODELS><MODEL NAME="IliRepository20"/></MODELS></HEADERSECTION>
+"""
+ITF = b"SCNT\nTest\n////\nMTID Test\n"
+TOML = b'["Test.Topic.Class"]\nili2db.dispName="Class"\n'
+
+
+class DropUtilsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def _scan(self, paths):
+        found = {INTERLIS_FILE: [], XML_FILE: [], INI_FILE: []}
+
+        def collect(interlis_files, xml_files, ini_files):
+            found[INTERLIS_FILE].extend(interlis_files)
+            found[XML_FILE].extend(xml_files)
+            found[INI_FILE].extend(ini_files)
+
+        scanner = DroppedFilesScanner(paths)
+        scanner.files_found.connect(collect)
+        scanner.run()
+        return {
+            kind: sorted(os.path.basename(path) for path in paths)
+            for kind, paths in found.items()
+        }
+
+    def test_sniff_file_kind(self):
+        self.assertEqual(sniff_file_kind("model.ili", ILI), INTERLIS_FILE)
+        self.assertEqual(sniff_file_kind("data.XTF", XTF), INTERLIS_FILE)
+        self.assertEqual(sniff_file_kind("data.itf", ITF), INTERLIS_FILE)
+        self.assertEqual(sniff_file_kind("catalogue.xml", XTF), XML_FILE)
+        self.assertEqual(sniff_file_kind("config.toml", TOML), INI_FILE)
+        # the suffix has to match the content
+        self.assertIsNone(sniff_file_kind("model.ili", XTF))
+        self.assertIsNone(sniff_file_kind("data.xtf", ILI))
+        self.assertIsNone(sniff_file_kind("data.txt", XTF))
+        # repository index files and other xml are no data
+        self.assertIsNone(sniff_file_kind("ilimodels.xml", ILIMODELS))
+        self.assertIsNone(sniff_file_kind("layer.xml", b"<qgis></qgis>"))
+        self.assertIsNone(sniff_file_kind("binary.ini", b"\0\1[x]\0"))
+
+    def test_scan_directory(self):
+        self._write("delivery/models/Test.ili", ILI)
+        self._write("delivery/data/a.xtf", XTF)
+        self._write("delivery/data/deeper/b.itf", ITF)
+        self._write("delivery/data/catalogue.xml", XTF)
+        self._write("delivery/ilimodels.xml", ILIMODELS)
+        self._write("delivery/readme.txt", b"INTERLIS 2.3;")
+        self._write("delivery/config.toml", TOML)
+        self._write("delivery/broken.xtf", b"not a transfer file")
+
+        found = self._scan([os.path.join(self.directory, "delivery")])
+        self.assertEqual(found[INTERLIS_FILE], ["Test.ili", "a.xtf", "b.itf"])
+        self.assertEqual(found[XML_FILE], ["catalogue.xml"])
+        self.assertEqual(found[INI_FILE], ["config.toml"])
+
+    def test_scan_archive(self):
+        inner_path = os.path.join(self.directory, "inner.zip")
+        with zipfile.ZipFile(inner_path, "w") as archive:
+            archive.writestr("nested/b.xtf", XTF)
+        archive_path = os.path.join(self.directory, "delivery", "delivery.zip")
+        os.makedirs(os.path.dirname(archive_path))
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("models/Test.ili", ILI)
+            archive.writestr("../escaped.xtf", XTF)
+            archive.writestr("ilimodels.xml", ILIMODELS)
+            archive.write(inner_path, "inner.zip")
+
+        self.assertTrue(contains_interlis_files(archive_path))
+        self.assertTrue(contains_interlis_files(os.path.dirname(archive_path)))
+        self.assertFalse(contains_interlis_files(self._write("empty/a.txt", b"")))
+
+        scanner = DroppedFilesScanner([os.path.dirname(archive_path)])
+        found = []
+        scanner.files_found.connect(
+            lambda interlis_files, xml_files, ini_files: found.extend(interlis_files)
+        )
+        scanner.run()
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in found),
+            ["Test.ili", "b.xtf", "escaped.xtf"],
+        )
+        # the members are extracted below the extract directory
+        for path in found:
+            self.assertTrue(os.path.isfile(path))
+            self.assertTrue(
+                os.path.realpath(path).startswith(
+                    os.path.realpath(scanner.extract_directory)
+                )
+            )
+        shutil.rmtree(scanner.extract_directory)
@@ -0,0 +1,105 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import tempfile
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.utils.form_utils import form_module_name, load_form_class
+
+start_app()
+
+FORM_UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QGridLayout" name="gridLayout">
+   <item row="0" column="0">
+    <widget class="QLabel" name="label">
+     <property name="text">
+      <string>{text}</string>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestFormCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.directory.name, "forms")
+        self.ui_file_path = os.path.join(self.directory.name, "form.ui")
+        self.write_ui("Hello")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_ui(self, text):
+        with open(self.ui_file_path, "w") as ui:
+            ui.write(FORM_UI.format(text=text))
+
+    def cached_forms(self):
+        return sorted(
+            file_name
+            for file_name in os.listdir(self.cache_directory)
+            if file_name.endswith(".py")
+        )
+
+    def test_cached_form(self):
+        form_class = load_form_class(
+            self.ui_file_path, "panel/form.ui", self.cache_directory
+        )
+        self.assertEqual(form_class.__name__, "Ui_Form")
+        self.assertTrue(hasattr(form_class, "setupUi"))
+        with open(self.ui_file_path, "rb") as ui:
+            module_name = form_module_name("panel/form.ui", ui.read())
+        self.assertTrue(module_name.startswith("panel_form_"))
+        self.assertEqual(self.cached_forms(), [f"{module_name}.py"])
+
+        # the second time it's taken from the cache
+        module_path = os.path.join(self.cache_directory, f"{module_name}.py")
+        modified = os.path.getmtime(module_path)
+        self.assertIsNotNone(
+            load_form_class(self.ui_file_path, "panel/form.ui", self.cache_directory)
+        )
+        self.assertEqual(os.path.getmtime(module_path), modified)
+
+    def test_stale_form(self):
+        load_form_class(self.ui_file_path, "panel/form.ui", self.cache_directory)
+        stale_forms = self.cached_forms()
+        self.write_ui("Hello again")
+        self.assertIsNotNone(
+            load_form_class(self.ui_file_path, "panel/form.ui", self.cache_directory)
+        )
+        forms = self.cached_forms()
+        self.assertEqual(len(forms), 1)
+        self.assertNotEqual(forms, stale_forms)
+
+    def test_invalid_form(self):
+        with open(self.ui_file_path, "w") as ui:
+            ui.write("<ui>")
+        self.assertIsNone(
+            load_form_class(self.ui_file_path, "panel/form.ui", self.cache_directory)
+        )
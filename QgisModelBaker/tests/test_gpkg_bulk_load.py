@@ -0,0 +1,163 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.utils.gpkg_utils import GpkgBulkLoad
+
+try:
+    from osgeo import ogr
+except ImportError:
+    ogr = None
+
+start_app()
+
+
+class GpkgBulkLoadTest(unittest.TestCase):
+    def setUp(self):
+        self.basetestpath = tempfile.mkdtemp()
+        self.dbfile = os.path.join(self.basetestpath, "bulk.gpkg")
+
+    def tearDown(self):
+        shutil.rmtree(self.basetestpath, ignore_errors=True)
+
+    def _query(self, sql):
+        with closing(sqlite3.connect(self.dbfile, isolation_level=None)) as connection:
+            return connection.execute(sql).fetchall()
+
+    def _create_table(self):
+        with closing(sqlite3.connect(self.dbfile)) as connection:
+            connection.execute(
+                'CREATE TABLE "building" ("T_Id" INTEGER PRIMARY KEY, "name" TEXT)'
+            )
+            connection.execute('CREATE INDEX "building_name" ON "building" ("name")')
+            connection.commit()
+
+    def _import(self, count=1000):
+        # like ili2gpkg, over a connection of its own
+        with closing(sqlite3.connect(self.dbfile)) as connection:
+            connection.executemany(
+                'INSERT INTO "building" ("name") VALUES (?)',
+                [(f"building {i % 10}",) for i in range(count)],
+            )
+            connection.commit()
+
+    def test_missing_file(self):
+        bulk_load = GpkgBulkLoad(self.dbfile)
+        self.assertFalse(bulk_load.prepare())
+        bulk_load.finish()
+        self.assertFalse(os.path.exists(self.dbfile))
+
+    def test_bulk_load(self):
+        self._create_table()
+        bulk_load = GpkgBulkLoad(self.dbfile, vacuum=True)
+        self.assertTrue(bulk_load.prepare())
+        self.assertEqual(self._query("PRAGMA journal_mode"), [("wal",)])
+        self._import()
+        self._query('DELETE FROM "building" WHERE "T_Id" > 500')
+        bulk_load.finish(success=True)
+
+        self.assertEqual(self._query("PRAGMA journal_mode"), [("delete",)])
+        self.assertFalse(os.path.exists(self.dbfile + "-wal"))
+        # the statistics of the index are collected
+        self.assertTrue(
+            self._query(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = 'building' AND idx = 'building_name'"
+            )
+        )
+        self.assertEqual(self._query('SELECT count(*) FROM "building"'), [(500,)])
+        self.assertEqual(
+            set(bulk_load.timings), {"analyze", "vacuum"}, bulk_load.timings
+        )
+        self.assertEqual(len(bulk_load.report()), 2)
+
+    def test_failed_import(self):
+        self._create_table()
+        bulk_load = GpkgBulkLoad(self.dbfile, vacuum=True)
+        bulk_load.prepare()
+        bulk_load.finish(success=False)
+        # the settings are restored, but nothing is optimized
+        self.assertEqual(self._query("PRAGMA journal_mode"), [("delete",)])
+        self.assertEqual(bulk_load.timings, {})
+        self.assertEqual(bulk_load.report(), [])
+
+    def test_estimate_index_maintenance(self):
+        self._create_table()
+        with closing(sqlite3.connect(self.dbfile, isolation_level=None)) as connection:
+            connection.execute(
+                "CREATE VIRTUAL TABLE rtree_building_geom USING rtree(id, minx, maxx, miny, maxy)"
+            )
+            connection.executemany(
+                "INSERT INTO rtree_building_geom VALUES (?, ?, ?, ?, ?)",
+                [(i, i, i + 1, i, i + 1) for i in range(1, 30001)],
+            )
+            bulk_load = GpkgBulkLoad(self.dbfile)
+            bulk_load.timings["create_spatial_index"] = 0.001
+            bulk_load._estimate_index_maintenance(connection, [("building", "geom")])
+            # the temporary index is gone again
+            self.assertEqual(
+                connection.execute(
+                    "SELECT COUNT(*) FROM sqlite_temp_master WHERE name LIKE 'modelbaker_%'"
+                ).fetchone()[0],
+                0,
+            )
+        self.assertEqual(bulk_load.index_entries, 30000)
+        self.assertGreater(bulk_load.estimated_index_maintenance, 0)
+        self.assertAlmostEqual(
+            bulk_load.time_saved(), bulk_load.estimated_index_maintenance - 0.001
+        )
+        self.assertIn("Estimated time", bulk_load.report()[0])
+
+    @unittest.skipIf(ogr is None, "GDAL is not available")
+    def test_deferred_spatial_index(self):
+        dataset = ogr.GetDriverByName("GPKG").CreateDataSource(self.dbfile)
+        layer = dataset.CreateLayer("building", geom_type=ogr.wkbPoint)
+        dataset = layer = None
+
+        bulk_load = GpkgBulkLoad(self.dbfile)
+        bulk_load.prepare()
+        self.assertEqual(bulk_load.spatial_indexes, [("building", "geom")])
+        self.assertEqual(
+            self._query(
+                "SELECT count(*) FROM sqlite_master WHERE name LIKE 'rtree_building_geom%'"
+            ),
+            [(0,)],
+        )
+
+        dataset = ogr.Open(self.dbfile, update=1)
+        layer = dataset.GetLayer("building")
+        for i in range(100):
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetGeometry(ogr.CreateGeometryFromWkt(f"POINT ({i} {i})"))
+            layer.CreateFeature(feature)
+        dataset = layer = feature = None
+
+        bulk_load.finish(success=True)
+        self.assertEqual(
+            self._query('SELECT count(*), max(maxx) FROM "rtree_building_geom"'),
+            [(100, 99.0)],
+        )
+        self.assertIn("create_spatial_index", bulk_load.timings)
+        self.assertIsNotNone(bulk_load.time_saved())
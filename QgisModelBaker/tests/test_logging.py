@@ -0,0 +1,115 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.utils.logging_utils import (
+    SizedTimedRotatingFileHandler,
+    log_context,
+    start_logging,
+    stop_logging,
+    update_log_context,
+)
+
+start_app()
+
+
+class TestLogging(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_level = logging.getLogger().level
+
+    def tearDown(self):
+        stop_logging()
+        logging.getLogger().setLevel(self.root_level)
+        self.temp_dir.cleanup()
+
+    def _read_entries(self, path):
+        with open(path, encoding="utf-8") as log_file:
+            return [json.loads(line) for line in log_file]
+
+    def test_json_lines_with_context(self):
+        log_file_path = os.path.join(self.temp_dir.name, "ModelBaker.log")
+        start_logging(log_file_path)
+
+        update_log_context(workflow_id="wf1", phase="ImportSchemaConfiguration")
+        logging.info("Configure the schema")
+        with log_context(
+            session_id="s1", schema="gpkg_/data/test.gpkg", phase="IMPORT"
+        ):
+            logging.error("Import failed: ü")
+        logging.warning("Back to the wizard")
+        update_log_context(workflow_id=None, phase=None)
+        logging.info("Done")
+
+        # writes what is still in the queue
+        stop_logging()
+
+        entries = self._read_entries(log_file_path)
+        assert [entry["message"] for entry in entries] == [
+            "Configure the schema",
+            "Import failed: ü",
+            "Back to the wizard",
+            "Done",
+        ]
+        plugin_session = entries[0]["plugin_session"]
+        assert all(entry["plugin_session"] == plugin_session for entry in entries)
+
+        assert entries[0]["workflow_id"] == "wf1"
+        assert entries[0]["phase"] == "ImportSchemaConfiguration"
+        assert "session_id" not in entries[0]
+
+        assert entries[1]["level"] == "ERROR"
+        assert entries[1]["workflow_id"] == "wf1"
+        assert entries[1]["session_id"] == "s1"
+        assert entries[1]["schema"] == "gpkg_/data/test.gpkg"
+        assert entries[1]["phase"] == "IMPORT"
+
+        assert entries[2]["phase"] == "ImportSchemaConfiguration"
+        assert "session_id" not in entries[2]
+
+        assert "workflow_id" not in entries[3]
+        assert "phase" not in entries[3]
+
+    def test_rotation_by_size(self):
+        log_file_path = os.path.join(self.temp_dir.name, "ModelBaker.log")
+        handler = SizedTimedRotatingFileHandler(log_file_path, max_bytes=200)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        try:
+            for index in range(10):
+                handler.emit(
+                    logging.makeLogRecord({"msg": f"line {index} " + "x" * 50})
+                )
+        finally:
+            handler.close()
+
+        log_files = sorted(os.listdir(self.temp_dir.name))
+        # every rotated file of the day is kept
+        assert len(log_files) == 4
+        lines = []
+        for log_file in log_files:
+            with open(os.path.join(self.temp_dir.name, log_file)) as f:
+                lines.extend(f.read().splitlines())
+                assert os.path.getsize(f.name) <= 200
+        assert len(lines) == 10
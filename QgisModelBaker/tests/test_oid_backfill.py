@@ -0,0 +1,109 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import re
+import sqlite3
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.utils.oid_utils import (
+    OidBackfiller,
+    OidBackfillError,
+    OidBackfillTable,
+    standardoid_prefix,
+)
+
+start_app()
+
+UUID = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
+)
+
+
+class TestOidBackfill(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        for table in ["building", "street", "parcel"]:
+            self.connection.execute(
+                f'CREATE TABLE "{table}" ("T_Id" INTEGER PRIMARY KEY, "T_Ili_Tid" TEXT)'
+            )
+            self.connection.executemany(
+                f'INSERT INTO "{table}" ("T_Id", "T_Ili_Tid") VALUES (?, ?)',
+                [(1, "existing"), (2, None), (123, None)],
+            )
+        self.connection.commit()
+        self.backfiller = OidBackfiller(
+            self.connection, OidBackfiller.GPKG, "T_Id", "T_Ili_Tid"
+        )
+        self.tables = [
+            OidBackfillTable("Building", None, "building", "INTERLIS.UUIDOID"),
+            OidBackfillTable("Street", None, "street", "INTERLIS.I32OID"),
+            OidBackfillTable(
+                "Parcel",
+                None,
+                "parcel",
+                "INTERLIS.STANDARDOID",
+                standardoid_prefix("'ch100000' || lpad( T_Id, 8, 0 )"),
+            ),
+        ]
+
+    def tearDown(self):
+        self.connection.close()
+
+    def oids(self, table):
+        return [
+            row[0]
+            for row in self.connection.execute(
+                f'SELECT "T_Ili_Tid" FROM "{table}" ORDER BY "T_Id"'
+            )
+        ]
+
+    def test_dry_run(self):
+        missing_oids = self.backfiller.run(self.tables, dry_run=True)
+        self.assertEqual(missing_oids, {"Building": 2, "Street": 2, "Parcel": 2})
+        self.assertEqual(self.oids("street"), ["existing", None, None])
+
+    def test_fill(self):
+        filled_oids = self.backfiller.run(self.tables)
+        self.assertEqual(filled_oids, {"Building": 2, "Street": 2, "Parcel": 2})
+        building_oids = self.oids("building")
+        self.assertEqual(building_oids[0], "existing")
+        self.assertTrue(all(UUID.match(oid) for oid in building_oids[1:]))
+        self.assertNotEqual(building_oids[1], building_oids[2])
+        self.assertEqual(self.oids("street"), ["existing", "2", "123"])
+        self.assertEqual(
+            self.oids("parcel"), ["existing", "ch10000000000002", "ch10000000000123"]
+        )
+        self.assertEqual(
+            self.backfiller.run(self.tables, dry_run=True),
+            {"Building": 0, "Street": 0, "Parcel": 0},
+        )
+
+    def test_rollback(self):
+        tables = self.tables + [
+            OidBackfillTable("Missing", None, "missing", "INTERLIS.I32OID")
+        ]
+        with self.assertRaises(OidBackfillError):
+            self.backfiller.run(tables)
+        self.assertEqual(self.oids("building"), ["existing", None, None])
+
+    def test_close(self):
+        self.backfiller.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            self.connection.execute("SELECT 1")
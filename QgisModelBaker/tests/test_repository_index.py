@@ -0,0 +1,134 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import shutil
+import tempfile
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.tests.utils import LocalRepositoryServer, testdata_path
+from QgisModelBaker.utils.repository_utils import ILIDATA_FILE, RepositoryIndex
+
+start_app()
+
+
+class TestRepositoryIndex(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.repository_dir = tempfile.TemporaryDirectory()
+        self.repository_path = os.path.join(self.repository_dir.name, "ilirepo")
+        shutil.copytree(testdata_path("ilirepo"), self.repository_path)
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+        self.repository_dir.cleanup()
+
+    def _revalidate(self, repository_index, repositories, force=False):
+        changed = []
+        repository_index.revalidated.connect(changed.extend)
+        repository_index.revalidate(repositories, force)
+        self.assertTrue(repository_index.wait(10000))
+        repository_index.revalidated.disconnect(changed.extend)
+        return changed
+
+    def test_revalidation(self):
+        with LocalRepositoryServer(self.repository_path) as server:
+            repositories = [server.url]
+            repository_index = RepositoryIndex(self.cache_dir.name, ttl=3600)
+            self.assertFalse(repository_index.has_content(repositories))
+
+            # first load of the repository and its subsidiary site
+            self.assertEqual([], self._revalidate(repository_index, repositories))
+            self.assertEqual(
+                [server.url, server.url + "sub/"],
+                repository_index.repository_tree(repositories),
+            )
+            ilidata_index = repository_index.ilidata_index(repositories)
+            self.assertEqual(
+                (server.url, "toppings/street.qml"),
+                ilidata_index["ch.opengis.topping.test.qml_street"],
+            )
+            self.assertEqual(
+                server.url + "sub/",
+                ilidata_index["ch.opengis.topping.test.qml_building"][0],
+            )
+            self.assertTrue(repository_index.is_fresh(repositories))
+
+            # persisted and fresh: nothing is requested
+            request_count = len(server.requests)
+            repository_index = RepositoryIndex(self.cache_dir.name, ttl=3600)
+            self.assertTrue(repository_index.is_fresh(repositories))
+            self.assertEqual([], self._revalidate(repository_index, repositories))
+            self.assertEqual(request_count, len(server.requests))
+            # the stored files are served from the cache of a previous session
+            stored_file = repository_index.stored_file(server.url, ILIDATA_FILE)
+            self.assertTrue(stored_file.startswith(self.cache_dir.name))
+            with open(stored_file, "rb") as f:
+                self.assertEqual(
+                    f.read(), repository_index.content(server.url, ILIDATA_FILE)
+                )
+
+            # outdated: revalidated with conditional requests
+            repository_index.ttl = 0
+            self.assertFalse(repository_index.is_fresh(repositories))
+            self.assertEqual([], self._revalidate(repository_index, repositories))
+            revalidation_requests = server.requests[request_count:]
+            self.assertIn(("/" + ILIDATA_FILE, 304), revalidation_requests)
+            self.assertIn(("/sub/" + ILIDATA_FILE, 304), revalidation_requests)
+
+            # changed file on the server
+            with open(os.path.join(self.repository_path, ILIDATA_FILE)) as f:
+                ilidata = f.read()
+            with open(os.path.join(self.repository_path, ILIDATA_FILE), "w") as f:
+                f.write(
+                    ilidata.replace(
+                        "ch.opengis.topping.test.prescript",
+                        "ch.opengis.topping.test.prescript_v2",
+                    )
+                )
+            repository_index.revalidate(repositories)
+            # the stale content is served meanwhile
+            self.assertIn(
+                "ch.opengis.topping.test.prescript",
+                repository_index.ilidata_index(repositories),
+            )
+            changed = []
+            repository_index.revalidated.connect(changed.extend)
+            self.assertTrue(repository_index.wait(10000))
+            self.assertEqual([server.url], changed)
+            ilidata_index = repository_index.ilidata_index(repositories)
+            self.assertIn("ch.opengis.topping.test.prescript_v2", ilidata_index)
+            self.assertNotIn("ch.opengis.topping.test.prescript", ilidata_index)
+
+    def test_local_repository(self):
+        repository_index = RepositoryIndex(self.cache_dir.name, ttl=0)
+        repositories = [self.repository_path]
+        self.assertTrue(repository_index.has_content(repositories))
+        self.assertEqual(
+            os.path.join(self.repository_path, "sub/"),
+            repository_index.ilidata_index(repositories)[
+                "ch.opengis.topping.test.qml_building"
+            ][0],
+        )
+        self.assertEqual([], self._revalidate(repository_index, repositories))
+        self.assertEqual(
+            os.path.join(self.repository_path, ILIDATA_FILE),
+            repository_index.stored_file(self.repository_path, ILIDATA_FILE),
+        )
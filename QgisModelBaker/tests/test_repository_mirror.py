@@ -0,0 +1,194 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import json
+import os
+import tempfile
+import zipfile
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbconfig import BaseConfiguration
+from QgisModelBaker.tests.utils import LocalRepositoryServer, testdata_path
+from QgisModelBaker.utils.mirror_utils import (
+    MirrorBundleCanceled,
+    MirrorBundleError,
+    RepositoryMirror,
+    offline_model_directories,
+)
+from QgisModelBaker.utils.repository_utils import (
+    ILIDATA_FILE,
+    RepositoryIndex,
+    parse_ilidata,
+)
+from QgisModelBaker.utils.topping_utils import ToppingFileResolver
+
+start_app()
+
+
+class Feedback:
+    """
+    Cancels after the given number of progress steps.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.progress = []
+
+    def isCanceled(self):
+        return len(self.progress) >= self.steps
+
+    def setProgress(self, progress):
+        self.progress.append(progress)
+
+
+class TestRepositoryMirror(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _mirror(self):
+        return RepositoryMirror(
+            RepositoryIndex(os.path.join(self.temp_dir.name, "index")),
+            timeout=10000,
+        )
+
+    def test_export_and_import(self):
+        archive_path = os.path.join(self.temp_dir.name, "bundle.zip")
+        with LocalRepositoryServer(testdata_path("ilirepo")) as server:
+            manifest = self._mirror().export_bundle(
+                [server.url], ["Test_Extension"], archive_path
+            )
+
+        # the dependencies of the model and the datasets referenced by the metaconfig are in the bundle
+        self.assertEqual(["Test_Base", "Test_Extension"], manifest["models"])
+        self.assertEqual(
+            [
+                "ch.opengis.topping.test.metaconfig",
+                "ch.opengis.topping.test.qml_building",
+                "ch.opengis.topping.test.prescript",
+            ],
+            manifest["datasets"],
+        )
+        self.assertEqual({}, manifest["failed"])
+        self.assertIn("r0/models/Test_Base.ili", manifest["files"])
+        self.assertIn("r1/toppings/building.qml", manifest["files"])
+        self.assertNotIn("r0/models/Test_Other.ili", manifest["files"])
+
+        target_directory = os.path.join(self.temp_dir.name, "offline")
+        self._mirror().import_bundle(archive_path, target_directory)
+        with open(os.path.join(target_directory, ILIDATA_FILE), "rb") as f:
+            self.assertEqual(
+                "r0/toppings/metaconfig.ini",
+                parse_ilidata(f.read())["ch.opengis.topping.test.metaconfig"],
+            )
+
+        # resolved from the offline repository without any server
+        base_configuration = BaseConfiguration()
+        base_configuration.custom_model_directories_enabled = True
+        base_configuration.custom_model_directories = offline_model_directories(
+            "%ILI_FROM_DB;http://models.interlis.ch/", target_directory
+        )
+        self.assertEqual(
+            f"%ILI_FROM_DB;{target_directory}",
+            base_configuration.custom_model_directories,
+        )
+        resolver = ToppingFileResolver(
+            base_configuration,
+            cache_path=os.path.join(self.temp_dir.name, "toppings"),
+            repository_index=RepositoryIndex(
+                os.path.join(self.temp_dir.name, "offline_index")
+            ),
+        )
+        self.assertEqual(
+            os.path.join(target_directory, "r1", "toppings", "building.qml"),
+            resolver.resolve(["ilidata:ch.opengis.topping.test.qml_building"])[
+                "ilidata:ch.opengis.topping.test.qml_building"
+            ],
+        )
+
+    def test_export_canceled(self):
+        archive_path = os.path.join(self.temp_dir.name, "bundle.zip")
+        feedback = Feedback(1)
+        with self.assertRaises(MirrorBundleCanceled):
+            self._mirror().export_bundle(
+                [testdata_path("ilirepo")], ["Test_Base"], archive_path, feedback
+            )
+        self.assertEqual(feedback.progress, [10])
+        self.assertFalse(os.path.exists(archive_path))
+
+        feedback = Feedback(100)
+        self._mirror().export_bundle(
+            [testdata_path("ilirepo")], ["Test_Base"], archive_path, feedback
+        )
+        self.assertEqual(feedback.progress[:2], [10, 40])
+        self.assertTrue(os.path.isfile(archive_path))
+
+    def test_import_tampered_bundle(self):
+        archive_path = os.path.join(self.temp_dir.name, "bundle.zip")
+        self._mirror().export_bundle(
+            [testdata_path("ilirepo")], ["Test_Base"], archive_path
+        )
+        tampered_archive_path = os.path.join(self.temp_dir.name, "tampered.zip")
+        with zipfile.ZipFile(archive_path) as archive, zipfile.ZipFile(
+            tampered_archive_path, "w"
+        ) as tampered_archive:
+            for name in archive.namelist():
+                content = archive.read(name)
+                if name == "r0/models/Test_Base.ili":
+                    content += b"!! tampered"
+                tampered_archive.writestr(name, content)
+
+        with self.assertRaises(MirrorBundleError):
+            self._mirror().import_bundle(
+                tampered_archive_path, os.path.join(self.temp_dir.name, "offline")
+            )
+        # nothing is written when a file does not match
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, "offline")))
+
+    def test_import_bundle_without_files(self):
+        archive_path = os.path.join(self.temp_dir.name, "empty.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr(
+                RepositoryMirror.MANIFEST_FILE,
+                json.dumps(
+                    {
+                        "format": RepositoryMirror.FORMAT,
+                        "format_version": RepositoryMirror.FORMAT_VERSION,
+                        "files": {},
+                    }
+                ),
+            )
+        target_directory = os.path.join(self.temp_dir.name, "offline")
+        self._mirror().import_bundle(archive_path, target_directory)
+        self.assertTrue(
+            os.path.isfile(
+                os.path.join(target_directory, RepositoryMirror.MANIFEST_FILE)
+            )
+        )
+
+        # a target that cannot be created is a bundle error as well
+        blocking_file = os.path.join(self.temp_dir.name, "blocking")
+        open(blocking_file, "w").close()
+        with self.assertRaises(MirrorBundleError):
+            self._mirror().import_bundle(
+                archive_path, os.path.join(blocking_file, "offline")
+            )
@@ -0,0 +1,92 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from qgis.testing import start_app, unittest
+
+start_app()
+
+# the budget for classFactory + initGui in a fresh QGIS
+STARTUP_BUDGET = 0.5
+
+# these modules should only be imported when the user opens a dialog
+LAZY_MODULES = [
+    "QgisModelBaker.gui.workflow_wizard.workflow_wizard",
+    "QgisModelBaker.gui.topping_wizard.topping_wizard",
+    "QgisModelBaker.gui.validate",
+    "QgisModelBaker.gui.dataset_manager",
+    "QgisModelBaker.gui.tid_manager",
+    "QgisModelBaker.libs.modelbaker.generator.generator",
+    "QgisModelBaker.libs.modelbaker.dataobjects.project",
+    "psycopg2",
+    "pyodbc",
+    "yaml",
+]
+
+STARTUP_SCRIPT = """
+import json
+import sys
+import time
+from unittest import mock
+
+from qgis.PyQt.QtWidgets import QMainWindow
+from qgis.testing import start_app
+
+start_app()
+
+main_window = QMainWindow()
+main_window.getDatabaseMenu = mock.Mock()
+iface = mock.Mock()
+iface.mainWindow.return_value = main_window
+
+start = time.perf_counter()
+import QgisModelBaker
+
+plugin = QgisModelBaker.classFactory(iface)
+plugin.initGui()
+duration = time.perf_counter() - start
+
+lazy_modules = json.loads(sys.argv[1])
+print(json.dumps({
+    "duration": duration,
+    "imported": [module for module in lazy_modules if module in sys.modules],
+}))
+plugin.unload()
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def test_startup(self):
+        # a fresh interpreter, because the modules imported by the other tests stay in sys.modules
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT, json.dumps(LAZY_MODULES)],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(
+                os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            ),
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        startup = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(startup["imported"], [])
+        self.assertLess(startup["duration"], STARTUP_BUDGET)
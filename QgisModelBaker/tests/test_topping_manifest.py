@@ -0,0 +1,132 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import tempfile
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.utils.topping_utils import ToppingManifest
+
+start_app()
+
+ILIDATA_CONTENT = """<TRANSFER>
+   <DATASECTION>
+      <DatasetIdx16.DataIndex BID="{bid}">
+         <DatasetIdx16.DataIndex.DatasetMetadata TID="{tid}">
+            <id>layerstyle_project_buildings_qml_001</id>
+            <version>{date}</version>
+            <publishingDate>{date}</publishingDate>
+         </DatasetIdx16.DataIndex.DatasetMetadata>
+      </DatasetIdx16.DataIndex>
+   </DATASECTION>
+</TRANSFER>
+"""
+
+
+class TestToppingManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.target_dir = os.path.join(self.temp_dir.name, "target")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _stage(self, files, tid="1", date="2026-10-19"):
+        staging_dir = tempfile.mkdtemp(dir=self.temp_dir.name)
+        files = dict(files)
+        files["ilidata.xml"] = ILIDATA_CONTENT.format(bid=tid, tid=tid, date=date)
+        for relative_path, content in files.items():
+            path = os.path.join(staging_dir, *relative_path.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as staged_file:
+                staged_file.write(content)
+        return staging_dir
+
+    def _sync(self, staging_dir):
+        return ToppingManifest(self.target_dir).sync(staging_dir)
+
+    def test_unchanged_files_are_not_written(self):
+        files = {
+            "layerstyle/project_buildings.qml": "<qgis>buildings</qgis>",
+            "projecttopping/project.yaml": "layertree: []",
+        }
+        written, unchanged, removed = self._sync(self._stage(files))
+        assert len(written) == 3
+        assert not unchanged and not removed
+
+        # a regeneration gives a new ilidata.xml with other TIDs and dates
+        written, unchanged, removed = self._sync(
+            self._stage(files, tid="2", date="2026-10-20")
+        )
+        assert not written
+        assert len(unchanged) == 3
+        with open(os.path.join(self.target_dir, "ilidata.xml")) as ilidata_file:
+            assert 'TID="1"' in ilidata_file.read()
+
+    def test_changed_files_are_written(self):
+        files = {
+            "layerstyle/project_buildings.qml": "<qgis>buildings</qgis>",
+            "layerstyle/project_streets.qml": "<qgis>streets</qgis>",
+        }
+        self._sync(self._stage(files))
+
+        files["layerstyle/project_buildings.qml"] = "<qgis>red buildings</qgis>"
+        written, unchanged, removed = self._sync(self._stage(files, tid="2"))
+        # the ilidata.xml is written as well, since its datasets have a new version
+        assert written == ["layerstyle/project_buildings.qml", "ilidata.xml"]
+        assert unchanged == ["layerstyle/project_streets.qml"]
+
+        # a file modified in the target folder is written again
+        with open(
+            os.path.join(self.target_dir, "layerstyle", "project_streets.qml"), "w"
+        ) as target_file:
+            target_file.write("<qgis>modified</qgis>")
+        written, unchanged, removed = self._sync(self._stage(files, tid="3"))
+        assert written == ["layerstyle/project_streets.qml", "ilidata.xml"]
+
+    def test_outdated_files_are_removed(self):
+        files = {
+            "layerstyle/project_buildings.qml": "<qgis>buildings</qgis>",
+            "layerstyle/project_streets.qml": "<qgis>streets</qgis>",
+            "layerdefinition/project_parcels.qlr": "<qlr>parcels</qlr>",
+        }
+        self._sync(self._stage(files))
+
+        # modified by someone else, so it is kept
+        with open(
+            os.path.join(self.target_dir, "layerdefinition", "project_parcels.qlr"), "w"
+        ) as target_file:
+            target_file.write("<qlr>modified</qlr>")
+
+        del files["layerstyle/project_streets.qml"]
+        del files["layerdefinition/project_parcels.qlr"]
+        written, unchanged, removed = self._sync(self._stage(files, tid="2"))
+        assert removed == ["layerstyle/project_streets.qml"]
+        assert written == ["ilidata.xml"]
+        assert not os.path.exists(
+            os.path.join(self.target_dir, "layerstyle", "project_streets.qml")
+        )
+        assert os.path.exists(
+            os.path.join(self.target_dir, "layerdefinition", "project_parcels.qlr")
+        )
+        assert (
+            "layerdefinition/project_parcels.qlr"
+            not in ToppingManifest(self.target_dir).files
+        )
@@ -0,0 +1,132 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import configparser
+import os
+import tempfile
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.libs.modelbaker.iliwrapper.ili2dbconfig import BaseConfiguration
+from QgisModelBaker.tests.utils import LocalRepositoryServer, testdata_path
+from QgisModelBaker.utils.repository_utils import RepositoryIndex
+from QgisModelBaker.utils.topping_utils import ToppingFileResolver
+
+start_app()
+
+
+class TestToppingFileResolver(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def _resolver(self, repository):
+        base_configuration = BaseConfiguration()
+        base_configuration.custom_model_directories_enabled = True
+        base_configuration.custom_model_directories = repository
+        return ToppingFileResolver(
+            base_configuration,
+            cache_path=self.cache_dir.name,
+            timeout=10000,
+            repository_index=RepositoryIndex(
+                os.path.join(self.cache_dir.name, "repository_index")
+            ),
+        )
+
+    def test_resolve_from_http_repository(self):
+        with LocalRepositoryServer(testdata_path("ilirepo")) as server:
+            resolver = self._resolver(server.url)
+            progress = []
+            resolver.file_progress.connect(
+                lambda topping_id, received, total: progress.append(topping_id)
+            )
+
+            file_paths = resolver.resolve(
+                [
+                    "ilidata:ch.opengis.topping.test.qml_street",
+                    "ilidata:ch.opengis.topping.test.qml_building",
+                    "ilidata:ch.opengis.topping.test.prescript",
+                    "ilidata:ch.opengis.topping.test.not_existing",
+                ]
+            )
+
+        self.assertEqual(
+            {
+                "ilidata:ch.opengis.topping.test.qml_street",
+                "ilidata:ch.opengis.topping.test.qml_building",
+                "ilidata:ch.opengis.topping.test.prescript",
+            },
+            set(file_paths.keys()),
+        )
+        # the parent repository has priority over the subsidiary site
+        self.assertTrue(
+            file_paths["ilidata:ch.opengis.topping.test.qml_street"].endswith(
+                "street.qml"
+            )
+        )
+        with open(file_paths["ilidata:ch.opengis.topping.test.prescript"]) as f:
+            self.assertEqual("-- prescript\n", f.read())
+        self.assertIn("ilidata:ch.opengis.topping.test.prescript", progress)
+
+        # resolved files are kept and not downloaded again (server is down now)
+        self.assertEqual(
+            file_paths["ilidata:ch.opengis.topping.test.qml_street"],
+            resolver.resolve(["ilidata:ch.opengis.topping.test.qml_street"])[
+                "ilidata:ch.opengis.topping.test.qml_street"
+            ],
+        )
+
+    def test_resolve_from_local_repository(self):
+        resolver = self._resolver(testdata_path("ilirepo"))
+        file_paths = resolver.resolve(["ilidata:ch.opengis.topping.test.qml_building"])
+        self.assertEqual(
+            testdata_path("ilirepo/sub/toppings/building.qml"),
+            file_paths["ilidata:ch.opengis.topping.test.qml_building"],
+        )
+
+    def test_metaconfig_topping_ids(self):
+        metaconfig = configparser.ConfigParser()
+        metaconfig.read_string(
+            """
+            [CONFIGURATION]
+            qgis.modelbaker.projecttopping=ilidata:ch.opengis.topping.test.projecttopping
+            ch.interlis.referenceData=ilidata:ch.opengis.topping.test.catalogue;ilidata:ch.opengis.topping.test.catalogue2
+
+            [ch.ehi.ili2db]
+            iliMetaAttrs=ilidata:ch.opengis.topping.test.toml
+            preScript=ilidata:ch.opengis.topping.test.prescript
+
+            [qgis.modelbaker.qml]
+            "street"=ilidata:ch.opengis.topping.test.qml_street
+            building=ilidata:ch.opengis.topping.test.qml_street
+            """
+        )
+        self.assertEqual(
+            [
+                "ilidata:ch.opengis.topping.test.toml",
+                "ilidata:ch.opengis.topping.test.prescript",
+                "ilidata:ch.opengis.topping.test.catalogue",
+                "ilidata:ch.opengis.topping.test.catalogue2",
+                "ilidata:ch.opengis.topping.test.projecttopping",
+                "ilidata:ch.opengis.topping.test.qml_street",
+            ],
+            ToppingFileResolver.metaconfig_topping_ids(metaconfig),
+        )
@@ -0,0 +1,84 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from qgis.testing import start_app, unittest
+
+from QgisModelBaker.utils.gui_utils import TrigramIndex
+
+start_app()
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.update(
+            {
+                "DM01AVCH24LV95D": ("DM01AVCH24LV95D", "Amtliche Vermessung"),
+                "KbS_LV95_V1_4": ("KbS_LV95_V1_4", "Kataster der belasteten Standorte"),
+                "Nutzungsplanung_LV95_V1_1": ("Nutzungsplanung_LV95_V1_1", ""),
+                "LV95_Nutzung": ("LV95_Nutzung", ""),
+            }
+        )
+
+    def test_ranking(self):
+        # prefix matches before substring matches
+        self.assertEqual(
+            self.index.search("nutzung"),
+            ["Nutzungsplanung_LV95_V1_1", "LV95_Nutzung"],
+        )
+        # case insensitive, shorter texts first within the same kind of match
+        self.assertEqual(
+            self.index.search("lv95"),
+            [
+                "LV95_Nutzung",
+                "KbS_LV95_V1_4",
+                "DM01AVCH24LV95D",
+                "Nutzungsplanung_LV95_V1_1",
+            ],
+        )
+        # the other texts like the description are searched as well
+        self.assertEqual(self.index.search("belastet"), ["KbS_LV95_V1_4"])
+        # short queries without trigrams
+        self.assertEqual(
+            set(self.index.search("kb")),
+            {"KbS_LV95_V1_4"},
+        )
+        self.assertEqual(len(self.index.search("")), 4)
+
+    def test_fuzzy(self):
+        # a typo still finds the entry
+        self.assertEqual(
+            self.index.search("nutzungsplnung")[0], "Nutzungsplanung_LV95_V1_1"
+        )
+        self.assertEqual(self.index.search("xyzxyz"), [])
+
+    def test_incremental_update(self):
+        added, removed = self.index.update(
+            {
+                "KbS_LV95_V1_4": ("KbS_LV95_V1_4", "Kataster der belasteten Standorte"),
+                "LV95_Nutzung": ("LV95_Nutzung", ""),
+                "Wald_LV95": ("Wald_LV95", ""),
+            }
+        )
+        self.assertEqual((added, removed), (1, 2))
+        self.assertEqual(len(self.index), 3)
+        self.assertNotIn("DM01AVCH24LV95D", self.index.search("dm01"))
+        self.assertEqual(self.index.search("wald"), ["Wald_LV95"])
+        # no trigram of removed entries is kept
+        self.assertNotIn("dm0", self.index._postings)
@@ -1,7 +1,13 @@
 import yaml
 from qgis.testing import unittest
 
-from QgisModelBaker.yamltools.loader import InheritanceLoader
+from QgisModelBaker.tests.utils import generate_projecttopping
+from QgisModelBaker.yamltools.loader import (
+    CInheritanceLoader,
+    InheritanceLoader,
+    YamlCache,
+    safe_load_cached,
+)
 
 
 class YamlInheritanceTest(unittest.TestCase):
@@ -30,3 +36,117 @@ class YamlInheritanceTest(unittest.TestCase):
         }
 
         assert expected == data["project"]
+
+        data = yaml.load(document, Loader=CInheritanceLoader)
+        assert expected == data["project"]
+
+
+class YamlLoaderLargeTest(unittest.TestCase):
+    def test_large_projecttopping(self):
+        document = generate_projecttopping(500)
+        expected = yaml.safe_load(document)
+
+        data = safe_load_cached(document)
+        assert expected == data
+        assert len(data["layerorder"]) == 500
+
+        cached_data = safe_load_cached(document)
+        assert expected == cached_data
+        # every request gets its own copy
+        assert cached_data is not data
+
+    def test_large_projecttopping_inheritance(self):
+        document = generate_projecttopping(500, with_inheritance=True)
+        expected = yaml.load(document, Loader=InheritanceLoader)
+        data = yaml.load(document, Loader=CInheritanceLoader)
+        assert expected == data
+        layer = data["layertree"][0]["Group 0"]["child-nodes"][0]["Layer 0"]
+        assert layer["checked"] is True
+        assert layer["styles"] == ["dark", "light", "default"]
+
+    def test_cache(self):
+        cache = YamlCache(max_entries=2)
+        first = cache.load("a: [1, 2]")
+        first["a"].append(3)
+        assert cache.load("a: [1, 2]") == {"a": [1, 2]}
+        cache.load("b: 1")
+        cache.load("c: 1")
+        assert len(cache._entries) == 2
+
+
+class YamlInheritanceMergeTest(unittest.TestCase):
+    document = """
+      base_object: &base_object
+        list:
+          - map1: x
+            map2: b
+          - def
+        settings:
+          checked: true
+          styles:
+            - default
+        base: 4
+
+      extended_base: &extended_base
+        <<<: *base_object
+        list:
+          - ext
+        extended: 1
+
+      project1:
+        <<<: *base_object
+        list:
+          - zzz: 5
+        settings:
+          styles:
+            - dark
+
+      project2:
+        <<<: *base_object
+        list:
+          - yyy: 6
+
+      project3:
+        <<<: *extended_base
+        list:
+          - xxx: 7
+    """
+
+    def test_semantics(self):
+        for loader in [InheritanceLoader, CInheritanceLoader]:
+            data = yaml.load(self.document, Loader=loader)
+
+            assert data["project1"] == {
+                "list": [{"zzz": 5}, {"map1": "x", "map2": "b"}, "def"],
+                "settings": {"styles": ["dark", "default"], "checked": True},
+                "base": 4,
+            }
+            assert data["project2"] == {
+                "list": [{"yyy": 6}, {"map1": "x", "map2": "b"}, "def"],
+                "settings": {"checked": True, "styles": ["default"]},
+                "base": 4,
+            }
+            # inheritance over multiple levels
+            assert data["project3"] == {
+                "list": [{"xxx": 7}, "ext", {"map1": "x", "map2": "b"}, "def"],
+                "extended": 1,
+                "settings": {"checked": True, "styles": ["default"]},
+                "base": 4,
+            }
+
+    def test_base_not_modified(self):
+        for loader in [InheritanceLoader, CInheritanceLoader]:
+            data = yaml.load(self.document, Loader=loader)
+            assert data["base_object"] == {
+                "list": [{"map1": "x", "map2": "b"}, "def"],
+                "settings": {"checked": True, "styles": ["default"]},
+                "base": 4,
+            }
+
+    def test_anchors_shared(self):
+        for loader in [InheritanceLoader, CInheritanceLoader]:
+            data = yaml.load(self.document, Loader=loader)
+            # the subtrees of the base are shared and not copied for every use
+            assert data["project1"]["list"][1] is data["base_object"]["list"][0]
+            assert data["project2"]["list"][1] is data["base_object"]["list"][0]
+            assert data["project2"]["settings"] is data["base_object"]["settings"]
@@ -0,0 +1 @@
+-- prescript
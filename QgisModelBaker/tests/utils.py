@@ -1,4 +1,11 @@
+import functools
+import hashlib
+import json
 import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -7,3 +14,353 @@ import pytest
 def testdata_path(path):
     basepath = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(basepath, "testdata", path)
+
+
+@pytest.mark.skip("This is a utility function, not a test function")
+def generate_projecttopping(layer_count=500, with_inheritance=False):
+    """
+    Generates the yaml of a large project topping with a layertree, map themes and layouts.
+    Every layer results in about ten nodes, so 500 layers are around 5000 nodes.
+    When with_inheritance is set, the layers extend a base layer with the '<<<' syntax (for the InheritanceLoader).
+    """
+    lines = []
+    if with_inheritance:
+        lines += [
+            "base_layer: &base_layer",
+            "  checked: true",
+            "  expanded: false",
+            "  featurecount: false",
+            "  styles:",
+            "    - default",
+        ]
+    lines += ["layertree:"]
+    for group in range(layer_count // 50 or 1):
+        lines += [
+            f'  - "Group {group}":',
+            "      group: true",
+            "      checked: true",
+            "      child-nodes:",
+        ]
+        for layer in range(group * 50, min((group + 1) * 50, layer_count)):
+            lines += [f'        - "Layer {layer}":']
+            if with_inheritance:
+                lines += ["            <<<: *base_layer"]
+            else:
+                lines += [
+                    "            checked: true",
+                    "            expanded: false",
+                    "            featurecount: false",
+                ]
+            lines += [
+                f"            qmlstylefile: ilidata:ch.opengis.topping.test.qml_{layer}",
+                "            styles:",
+                "              - dark",
+                "              - light",
+            ]
+    lines += ["layerorder:"]
+    lines += [f'  - "Layer {layer}"' for layer in range(layer_count)]
+    lines += ["mapthemes:"]
+    for theme in range(10):
+        lines += [f'  "Theme {theme}":']
+        for layer in range(0, layer_count, 10):
+            lines += [
+                f'    "Layer {layer}":',
+                "      style: dark",
+                "      visible: true",
+            ]
+    lines += [
+        "layouts:",
+        '  "Overview":',
+        "    templatefile: ilidata:ch.opengis.topping.test.layout_overview",
+        "variables:",
+        "  first_variable: first",
+        "properties:",
+        "  transaction_mode: AutomaticGroups",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+BENCHMARK_MODEL = "Benchmark_V1"
+MEGABYTE = 1024 * 1024
+
+
+def _write_sized(path, header, object_lines, footer, size_mb):
+    """
+    Writes the header, repeats the object lines until the file has about the given size and writes the footer.
+    The object lines are formatted with a running {tid}.
+    """
+    size = int(size_mb * MEGABYTE)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(header)
+        written = len(header)
+        tid = 0
+        while written < size:
+            # a thousand objects per write, so the GB files are written in reasonable time
+            chunk = "".join(
+                line.format(tid=tid + offset)
+                for offset in range(1000)
+                for line in object_lines
+            )
+            f.write(chunk)
+            written += len(chunk)
+            tid += 1000
+        f.write(footer)
+    return path
+
+
+@pytest.mark.skip("This is a utility function, not a test function")
+def generate_xtf(path, size_mb=1, header_offset=0, model=BENCHMARK_MODEL):
+    """
+    Generates an INTERLIS 2.3 transfer file of about size_mb megabytes.
+    The header section comes after header_offset comment lines (the model detection reads the first 100 lines only).
+    """
+    header = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        + "".join(f"<!-- comment line {line} -->\n" for line in range(header_offset))
+        + '<TRANSFER xmlns="http://www.interlis.ch/INTERLIS2.3">\n'
+        '<HEADERSECTION SENDER="modelbaker-benchmark" VERSION="2.3">\n'
+        "<MODELS>\n"
+        f'<MODEL NAME="{model}" VERSION="2026-10-19" URI="https://www.opengis.ch"/>\n'
+        "</MODELS>\n"
+        "</HEADERSECTION>\n"
+        "<DATASECTION>\n"
+        f'<{model}.Buildings BID="b1">\n'
+    )
+    object_lines = [
+        f'<{model}.Buildings.Building TID="o{{tid}}"><Name>Building {{tid}}</Name>'
+        "<Geometry><COORD><C1>2600000.000</C1><C2>1200000.000</C2></COORD></Geometry>"
+        f"</{model}.Buildings.Building>\n"
+    ]
+    footer = f"</{model}.Buildings>\n</DATASECTION>\n</TRANSFER>\n"
+    return _write_sized(path, header, object_lines, footer, size_mb)
+
+
+@pytest.mark.skip("This is a utility function, not a test function")
+def generate_itf(path, size_mb=1, header_offset=0, model=BENCHMARK_MODEL):
+    """
+    Generates an INTERLIS 1 transfer file of about size_mb megabytes with header_offset comment lines before the model line.
+    """
+    header = (
+        "SCNT\n"
+        + "".join(f"comment line {line}\n" for line in range(header_offset))
+        + "////\n"
+        "MTID INTERLIS1\n"
+        f"MODL {model}\n"
+        "ETOP\n"
+        "EMOD\n"
+        "ENDE\n"
+        "TOPI Buildings\n"
+        "TABL Building\n"
+    )
+    object_lines = ["OBJE {tid} Building_{tid} 2600000.000 1200000.000\n"]
+    footer = "ETAB\nETOP\nEMOD\nENDE\n"
+    return _write_sized(path, header, object_lines, footer, size_mb)
+
+
+@pytest.mark.skip("This is a utility function, not a test function")
+def generate_ili_folder(directory, count=200):
+    """
+    Generates count INTERLIS 2.3 models, every model importing the previous one.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for number in range(count):
+        imports = f"  IMPORTS Benchmark_{number - 1}_V1;\n" if number else ""
+        path = os.path.join(directory, f"Benchmark_{number}_V1.ili")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                "INTERLIS 2.3;\n\n"
+                f'MODEL Benchmark_{number}_V1 (en) AT "https://www.opengis.ch" VERSION "2026-10-19" =\n'
+                f"{imports}"
+                f"  TOPIC Topic_{number} =\n"
+                "    CLASS Building =\n"
+                "      Name : TEXT*100;\n"
+                "    END Building;\n"
+                f"  END Topic_{number};\n"
+                f"END Benchmark_{number}_V1.\n"
+            )
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.skip("This is a utility function, not a test function")
+def generate_benchmark_model(path, model=BENCHMARK_MODEL):
+    """
+    Generates the INTERLIS 2.3 model of the transfer files from generate_xtf.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            "INTERLIS 2.3;\n\n"
+            f'MODEL {model} (en) AT "https://www.opengis.ch" VERSION "2026-10-19" =\n'
+            "  DOMAIN\n"
+            "    Coord = COORD 2460000.000 .. 2870000.000 [INTERLIS.m], 1045000.000 .. 1310000.000 [INTERLIS.m], ROTATION 2 -> 1;\n"
+            "  TOPIC Buildings =\n"
+            "    CLASS Building =\n"
+            "      Name : TEXT*100;\n"
+            "      Geometry : Coord;\n"
+            "    END Building;\n"
+            "  END Buildings;\n"
+            f"END {model}.\n"
+        )
+    return path
+
+
+class BenchmarkPhases:
+    """
+    Records the wall time, the peak RSS (of this process and of the finished child processes like ili2db)
+    and the size of the database file after each phase.
+    The peak RSS is the maximum since the start of the process, so it only grows from phase to phase.
+    """
+
+    def __init__(self, dbfile):
+        self.dbfile = dbfile
+        self.phases = []
+
+    @staticmethod
+    def _peak_rss_mb():
+        try:
+            import resource
+        except ImportError:
+            # not available on Windows
+            return None, None
+        # kilobytes on Linux
+        return (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        )
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        yield
+        wall_time = time.perf_counter() - start
+        peak_rss_mb, peak_children_rss_mb = self._peak_rss_mb()
+        self.phases.append(
+            {
+                "phase": name,
+                "wall_time": wall_time,
+                "peak_rss_mb": peak_rss_mb,
+                "peak_children_rss_mb": peak_children_rss_mb,
+                "db_size_mb": os.path.getsize(self.dbfile) / MEGABYTE
+                if os.path.isfile(self.dbfile)
+                else 0,
+            }
+        )
+
+    def save(self, path, **info):
+        with open(path, "w") as f:
+            json.dump(dict(info, phases=self.phases), f, indent=2)
+
+
+class BenchmarkBaseline:
+    """
+    Keeps the timings of the benchmarks in a JSON file and compares new timings against them.
+    A timing fails when it is slower than the baseline times the threshold or when it has no baseline.
+    Only with `update` the timings are recorded and the file is written.
+    """
+
+    def __init__(self, path, threshold=1.25, update=False):
+        self.path = path
+        self.threshold = threshold
+        self.update = update
+        self.timings = {}
+        if os.path.isfile(path):
+            with open(path) as f:
+                self.timings = json.load(f)
+
+    @staticmethod
+    def measure(function, repeat=3):
+        """
+        Returns the fastest of repeat runs in seconds.
+        """
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            durations.append(time.perf_counter() - start)
+        return min(durations)
+
+    def check(self, name, seconds):
+        """
+        Returns if the timing is within the threshold and the baseline it's compared to.
+        """
+        if self.update:
+            self.timings[name] = seconds
+            return True, seconds
+        baseline = self.timings.get(name)
+        if baseline is None:
+            return False, None
+        return seconds <= baseline * self.threshold, baseline
+
+    def save(self):
+        if not self.update:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.timings, f, indent=2, sort_keys=True)
+
+
+class _QuietRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the files with an ETag and answers conditional requests (If-None-Match) with 304.
+    The path and the status code of every request is recorded in `server.requests`.
+    """
+
+    def do_GET(self):
+        self._etag = None
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                self._etag = '"{}"'.format(hashlib.sha1(f.read()).hexdigest())
+            if self.headers.get("If-None-Match") == self._etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+        super().do_GET()
+
+    def end_headers(self):
+        if getattr(self, "_etag", None):
+            self.send_header("ETag", self._etag)
+        super().end_headers()
+
+    def log_request(self, code="-", size="-"):
+        self.server.requests.append((self.path, int(code)))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalRepositoryServer:
+    """
+    Serves a directory over http on localhost, to stand in for a model repository.
+    Use it as context manager, the url of the repository is in `url` and the requests made are in `requests`.
+    """
+
+    def __init__(self, directory, request_handler=_QuietRequestHandler):
+        self.directory = directory
+        self.request_handler = request_handler
+        self.server = None
+        self.thread = None
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}/".format(self.server.server_address[1])
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            functools.partial(self.request_handler, directory=self.directory),
+        )
+        self.server.requests = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
@@ -0,0 +1,631 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import re
+import uuid
+from contextlib import contextmanager
+
+from QgisModelBaker.utils.globals import CATALOGUE_DATASETNAME
+from QgisModelBaker.utils.oid_utils import (
+    anyoid_expression,
+    standardoid_expression,
+    text_expression,
+    uuid_expression,
+)
+
+UUID_EXPRESSION = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE
+)
+
+
+def sql_dialect(connection):
+    """
+    Returns the dialect ("postgres", "gpkg" or "mssql") of the DB-API connection of a db connector.
+    """
+    module = type(connection).__module__.split(".")[0]
+    if module == "psycopg2":
+        return DatasetStore.POSTGRES
+    if module == "pyodbc":
+        return DatasetStore.MSSQL
+    return DatasetStore.GPKG
+
+
+class DatasetStoreError(RuntimeError):
+    pass
+
+
+class DatasetStore:
+    """
+    Reads the datasets and baskets directly from the ili2db meta tables of a db connector.
+    The datasets are filtered on the server and read page by page (ordered by name) so that schemas
+    with thousands of datasets do not need to be loaded at once.
+    The bulk operations (delete, rename, copy) write the meta tables and the class tables in one transaction
+    instead of running ili2db per dataset.
+    """
+
+    POSTGRES = "postgres"
+    GPKG = "gpkg"
+    MSSQL = "mssql"
+
+    PAGE_SIZE = 200
+
+    def __init__(self, db_connector):
+        self.db_connector = db_connector
+        self.connection = db_connector.conn
+        self.dialect = sql_dialect(self.connection)
+        self._basket_tables = None
+        self._columns = None
+        self._foreign_keys = None
+
+    @property
+    def placeholder(self):
+        return "%s" if self.dialect == self.POSTGRES else "?"
+
+    def _quote(self, name):
+        if self.dialect == self.MSSQL:
+            return f"[{name}]"
+        return f'"{name}"'
+
+    def _table_name(self, table, quote=False):
+        table = self._quote(table) if quote else table
+        schema = getattr(self.db_connector, "schema", None)
+        if schema and self.dialect != self.GPKG:
+            return f"{schema}.{table}"
+        return table
+
+    @property
+    def dataset_table(self):
+        return self._table_name(self.db_connector.dataset_table_name)
+
+    @property
+    def basket_table(self):
+        return self._table_name(self.db_connector.basket_table_name)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Yields a cursor and commits when the block succeeds, otherwise everything is rolled back.
+        """
+        cursor = self.connection.cursor()
+        try:
+            yield cursor
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise DatasetStoreError(str(e))
+        finally:
+            cursor.close()
+
+    def _fetchall(self, statement, parameters=()):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(statement, parameters)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _name_filter(self, filter_text):
+        """
+        Returns the condition (case insensitive, wildcards escaped) for the dataset names containing the filter text and its parameters.
+        """
+        if not filter_text:
+            return "", []
+        special_characters = "\\%_[" if self.dialect == self.MSSQL else "\\%_"
+        pattern = "".join(
+            f"\\{character}" if character in special_characters else character
+            for character in filter_text
+        )
+        # LIKE is case insensitive on SQLite (ASCII) and the default collations of MSSQL
+        like = "ILIKE" if self.dialect == self.POSTGRES else "LIKE"
+        return (
+            f" AND datasetname {like} {self.placeholder} ESCAPE '\\'",
+            [f"%{pattern}%"],
+        )
+
+    def datasets(self, filter_text="", after=None, limit=PAGE_SIZE):
+        """
+        Returns up to limit (t_id, datasetname) ordered by name and following the name after, omitting the catalogue dataset.
+        """
+        tid = self.db_connector.tid
+        condition, parameters = self._name_filter(filter_text)
+        if after is not None:
+            condition += f" AND datasetname > {self.placeholder}"
+            parameters.append(after)
+        if self.dialect == self.MSSQL:
+            statement = f"SELECT TOP ({int(limit)}) {tid}, datasetname FROM {self.dataset_table} WHERE datasetname <> {self.placeholder}{condition} ORDER BY datasetname"
+        else:
+            statement = f"SELECT {tid}, datasetname FROM {self.dataset_table} WHERE datasetname <> {self.placeholder}{condition} ORDER BY datasetname LIMIT {int(limit)}"
+        return [
+            (record[0], record[1])
+            for record in self._fetchall(
+                statement, [CATALOGUE_DATASETNAME] + parameters
+            )
+        ]
+
+    def dataset_count(self, filter_text=""):
+        """
+        Returns the number of datasets with a name containing the filter text.
+        """
+        condition, parameters = self._name_filter(filter_text)
+        return self._fetchall(
+            f"SELECT COUNT(*) FROM {self.dataset_table} WHERE datasetname <> {self.placeholder}{condition}",
+            [CATALOGUE_DATASETNAME] + parameters,
+        )[0][0]
+
+    def basket_tables(self):
+        """
+        Returns the class tables having a basket column (the ones holding the objects of the baskets).
+        """
+        if self._basket_tables is None:
+            if self.dialect == self.GPKG:
+                records = self._fetchall(
+                    "SELECT m.name FROM sqlite_master m JOIN pragma_table_info(m.name) c "
+                    "WHERE m.type = 'table' AND lower(c.name) = 't_basket'"
+                )
+            else:
+                records = self._fetchall(
+                    f"SELECT table_name FROM information_schema.columns WHERE table_schema = {self.placeholder} AND lower(column_name) = 't_basket'",
+                    [self.db_connector.schema],
+                )
+            self._basket_tables = sorted(
+                {
+                    record[0]
+                    for record in records
+                    if not record[0].lower().startswith("t_ili2db_")
+                }
+            )
+        return self._basket_tables
+
+    def counts(self):
+        """
+        Returns the number of baskets and objects per dataset t_id with one grouped query over all class tables.
+        """
+        tid = self.db_connector.tid
+        objects = " UNION ALL ".join(
+            f"SELECT t_basket, COUNT(*) AS objects FROM {self._table_name(table, quote=True)} GROUP BY t_basket"
+            for table in self.basket_tables()
+        )
+        if objects:
+            statement = f"""SELECT d.{tid}, COUNT(b.{tid}), COALESCE(SUM(o.objects), 0)
+                FROM {self.dataset_table} d
+                LEFT JOIN {self.basket_table} b ON b.dataset = d.{tid}
+                LEFT JOIN (SELECT t_basket, SUM(objects) AS objects FROM ({objects}) u GROUP BY t_basket) o ON o.t_basket = b.{tid}
+                GROUP BY d.{tid}"""
+        else:
+            statement = f"""SELECT d.{tid}, COUNT(b.{tid}), 0
+                FROM {self.dataset_table} d
+                LEFT JOIN {self.basket_table} b ON b.dataset = d.{tid}
+                GROUP BY d.{tid}"""
+        return {
+            record[0]: (record[1], record[2]) for record in self._fetchall(statement)
+        }
+
+    def baskets(self, datasetname):
+        """
+        Returns the baskets (basket_t_id, basket_t_ili_tid, topic) of the given dataset.
+        """
+        tid = self.db_connector.tid
+        return [
+            {
+                "basket_t_id": record[0],
+                "basket_t_ili_tid": record[1],
+                "topic": record[2],
+            }
+            for record in self._fetchall(
+                f"""SELECT b.{tid}, b.{self.db_connector.tilitid}, b.topic
+                    FROM {self.basket_table} b
+                    JOIN {self.dataset_table} d ON b.dataset = d.{tid}
+                    WHERE d.datasetname = {self.placeholder}""",
+                [datasetname],
+            )
+        ]
+
+    def columns(self):
+        """
+        Returns the columns per class table having a basket column.
+        """
+        if self._columns is None:
+            if self.dialect == self.GPKG:
+                records = self._fetchall(
+                    "SELECT m.name, c.name FROM sqlite_master m JOIN pragma_table_info(m.name) c "
+                    "WHERE m.type = 'table' ORDER BY m.name, c.cid"
+                )
+            else:
+                records = self._fetchall(
+                    f"SELECT table_name, column_name FROM information_schema.columns WHERE table_schema = {self.placeholder} ORDER BY table_name, ordinal_position",
+                    [self.db_connector.schema],
+                )
+            basket_tables = set(self.basket_tables())
+            self._columns = {}
+            for table, column in records:
+                if table in basket_tables:
+                    self._columns.setdefault(table, []).append(column)
+        return self._columns
+
+    def basket_columns(self):
+        """
+        Returns the columns of the basket table.
+        """
+        if self.dialect == self.GPKG:
+            return [
+                record[0]
+                for record in self._fetchall(
+                    "SELECT name FROM pragma_table_info(?) ORDER BY cid",
+                    [self.db_connector.basket_table_name],
+                )
+            ]
+        return [
+            record[0]
+            for record in self._fetchall(
+                f"SELECT column_name FROM information_schema.columns WHERE table_schema = {self.placeholder} AND lower(table_name) = lower({self.placeholder}) ORDER BY ordinal_position",
+                [self.db_connector.schema, self.db_connector.basket_table_name],
+            )
+        ]
+
+    def foreign_keys(self):
+        """
+        Returns the foreign keys (column, referenced table) per class table having a basket column.
+        """
+        if self._foreign_keys is None:
+            if self.dialect == self.GPKG:
+                records = self._fetchall(
+                    'SELECT m.name, f."from", f."table" FROM sqlite_master m JOIN pragma_foreign_key_list(m.name) f '
+                    "WHERE m.type = 'table'"
+                )
+            elif self.dialect == self.POSTGRES:
+                records = self._fetchall(
+                    """SELECT tc.table_name, kcu.column_name, ccu.table_name
+                    FROM information_schema.table_constraints tc
+                    JOIN information_schema.key_column_usage kcu
+                    ON tc.constraint_name = kcu.constraint_name AND tc.table_schema = kcu.table_schema
+                    JOIN information_schema.constraint_column_usage ccu
+                    ON tc.constraint_name = ccu.constraint_name AND tc.table_schema = ccu.table_schema
+                    WHERE tc.constraint_type = 'FOREIGN KEY' AND tc.table_schema = %s""",
+                    [self.db_connector.schema],
+                )
+            else:
+                records = self._fetchall(
+                    """SELECT OBJECT_NAME(fkc.parent_object_id), COL_NAME(fkc.parent_object_id, fkc.parent_column_id), OBJECT_NAME(fkc.referenced_object_id)
+                    FROM sys.foreign_key_columns fkc
+                    WHERE OBJECT_SCHEMA_NAME(fkc.parent_object_id) = ?""",
+                    [self.db_connector.schema],
+                )
+            basket_tables = {table.lower(): table for table in self.basket_tables()}
+            self._foreign_keys = {}
+            for table, column, referenced_table in records:
+                if table in basket_tables.values():
+                    self._foreign_keys.setdefault(table, []).append(
+                        (column, basket_tables.get(referenced_table.lower()))
+                    )
+        return self._foreign_keys
+
+    def ordered_basket_tables(self):
+        """
+        Returns the class tables ordered so that the referenced tables come before the referencing ones
+        (tables in a reference cycle at the end). Needed where the foreign keys are not deferred (MSSQL).
+        """
+        dependencies = {
+            table: {
+                referenced_table
+                for _, referenced_table in self.foreign_keys().get(table, [])
+                if referenced_table and referenced_table != table
+            }
+            for table in self.basket_tables()
+        }
+        ordered_tables = []
+        while dependencies:
+            independent_tables = sorted(
+                table
+                for table, referenced_tables in dependencies.items()
+                if not referenced_tables - set(ordered_tables)
+            )
+            if not independent_tables:
+                ordered_tables.extend(sorted(dependencies))
+                break
+            ordered_tables.extend(independent_tables)
+            for table in independent_tables:
+                del dependencies[table]
+        return ordered_tables
+
+    def _in_list(self, values):
+        return ", ".join(self.placeholder for _ in values)
+
+    def _basket_tids(self, cursor, dataset_tids):
+        tid = self.db_connector.tid
+        cursor.execute(
+            f"SELECT {tid} FROM {self.basket_table} WHERE dataset IN ({self._in_list(dataset_tids)})",
+            list(dataset_tids),
+        )
+        return [record[0] for record in cursor.fetchall()]
+
+    def affected_rows(self, dataset_tids):
+        """
+        Returns the number of datasets, baskets and objects a bulk operation on the given datasets touches.
+        """
+        counts = self.counts()
+        return (
+            len(dataset_tids),
+            sum(counts.get(tid, (0, 0))[0] for tid in dataset_tids),
+            sum(counts.get(tid, (0, 0))[1] for tid in dataset_tids),
+        )
+
+    def delete_datasets(self, dataset_tids):
+        """
+        Deletes the datasets with their baskets and all the objects in them.
+        """
+        if not dataset_tids:
+            return
+        tid = self.db_connector.tid
+        with self._transaction() as cursor:
+            basket_tids = self._basket_tids(cursor, dataset_tids)
+            if basket_tids:
+                for table in reversed(self.ordered_basket_tables()):
+                    cursor.execute(
+                        f"DELETE FROM {self._table_name(table, quote=True)} WHERE t_basket IN ({self._in_list(basket_tids)})",
+                        basket_tids,
+                    )
+                cursor.execute(
+                    f"DELETE FROM {self.basket_table} WHERE {tid} IN ({self._in_list(basket_tids)})",
+                    basket_tids,
+                )
+            cursor.execute(
+                f"DELETE FROM {self.dataset_table} WHERE {tid} IN ({self._in_list(dataset_tids)})",
+                list(dataset_tids),
+            )
+
+    def rename_datasets(self, datasetnames):
+        """
+        Renames the datasets given as dict of t_id and new name. A name that already exists rolls back all the renames.
+        """
+        tid = self.db_connector.tid
+        with self._transaction() as cursor:
+            for dataset_tid, datasetname in datasetnames.items():
+                cursor.execute(
+                    f"UPDATE {self.dataset_table} SET datasetname = {self.placeholder} WHERE {tid} = {self.placeholder}",
+                    [datasetname, dataset_tid],
+                )
+
+    def _reserve_tids(self, cursor, count):
+        """
+        Returns the first of count consecutive t_ids taken from the ili2db sequence.
+        """
+        if self.dialect == self.GPKG:
+            cursor.execute(
+                "SELECT T_LastUniqueId, T_CreateDate FROM T_KEY_OBJECT WHERE T_Key = ?",
+                [self.db_connector.tid],
+            )
+            record = cursor.fetchone()
+            first_tid = record[0] + 1 if record else self._max_gpkg_tid(cursor) + 1
+            cursor.execute(
+                """INSERT OR REPLACE INTO T_KEY_OBJECT (T_Key, T_LastUniqueId, T_LastChange, T_CreateDate, T_User)
+                VALUES (?, ?, date('now'), ?, 'modelbaker')""",
+                [
+                    self.db_connector.tid,
+                    first_tid + count - 1,
+                    record[1] if record else None,
+                ],
+            )
+            return first_tid
+        sequence = f"{self.db_connector.schema}.t_ili2db_seq"
+        if self.dialect == self.POSTGRES:
+            cursor.execute(f"SELECT nextval('{sequence}')")
+            first_tid = cursor.fetchone()[0]
+            cursor.execute(f"SELECT setval('{sequence}', {first_tid + count - 1})")
+            return first_tid
+        cursor.execute(f"SELECT NEXT VALUE FOR {sequence}")
+        first_tid = cursor.fetchone()[0]
+        cursor.execute(f"ALTER SEQUENCE {sequence} RESTART WITH {first_tid + count}")
+        return first_tid
+
+    def _max_gpkg_tid(self, cursor):
+        """
+        Returns the biggest t_id of all the tables (like ili2db does when there is no entry in T_KEY_OBJECT).
+        """
+        cursor.execute(
+            "SELECT m.name, c.name FROM sqlite_master m JOIN pragma_table_info(m.name) c "
+            "WHERE m.type = 'table' AND lower(c.name) = lower(?)",
+            [self.db_connector.tid],
+        )
+        max_tids = [
+            f"SELECT MAX({self._quote(column)}) AS max_tid FROM {self._quote(table)}"
+            for table, column in cursor.fetchall()
+        ]
+        if not max_tids:
+            return 0
+        cursor.execute(
+            f"SELECT COALESCE(MAX(max_tid), 0) FROM ({' UNION ALL '.join(max_tids)}) t"
+        )
+        return cursor.fetchone()[0]
+
+    def _digits_condition(self, expression):
+        """
+        Returns the condition that the text expression consists of digits only.
+        """
+        if self.dialect == self.POSTGRES:
+            return f"{expression} ~ '^[0-9]+$'"
+        if self.dialect == self.MSSQL:
+            return f"{expression} <> '' AND {expression} NOT LIKE '%[^0-9]%'"
+        return f"{expression} <> '' AND {expression} NOT GLOB '*[^0-9]*'"
+
+    def _new_oid_expression(self, column, offset):
+        """
+        Returns the expression of a new OID (t_ili_tid) of a copied object in the OID domain of the original one.
+        The store does not know the OID domains of the tables, so the domain is recognized by the original OID:
+        - UUIDOID: a new UUID
+        - I32OID (digits only): the new t_id
+        - STANDARDOID (8 chars prefix and 8 digits): the same prefix and the new t_id padded to 8 chars
+        - any other: an underscore and a new UUID (like Model Baker's default value expression)
+        """
+        quoted_column = self._quote(column)
+        new_tid = f"({self._quote(self.db_connector.tid)} + {offset})"
+        if self.dialect == self.MSSQL:
+            length = f"LEN({quoted_column})"
+            prefix = f"SUBSTRING({quoted_column}, 1, 8)"
+            number = f"SUBSTRING({quoted_column}, 9, 8)"
+        else:
+            length = f"length({quoted_column})"
+            prefix = f"substr({quoted_column}, 1, 8)"
+            number = f"substr({quoted_column}, 9, 8)"
+        # the wildcard _ matches any single character in all the dialects
+        return (
+            f"CASE WHEN {quoted_column} IS NULL THEN NULL "
+            f"WHEN {quoted_column} LIKE '________-____-____-____-____________' THEN {uuid_expression(self.dialect, self.connection)} "
+            f"WHEN {self._digits_condition(quoted_column)} THEN {text_expression(self.dialect, new_tid)} "
+            f"WHEN {length} = 16 AND {self._digits_condition(number)} THEN {standardoid_expression(self.dialect, prefix, new_tid)} "
+            f"ELSE {anyoid_expression(self.dialect, self.connection)} END"
+        )
+
+    def _copied_value_expression(self, table, column, offset, basket_tids, datasetname):
+        """
+        Returns the expression of the column value of a copied object and its parameters.
+        The t_ids and the references to copied objects are shifted by the offset, the references to other objects are kept.
+        The copied objects get new OIDs.
+        """
+        quoted_column = self._quote(column)
+        if column.lower() in [self.db_connector.tid.lower(), "t_basket"]:
+            return f"{quoted_column} + {offset}", []
+        if column.lower() == self.db_connector.tilitid.lower():
+            return self._new_oid_expression(column, offset), []
+        if column.lower() == "t_datasetname":
+            return self.placeholder, [datasetname]
+        for fk_column, referenced_table in self.foreign_keys().get(table, []):
+            if fk_column == column and referenced_table:
+                return (
+                    f"CASE WHEN EXISTS (SELECT 1 FROM {self._table_name(referenced_table, quote=True)} r "
+                    f"WHERE r.{self._quote(self.db_connector.tid)} = {quoted_column} AND r.t_basket IN ({self._in_list(basket_tids)})) "
+                    f"THEN {quoted_column} + {offset} ELSE {quoted_column} END",
+                    list(basket_tids),
+                )
+        return quoted_column, []
+
+    def _copy_rows(self, cursor, table, columns, expressions, condition, parameters):
+        """
+        Inserts the rows matching the condition again with the values of the given expressions.
+        """
+        table_name = (
+            table
+            if table in [self.basket_table, self.dataset_table]
+            else self._table_name(table, quote=True)
+        )
+        cursor.execute(
+            f"INSERT INTO {table_name} ({', '.join(self._quote(column) for column in columns)}) "
+            f"SELECT {', '.join(expression for expression, _ in expressions)} FROM {table_name} WHERE {condition}",
+            [
+                parameter
+                for _, expression_parameters in expressions
+                for parameter in expression_parameters
+            ]
+            + parameters,
+        )
+
+    def _tid_range(self, cursor, basket_tids):
+        """
+        Returns the smallest and the biggest t_id of the baskets and their objects.
+        """
+        tid = self._quote(self.db_connector.tid)
+        in_list = ", ".join(str(basket_tid) for basket_tid in basket_tids)
+        ranges = [
+            f"SELECT MIN({tid}) AS min_tid, MAX({tid}) AS max_tid FROM {self.basket_table} WHERE {tid} IN ({in_list})"
+        ] + [
+            f"SELECT MIN({tid}), MAX({tid}) FROM {self._table_name(table, quote=True)} WHERE t_basket IN ({in_list})"
+            for table in self.basket_tables()
+        ]
+        cursor.execute(
+            f"SELECT MIN(min_tid), MAX(max_tid) FROM ({' UNION ALL '.join(ranges)}) r"
+        )
+        return cursor.fetchone()
+
+    def _new_bid(self, bid, basket_tid):
+        if bid and UUID_EXPRESSION.match(bid):
+            return str(uuid.uuid4())
+        if bid and bid.isdigit():
+            return str(basket_tid)
+        # no rule to derive a new one (e.g. STANDARDOID), it can be changed in the basket manager
+        return bid
+
+    def copy_datasets(self, datasetnames):
+        """
+        Copies the datasets given as dict of t_id and new name with their baskets and objects into new datasets.
+        The copies get new t_ids out of the ili2db sequence, the baskets new BIDs where they are UUIDs or numbers and the objects new OIDs.
+        """
+        tid = self.db_connector.tid
+        tilitid = self.db_connector.tilitid
+        with self._transaction() as cursor:
+            for dataset_tid, datasetname in datasetnames.items():
+                basket_tids = self._basket_tids(cursor, [dataset_tid])
+                if not basket_tids:
+                    new_dataset_tid = self._reserve_tids(cursor, 1)
+                else:
+                    min_tid, max_tid = self._tid_range(cursor, basket_tids)
+                    new_dataset_tid = self._reserve_tids(cursor, max_tid - min_tid + 2)
+                    offset = new_dataset_tid + 1 - min_tid
+                cursor.execute(
+                    f"INSERT INTO {self.dataset_table} ({tid}, datasetname) VALUES ({self.placeholder}, {self.placeholder})",
+                    [new_dataset_tid, datasetname],
+                )
+                if not basket_tids:
+                    continue
+
+                cursor.execute(
+                    f"SELECT {tid}, {tilitid} FROM {self.basket_table} WHERE {tid} IN ({self._in_list(basket_tids)})",
+                    basket_tids,
+                )
+                basket_columns = self.basket_columns()
+                for basket_tid, bid in cursor.fetchall():
+                    expressions = []
+                    for column in basket_columns:
+                        if column.lower() == tid.lower():
+                            expressions.append(
+                                (f"{self._quote(column)} + {offset}", [])
+                            )
+                        elif column.lower() == "dataset":
+                            expressions.append((self.placeholder, [new_dataset_tid]))
+                        elif column.lower() == tilitid.lower():
+                            expressions.append(
+                                (
+                                    self.placeholder,
+                                    [self._new_bid(bid, basket_tid + offset)],
+                                )
+                            )
+                        else:
+                            expressions.append((self._quote(column), []))
+                    self._copy_rows(
+                        cursor,
+                        self.basket_table,
+                        basket_columns,
+                        expressions,
+                        f"{tid} = {self.placeholder}",
+                        [basket_tid],
+                    )
+
+                for table in self.ordered_basket_tables():
+                    columns = self.columns().get(table, [])
+                    self._copy_rows(
+                        cursor,
+                        table,
+                        columns,
+                        [
+                            self._copied_value_expression(
+                                table, column, offset, basket_tids, datasetname
+                            )
+                            for column in columns
+                        ],
+                        f"t_basket IN ({self._in_list(basket_tids)})",
+                        basket_tids,
+                    )
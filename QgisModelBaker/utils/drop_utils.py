@@ -0,0 +1,214 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import logging
+import os
+import re
+import tempfile
+import zipfile
+
+from qgis.PyQt.QtCore import QThread, pyqtSignal
+
+# the kinds of the found files, like FileDropListView.extractDroppedFiles lists them
+INTERLIS_FILE = "interlis"
+XML_FILE = "xml"
+INI_FILE = "ini"
+
+FILE_KINDS = {
+    "ili": INTERLIS_FILE,
+    "itf": INTERLIS_FILE,
+    "xtf": INTERLIS_FILE,
+    "xml": XML_FILE,
+    "ini": INI_FILE,
+    "toml": INI_FILE,
+}
+ContainerExtensions = ["zip", "ZIP"]
+
+# the head of the file that is read to recognize the content
+SNIFF_SIZE = 8192
+# found files are passed in batches of this size
+BATCH_SIZE = 200
+
+ILI_HEADER = re.compile(rb"^\s*INTERLIS\s+[12]\.\d+\s*;", re.MULTILINE)
+ILI_COMMENT = re.compile(rb"!![^\r\n]*|/\*.*?\*/", re.DOTALL)
+XML_TRANSFER = re.compile(rb"<(?:\w+:)?transfer\b", re.IGNORECASE)
+INI_LINE = re.compile(rb"^\s*(?:\[[^\]\r\n]+\]|[\w.\-\"]+\s*=)", re.MULTILINE)
+# transfer files of the repository models (like ilimodels.xml or ilidata.xml) are no data
+REPOSITORY_MODELS = (b"IliRepository", b"DatasetIdx", b"IliSite")
+
+
+def _suffix(path):
+    return os.path.splitext(path)[1][1:]
+
+
+def sniff_file_kind(path, head):
+    """
+    Returns the kind of the file (INTERLIS_FILE, XML_FILE or INI_FILE) when its suffix is known and the head of its content matches it, otherwise None.
+    """
+    suffix = _suffix(path).lower()
+    kind = FILE_KINDS.get(suffix)
+    if not kind:
+        return None
+    head = head.lstrip(b"\xef\xbb\xbf")
+    if suffix == "ili":
+        return kind if ILI_HEADER.search(ILI_COMMENT.sub(b"", head)) else None
+    if suffix == "itf":
+        return kind if head.lstrip().startswith(b"SCNT") else None
+    if kind in (INTERLIS_FILE, XML_FILE):
+        if (
+            XML_TRANSFER.search(head)
+            and b"interlis" in head.lower()
+            and not any(model in head for model in REPOSITORY_MODELS)
+        ):
+            return kind
+        return None
+    return kind if b"\0" not in head and INI_LINE.search(head) else None
+
+
+def is_container(path):
+    return _suffix(path) in ContainerExtensions or os.path.isdir(path)
+
+
+def contains_interlis_files(path, limit=1000):
+    """
+    Quick check by the names only, whether a directory or zip archive (or a zip archive in the directory) contains files with an INTERLIS suffix (ili, itf, xtf).
+    At most limit entries are looked at, so dropping a huge folder does not block.
+    """
+
+    def interlis_name(name):
+        return FILE_KINDS.get(_suffix(name).lower()) == INTERLIS_FILE
+
+    try:
+        if os.path.isdir(path):
+            count = 0
+            for root, _, filenames in os.walk(path):
+                for filename in filenames:
+                    if interlis_name(filename):
+                        return True
+                    if _suffix(filename) in ContainerExtensions:
+                        if contains_interlis_files(os.path.join(root, filename), limit):
+                            return True
+                    count += 1
+                    if count >= limit:
+                        return False
+            return False
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                return any(interlis_name(name) for name in archive.namelist()[:limit])
+    except OSError as exception:
+        logging.warning(f"Could not look into {path}: {exception}")
+    return False
+
+
+class DroppedFilesScanner(QThread):
+    """
+    Walks the dropped directories and zip archives recursively and passes the files recognized by their content in batches.
+    Files in zip archives are extracted to a temporary directory, since ili2db needs them on the file system.
+    """
+
+    # interlis files, xml files, ini files
+    files_found = pyqtSignal(list, list, list)
+
+    def __init__(self, paths, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.found_count = 0
+        self.extract_directory = None
+        self._batch = {INTERLIS_FILE: [], XML_FILE: [], INI_FILE: []}
+
+    def run(self):
+        for path in self.paths:
+            if self.isInterruptionRequested():
+                break
+            self._scan(path)
+        self._flush()
+
+    def _scan(self, path):
+        try:
+            if os.path.isdir(path):
+                self._scan_directory(path)
+            elif zipfile.is_zipfile(path):
+                self._scan_archive(path)
+            else:
+                self._scan_file(path)
+        except (OSError, zipfile.BadZipFile) as exception:
+            logging.warning(f"Could not scan {path}: {exception}")
+
+    def _scan_directory(self, directory):
+        for root, dirnames, filenames in os.walk(directory):
+            if self.isInterruptionRequested():
+                return
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(root, filename)
+                if _suffix(filename) in ContainerExtensions:
+                    self._scan(path)
+                else:
+                    self._scan_file(path)
+
+    def _scan_file(self, path):
+        if not FILE_KINDS.get(_suffix(path).lower()):
+            return
+        try:
+            with open(path, "rb") as file:
+                head = file.read(SNIFF_SIZE)
+        except OSError as exception:
+            logging.warning(f"Could not read {path}: {exception}")
+            return
+        self._add(path, sniff_file_kind(path, head))
+
+    def _scan_archive(self, archive_path):
+        if self.extract_directory is None:
+            self.extract_directory = tempfile.mkdtemp(prefix="modelbaker_drop_")
+        target_directory = tempfile.mkdtemp(
+            prefix=os.path.splitext(os.path.basename(archive_path))[0] + "_",
+            dir=self.extract_directory,
+        )
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if self.isInterruptionRequested():
+                    return
+                if info.is_dir():
+                    continue
+                if _suffix(info.filename) in ContainerExtensions:
+                    self._scan(archive.extract(info, target_directory))
+                    continue
+                if not FILE_KINDS.get(_suffix(info.filename).lower()):
+                    continue
+                with archive.open(info) as member:
+                    head = member.read(SNIFF_SIZE)
+                kind = sniff_file_kind(info.filename, head)
+                if kind:
+                    # extract sanitizes absolute paths and parent references of the member name
+                    self._add(archive.extract(info, target_directory), kind)
+
+    def _add(self, path, kind):
+        if not kind:
+            return
+        self._batch[kind].append(path)
+        self.found_count += 1
+        if self.found_count % BATCH_SIZE == 0:
+            self._flush()
+
+    def _flush(self):
+        if any(self._batch.values()):
+            self.files_found.emit(
+                self._batch[INTERLIS_FILE], self._batch[XML_FILE], self._batch[INI_FILE]
+            )
+            self._batch = {INTERLIS_FILE: [], XML_FILE: [], INI_FILE: []}
@@ -0,0 +1,115 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+import importlib.util
+import os
+import re
+import tempfile
+import warnings
+
+from qgis.PyQt.QtCore import PYQT_VERSION_STR, QStandardPaths
+from qgis.PyQt.uic import compileUi
+
+# the compiled forms are named by the .ui file, its content hash and the PyQt version
+FORM_MODULE_NAME = "{name}_{ui_hash}_{pyqt_version}"
+FORM_MODULE_PACKAGE = "QgisModelBaker_forms"
+
+
+def form_cache_directory():
+    return os.path.join(
+        QStandardPaths.writableLocation(QStandardPaths.CacheLocation),
+        "QgisModelBaker",
+        "forms",
+    )
+
+
+def _form_name(ui_file):
+    return re.sub(r"\W", "_", os.path.splitext(ui_file)[0])
+
+
+def form_module_name(ui_file, content):
+    """
+    Returns the module name of the compiled form, changing with the content of the .ui file and the PyQt version.
+    """
+    return FORM_MODULE_NAME.format(
+        name=_form_name(ui_file),
+        ui_hash=hashlib.sha256(content).hexdigest()[:16],
+        pyqt_version=PYQT_VERSION_STR.replace(".", "_"),
+    )
+
+
+def _compile_form(ui_file_path, module_path):
+    """
+    Compiles the .ui file to Python and replaces the file of the module at once (no half written forms when QGIS runs twice).
+    """
+    directory = os.path.dirname(module_path)
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(suffix=".py", dir=directory)
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as module_file:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                compileUi(ui_file_path, module_file)
+        os.replace(temporary_path, module_path)
+    except Exception:
+        os.remove(temporary_path)
+        raise
+
+
+def _remove_stale_forms(directory, ui_file, module_name):
+    stale_form = re.compile(
+        rf"^{re.escape(_form_name(ui_file))}_[0-9a-f]{{16}}_[0-9_]+\.py$"
+    )
+    for file_name in os.listdir(directory):
+        if stale_form.match(file_name) and file_name != f"{module_name}.py":
+            try:
+                os.remove(os.path.join(directory, file_name))
+            except OSError:
+                pass
+
+
+def load_form_class(ui_file_path, ui_file, cache_directory=None):
+    """
+    Returns the form class of the .ui file from the cache of compiled forms.
+    A missing or stale (other content or PyQt version) form is compiled into the cache first.
+    Returns None when the form cannot be compiled or loaded, then the caller falls back to loadUiType.
+    """
+    cache_directory = cache_directory or form_cache_directory()
+    try:
+        with open(ui_file_path, "rb") as ui:
+            module_name = form_module_name(ui_file, ui.read())
+        module_path = os.path.join(cache_directory, f"{module_name}.py")
+        if not os.path.isfile(module_path):
+            _compile_form(ui_file_path, module_path)
+            _remove_stale_forms(cache_directory, ui_file, module_name)
+
+        # imported like a module to have the bytecode cached as well
+        spec = importlib.util.spec_from_file_location(
+            f"{FORM_MODULE_PACKAGE}.{module_name}", module_path
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        return None
+
+    for name, value in vars(module).items():
+        if name.startswith("Ui_") and isinstance(value, type):
+            return value
+    return None
@@ -0,0 +1,292 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+# the cache used by the connection of the steps after the import (negative means KiB)
+BULK_CACHE_SIZE = -262144
+# the number of index entries inserted one by one to estimate the index maintenance avoided during the import
+ESTIMATE_SAMPLE_SIZE = 20000
+
+
+class GpkgBulkLoadError(RuntimeError):
+    pass
+
+
+class GpkgBulkLoad:
+    """
+    Bulk load mode for data imports into a GeoPackage.
+
+    ili2gpkg writes over its own connection, so only the settings stored in the file reach it: the journal mode is set to WAL
+    and the RTree spatial indexes (maintained by triggers on every insert) are dropped before the import when they are deferred.
+    After the import the spatial indexes are rebuilt in one go, ANALYZE collects the statistics for the query planner and optionally
+    VACUUM compacts the file, all on a connection with synchronous off and a large cache. Finally the journal mode is restored.
+    """
+
+    def __init__(self, dbfile, defer_spatial_index=True, vacuum=False):
+        self.dbfile = dbfile
+        self.defer_spatial_index = defer_spatial_index
+        self.vacuum = vacuum
+        self.journal_mode = None
+        # (table, column) of the deferred spatial indexes
+        self.spatial_indexes = []
+        # step -> seconds
+        self.timings = {}
+        self.size_before_vacuum = None
+        # estimated seconds the triggers would have needed to maintain the spatial indexes during the import
+        self.estimated_index_maintenance = None
+        self.index_entries = 0
+        self._prepared = False
+
+    def _connect(self):
+        connection = sqlite3.connect(self.dbfile, isolation_level=None)
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.execute(f"PRAGMA cache_size={BULK_CACHE_SIZE}")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        return connection
+
+    def _timed(self, step, function, *args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.timings[step] = self.timings.get(step, 0) + (
+                time.perf_counter() - start
+            )
+
+    @staticmethod
+    def _rtree_indexes(connection):
+        try:
+            return connection.execute(
+                "SELECT table_name, column_name FROM gpkg_extensions WHERE extension_name = 'gpkg_rtree_index' ORDER BY table_name"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # no extensions registered
+            return []
+
+    def _spatial_index_function(self, function, spatial_indexes):
+        """
+        Calls DisableSpatialIndex or CreateSpatialIndex of the GDAL GeoPackage driver for the given spatial indexes.
+        GDAL computes the extents of all geometry types (including curves) and fills the RTree in bulk.
+        """
+        from osgeo import gdal, ogr
+
+        previous_options = {
+            option: gdal.GetConfigOption(option)
+            for option in ["OGR_SQLITE_SYNCHRONOUS", "OGR_SQLITE_CACHE"]
+        }
+        gdal.SetConfigOption("OGR_SQLITE_SYNCHRONOUS", "OFF")
+        gdal.SetConfigOption("OGR_SQLITE_CACHE", str(-BULK_CACHE_SIZE // 1024))
+        try:
+            dataset = ogr.Open(self.dbfile, update=1)
+            if dataset is None:
+                raise GpkgBulkLoadError(
+                    f"Could not open {self.dbfile} to {function} ({gdal.GetLastErrorMsg()})"
+                )
+            for table, column in spatial_indexes:
+                result = dataset.ExecuteSQL(
+                    "SELECT {}('{}', '{}')".format(
+                        function, table.replace("'", "''"), column.replace("'", "''")
+                    )
+                )
+                if result is not None:
+                    dataset.ReleaseResultSet(result)
+            dataset = None
+        finally:
+            for option, value in previous_options.items():
+                gdal.SetConfigOption(option, value)
+
+    def prepare(self):
+        """
+        Switches to the bulk load settings before the import.
+        Returns False when the GeoPackage does not exist yet (then there is nothing to prepare).
+        """
+        if not os.path.isfile(self.dbfile):
+            return False
+        with closing(self._connect()) as connection:
+            self.journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            connection.execute("PRAGMA journal_mode=WAL")
+            if self.defer_spatial_index:
+                self.spatial_indexes = self._rtree_indexes(connection)
+        self._prepared = True
+        if self.spatial_indexes:
+            try:
+                self._timed(
+                    "disable_spatial_index",
+                    self._spatial_index_function,
+                    "DisableSpatialIndex",
+                    self.spatial_indexes,
+                )
+            except Exception:
+                self.finish(success=False)
+                raise
+        return True
+
+    def finish(self, success=True):
+        """
+        Rebuilds the deferred spatial indexes (as well when the import failed), runs ANALYZE and VACUUM after a successful import and restores the journal mode.
+        """
+        if not self._prepared:
+            return
+        self._prepared = False
+        try:
+            if self.spatial_indexes:
+                with closing(self._connect()) as connection:
+                    existing_indexes = set(self._rtree_indexes(connection))
+                # only the ones really dropped, as the preparation could have failed in between
+                missing_indexes = [
+                    spatial_index
+                    for spatial_index in self.spatial_indexes
+                    if spatial_index not in existing_indexes
+                ]
+                if missing_indexes:
+                    self._timed(
+                        "create_spatial_index",
+                        self._spatial_index_function,
+                        "CreateSpatialIndex",
+                        missing_indexes,
+                    )
+                    with closing(self._connect()) as connection:
+                        self._estimate_index_maintenance(connection, missing_indexes)
+        finally:
+            with closing(self._connect()) as connection:
+                if success:
+                    self._timed("analyze", connection.execute, "ANALYZE")
+                    if self.vacuum:
+                        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                        self.size_before_vacuum = os.path.getsize(self.dbfile)
+                        self._timed("vacuum", connection.execute, "VACUUM")
+                connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                journal_mode = connection.execute(
+                    f"PRAGMA journal_mode={self.journal_mode}"
+                ).fetchone()[0]
+                if journal_mode.lower() != self.journal_mode.lower():
+                    # another connection (like a layer in QGIS) keeps the file open
+                    logging.warning(
+                        f"Could not restore the journal mode {self.journal_mode} of {self.dbfile}, it stays {journal_mode}"
+                    )
+
+    def _estimate_index_maintenance(self, connection, spatial_indexes):
+        """
+        Estimates the time the triggers would have needed to maintain the spatial indexes row by row during the import.
+        A sample of the rebuilt index entries is inserted one by one (in the order of the import) into a temporary RTree
+        and the time is scaled to all the entries. It measures the index work only, without the evaluation of the geometries
+        by the triggers, so the real saving is rather bigger.
+        """
+        try:
+            rtree_tables = [
+                "rtree_{}_{}".format(table, column).replace('"', '""')
+                for table, column in spatial_indexes
+            ]
+            self.index_entries = sum(
+                connection.execute(f'SELECT COUNT(*) FROM "{rtree_table}"').fetchone()[
+                    0
+                ]
+                for rtree_table in rtree_tables
+            )
+            if not self.index_entries:
+                self.estimated_index_maintenance = 0.0
+                return
+            sample = []
+            for rtree_table in rtree_tables:
+                sample.extend(
+                    connection.execute(
+                        f'SELECT id, minx, maxx, miny, maxy FROM "{rtree_table}" ORDER BY id LIMIT {ESTIMATE_SAMPLE_SIZE - len(sample)}'
+                    ).fetchall()
+                )
+                if len(sample) >= ESTIMATE_SAMPLE_SIZE:
+                    break
+            connection.execute(
+                "CREATE VIRTUAL TABLE temp.modelbaker_rtree_estimate USING rtree(id, minx, maxx, miny, maxy)"
+            )
+            try:
+                start = time.perf_counter()
+                connection.execute("BEGIN")
+                connection.executemany(
+                    "INSERT INTO temp.modelbaker_rtree_estimate VALUES (NULL, ?, ?, ?, ?)",
+                    [entry[1:] for entry in sample],
+                )
+                connection.execute("COMMIT")
+                seconds = time.perf_counter() - start
+            finally:
+                connection.execute("DROP TABLE temp.modelbaker_rtree_estimate")
+            self.estimated_index_maintenance = (
+                seconds * self.index_entries / len(sample)
+            )
+        except sqlite3.Error as exception:
+            # e.g. SQLite without the RTree module
+            logging.warning(
+                f"Could not estimate the spatial index maintenance: {exception}"
+            )
+            self.estimated_index_maintenance = None
+
+    def time_saved(self):
+        """
+        Returns the estimated seconds saved by deferring the spatial indexes (the avoided maintenance during the import
+        minus dropping and rebuilding them) or None when there is no estimate.
+        """
+        if self.estimated_index_maintenance is None:
+            return None
+        return self.estimated_index_maintenance - (
+            self.timings.get("disable_spatial_index", 0)
+            + self.timings.get("create_spatial_index", 0)
+        )
+
+    def report(self):
+        """
+        Returns the lines describing the steps of the bulk load with their timings.
+        """
+        lines = []
+        if self.spatial_indexes:
+            lines.append(
+                "Deferred the spatial indexes of {} tables (dropped in {:.2f}s, rebuilt in {:.2f}s)".format(
+                    len(self.spatial_indexes),
+                    self.timings.get("disable_spatial_index", 0),
+                    self.timings.get("create_spatial_index", 0),
+                )
+            )
+        time_saved = self.time_saved()
+        if time_saved is not None:
+            lines.append(
+                "Estimated time {} by deferring the spatial indexes: {:.2f}s (maintaining {} index entries on insert ~{:.2f}s)".format(
+                    "saved" if time_saved >= 0 else "lost",
+                    abs(time_saved),
+                    self.index_entries,
+                    self.estimated_index_maintenance,
+                )
+            )
+        if "analyze" in self.timings:
+            lines.append(
+                "Collected the statistics (ANALYZE) in {:.2f}s".format(
+                    self.timings["analyze"]
+                )
+            )
+        if "vacuum" in self.timings:
+            lines.append(
+                "Compacted the file (VACUUM) from {:.1f} MB to {:.1f} MB in {:.2f}s".format(
+                    self.size_before_vacuum / 1024**2,
+                    os.path.getsize(self.dbfile) / 1024**2,
+                    self.timings["vacuum"],
+                )
+            )
+        return lines
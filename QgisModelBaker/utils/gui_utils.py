@@ -4,21 +4,25 @@ import pathlib
 import re
 import warnings
 import xml.etree.ElementTree as CET
+from collections import Counter
 from enum import Enum, IntEnum
 
 from PyQt5.QtWidgets import QApplication
 from qgis.PyQt.QtCore import (
+    QAbstractTableModel,
     QEvent,
     QModelIndex,
     QRect,
     QSortFilterProxyModel,
     QStringListModel,
     Qt,
+    QTimer,
     pyqtSignal,
 )
 from qgis.PyQt.QtGui import QIcon, QStandardItem, QStandardItemModel
 from qgis.PyQt.QtWidgets import (
     QCheckBox,
+    QCompleter,
     QLineEdit,
     QListView,
     QStyle,
@@ -27,8 +31,14 @@ from qgis.PyQt.QtWidgets import (
 )
 from qgis.PyQt.uic import loadUiType
 
-from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import IliCache
+from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import (
+    IliCache,
+    IliDataItemModel,
+)
 from QgisModelBaker.libs.modelbaker.utils.qt_utils import slugify
+from QgisModelBaker.utils.dataset_utils import DatasetStore
+from QgisModelBaker.utils.drop_utils import is_container
+from QgisModelBaker.utils.form_utils import load_form_class
 from QgisModelBaker.utils.globals import CATALOGUE_DATASETNAME
 
 
@@ -210,6 +220,11 @@ def get_ui_class(ui_file):
         os.path.join(os.path.dirname(__file__), os.pardir, "ui", ui_file)
     )
 
+    # the compiled form from the cache saves parsing the XML on every start
+    form_class = load_form_class(ui_file_path, ui_file)
+    if form_class:
+        return form_class
+
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
         return loadUiType(ui_file_path)[0]
@@ -236,6 +251,281 @@ class CompletionLineEdit(QLineEdit):
         self.punched.emit()
 
 
+# roles of the IliDataItemModel the completers search in
+ILIDATA_COMPLETER_ROLES = [
+    Qt.DisplayRole,
+    IliDataItemModel.Roles.ID,
+    IliDataItemModel.Roles.SHORT_DESCRIPTION,
+]
+
+
+class TrigramIndex:
+    """
+    Index of the trigrams of the entries texts to find entries containing (or nearly containing) a search text without scanning all of them.
+    The entries are identified by a key and can consist of multiple texts (e.g. name, id and description).
+    """
+
+    def __init__(self, min_score=0.5):
+        # ratio of the trigrams of the search text an entry needs to contain to be a (fuzzy) result
+        self.min_score = min_score
+        # key -> tuple of the casefolded texts
+        self._entries = {}
+        # trigram -> set of keys
+        self._postings = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def trigrams(text):
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    def add(self, key, texts):
+        self.remove(key)
+        folded_texts = tuple(text.casefold() for text in texts if text)
+        self._entries[key] = folded_texts
+        for folded_text in folded_texts:
+            for trigram in self.trigrams(folded_text):
+                self._postings.setdefault(trigram, set()).add(key)
+
+    def remove(self, key):
+        folded_texts = self._entries.pop(key, None)
+        if folded_texts is None:
+            return
+        for folded_text in folded_texts:
+            for trigram in self.trigrams(folded_text):
+                keys = self._postings.get(trigram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._postings[trigram]
+
+    def update(self, entries):
+        """
+        Brings the index to the state of the passed entries (dict with key and texts). Only the entries not indexed yet are added and only the ones not passed anymore are removed.
+        Returns the number of added and removed entries.
+        """
+        removed_keys = [key for key in self._entries if key not in entries]
+        for key in removed_keys:
+            self.remove(key)
+        added_keys = [key for key in entries if key not in self._entries]
+        for key in added_keys:
+            self.add(key, entries[key])
+        return len(added_keys), len(removed_keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._postings.clear()
+
+    def search(self, query):
+        """
+        Returns the keys of the entries matching the query ranked by relevance:
+        Entries with a text starting with the query first, then the ones containing the query and then the fuzzy matches sharing most of the trigrams of the query.
+        """
+        query = query.strip().casefold()
+        if not query:
+            return list(self._entries.keys())
+
+        query_trigrams = self.trigrams(query)
+        if not query_trigrams:
+            # too short for trigrams, but it's cheap to check the entries directly
+            candidates = {
+                key: 1.0
+                for key, folded_texts in self._entries.items()
+                if any(query in folded_text for folded_text in folded_texts)
+            }
+        else:
+            hits = Counter()
+            for trigram in query_trigrams:
+                hits.update(self._postings.get(trigram, ()))
+            candidates = {
+                key: count / len(query_trigrams)
+                for key, count in hits.items()
+                if count / len(query_trigrams) >= self.min_score
+            }
+
+        def rank(key):
+            folded_texts = self._entries[key]
+            if candidates[key] == 1.0:
+                if any(folded_text.startswith(query) for folded_text in folded_texts):
+                    match_type = 0
+                elif any(query in folded_text for folded_text in folded_texts):
+                    match_type = 1
+                else:
+                    match_type = 2
+            else:
+                match_type = 2
+            first_text = folded_texts[0] if folded_texts else ""
+            return (match_type, -candidates[key], len(first_text), first_text)
+
+        return sorted(candidates.keys(), key=rank)
+
+
+class FuzzyFilterProxyModel(QSortFilterProxyModel):
+    """
+    Proxy model filtering and ranking the rows of the source model by a trigram index over the texts of the given roles.
+    The index is updated incrementally whenever the source model changes (e.g. on the refresh of an IliCache).
+    """
+
+    def __init__(self, roles=None, parent=None):
+        super().__init__(parent)
+        self.roles = roles or [Qt.DisplayRole]
+        self.trigram_index = TrigramIndex()
+        # key of every source row
+        self._row_keys = []
+        # number of rows per display text to check exact matches
+        self._display_counts = Counter()
+        self._query = ""
+        # key -> rank or None when not filtered
+        self._ranks = None
+
+        # the changes of the source model are collected and indexed once
+        self._reindex_timer = QTimer(self)
+        self._reindex_timer.setSingleShot(True)
+        self._reindex_timer.setInterval(0)
+        self._reindex_timer.timeout.connect(self.reindex)
+
+    def setSourceModel(self, source_model):
+        if self.sourceModel():
+            for signal in self._source_change_signals(self.sourceModel()):
+                try:
+                    signal.disconnect(self._reindex_timer.start)
+                except TypeError:
+                    pass
+        super().setSourceModel(source_model)
+        if source_model:
+            for signal in self._source_change_signals(source_model):
+                signal.connect(self._reindex_timer.start)
+        self.reindex()
+
+    def _source_change_signals(self, source_model):
+        return [
+            source_model.modelReset,
+            source_model.layoutChanged,
+            source_model.rowsInserted,
+            source_model.rowsRemoved,
+            source_model.dataChanged,
+        ]
+
+    def reindex(self):
+        self._reindex_timer.stop()
+        source_model = self.sourceModel()
+        entries = {}
+        row_keys = []
+        display_counts = Counter()
+        if source_model:
+            for row in range(source_model.rowCount()):
+                index = source_model.index(row, 0)
+                texts = tuple(str(index.data(int(role)) or "") for role in self.roles)
+                entries[texts] = texts
+                row_keys.append(texts)
+                display_counts[str(index.data(Qt.DisplayRole) or "")] += 1
+        self.trigram_index.update(entries)
+        self._row_keys = row_keys
+        self._display_counts = display_counts
+        self.set_query(self._query)
+
+    def set_query(self, query):
+        self._query = query
+        if query.strip():
+            self._ranks = {
+                key: rank for rank, key in enumerate(self.trigram_index.search(query))
+            }
+            self.invalidate()
+            self.sort(0)
+        else:
+            self._ranks = None
+            # keep the order of the source model
+            self.sort(-1)
+            self.invalidate()
+
+    def query(self):
+        return self._query
+
+    def exact_match_count(self, text):
+        if self._reindex_timer.isActive():
+            # the source model changed meanwhile
+            self.reindex()
+        return self._display_counts.get(text, 0)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._ranks is None:
+            return True
+        return (
+            source_row < len(self._row_keys)
+            and self._row_keys[source_row] in self._ranks
+        )
+
+    def lessThan(self, left, right):
+        if self._ranks is None:
+            return left.row() < right.row()
+        return self._ranks.get(self._row_keys[left.row()], 0) < self._ranks.get(
+            self._row_keys[right.row()], 0
+        )
+
+
+class FuzzyCompleter(QCompleter):
+    """
+    Completer showing the ranked fuzzy matches of a FuzzyFilterProxyModel.
+    The search is debounced, so typing fast does not search on every keystroke.
+    """
+
+    def __init__(self, parent, roles=None, delegate=None, delay=150):
+        self.proxy_model = FuzzyFilterProxyModel(roles, parent)
+        super().__init__(self.proxy_model, parent)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        # the proxy model filters, the completer should not do it again
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        if delegate:
+            self.popup().setItemDelegate(delegate)
+
+        self._search_text = ""
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(delay)
+        self._search_timer.timeout.connect(self._search)
+
+    def set_source_model(self, source_model):
+        self.proxy_model.setSourceModel(source_model)
+
+    def search(self, text):
+        """
+        Shows the popup with the entries matching the text. When the text is empty, all the entries are shown immediately.
+        """
+        self._search_text = text
+        if not text:
+            self._search_timer.stop()
+            self._search()
+        else:
+            self._search_timer.start()
+
+    def _search(self):
+        self.proxy_model.set_query(self._search_text)
+        if self.widget() and not self.widget().hasFocus():
+            return
+        row_count = self.proxy_model.rowCount()
+        if (
+            not self._search_text
+            or row_count > 1
+            or (
+                row_count == 1
+                and self.proxy_model.index(0, 0).data(Qt.DisplayRole)
+                != self._search_text
+            )
+        ):
+            self.complete()
+        self.popup().scrollToTop()
+
+    def has_exact_match(self, text):
+        """
+        Returns True when exactly one entry has the text as display text.
+        """
+        return self.proxy_model.exact_match_count(text) == 1
+
+
 class SemiTristateCheckbox(QCheckBox):
     """
     Checkbox that does never get the Qt.PartialCheckState on clicked (by user) but can get the Qt.PartialCheckState by direct setCheckState() (by program)
@@ -261,19 +551,25 @@ class FileDropListView(QListView):
     ValidIniExtensions = ["ini", "INI", "toml", "TOML"]
 
     files_dropped = pyqtSignal(list, list)
+    # directories and zip archives, emitted only when accept_containers is set
+    containers_dropped = pyqtSignal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.setDragDropMode(QListView.InternalMove)
+        self.accept_containers = False
 
     def dragEnterEvent(self, event):
         for url in event.mimeData().urls():
+            local_file = url.toLocalFile()
             if (
-                pathlib.Path(url.toLocalFile()).suffix[1:]
+                pathlib.Path(local_file).suffix[1:]
                 in FileDropListView.ValidExtenstions
                 + FileDropListView.ValidIniExtensions
                 + FileDropListView.ValidXmlExtensions
+                or self.accept_containers
+                and is_container(local_file)
             ):
                 event.acceptProposedAction()
                 break
@@ -285,8 +581,23 @@ class FileDropListView(QListView):
 
         dropped_files.extend(dropped_xml_files)
         self.files_dropped.emit(dropped_files, dropped_ini_files)
+        if self.accept_containers:
+            dropped_containers = self.extractDroppedContainers(event.mimeData().urls())
+            if dropped_containers:
+                self.containers_dropped.emit(dropped_containers)
         event.acceptProposedAction()
 
+    @staticmethod
+    def extractDroppedContainers(url_list):
+        """
+        Returns the dropped directories and zip archives, their content is classified by a DroppedFilesScanner.
+        """
+        return [
+            url.toLocalFile()
+            for url in url_list
+            if url.toLocalFile() and is_container(url.toLocalFile())
+        ]
+
     @staticmethod
     def extractDroppedFiles(url_list):
         dropped_interlis_files = []
@@ -337,6 +648,11 @@ class SourceModel(QStandardItemModel):
     def __init__(self):
         super().__init__()
         self.setColumnCount(3)
+        # (name, type, path) of the sources in the model, counted since a row can be there twice while being moved
+        self._source_keys = Counter()
+        self.rowsInserted.connect(self._index_rows)
+        self.rowsAboutToBeRemoved.connect(self._unindex_rows)
+        self.modelReset.connect(self._source_keys.clear)
 
     def flags(self, index):
         return Qt.ItemIsSelectable | Qt.ItemIsEnabled
@@ -391,23 +707,54 @@ class SourceModel(QStandardItemModel):
             return item.data(int(role))
 
     def add_source(self, name, type, path, origin_info=None):
-        if self._source_in_model(name, type, path):
-            return False
-
-        item = QStandardItem()
-        item.setData(name, int(Qt.DisplayRole))
-        item.setData(name, int(SourceModel.Roles.NAME))
-        item.setData(type, int(SourceModel.Roles.TYPE))
-        item.setData(path, int(SourceModel.Roles.PATH))
-        item.setData(origin_info, int(SourceModel.Roles.ORIGIN_INFO))
-        self.appendRow([item, QStandardItem()])
+        return bool(self.add_sources([(name, type, path, origin_info)]))
 
-        self.print_info.emit(
-            self.tr("Add source {} ({}) {}").format(
-                name, path if path else "repository", origin_info
+    def add_sources(self, sources):
+        """
+        Appends the sources given as (name, type, path, origin_info) tuples with one row insertion and one log entry.
+        Sources already in the model are skipped.
+        Returns the number of added sources.
+        """
+        items = []
+        origin_counts = Counter()
+        keys = set()
+        for name, type, path, origin_info in sources:
+            key = (name, type, path)
+            if key in keys or self._source_in_model(name, type, path):
+                continue
+            keys.add(key)
+
+            item = QStandardItem()
+            item.setData(name, int(Qt.DisplayRole))
+            item.setData(name, int(SourceModel.Roles.NAME))
+            item.setData(type, int(SourceModel.Roles.TYPE))
+            item.setData(path, int(SourceModel.Roles.PATH))
+            item.setData(origin_info, int(SourceModel.Roles.ORIGIN_INFO))
+            items.append(item)
+            origin_counts[origin_info] += 1
+
+        if not items:
+            return 0
+
+        # the other columns get their items on the first setData
+        self.invisibleRootItem().appendRows(items)
+
+        if len(items) == 1:
+            name = items[0].data(int(SourceModel.Roles.NAME))
+            path = items[0].data(int(SourceModel.Roles.PATH))
+            self.print_info.emit(
+                self.tr("Add source {} ({}) {}").format(
+                    name,
+                    path if path else "repository",
+                    items[0].data(int(SourceModel.Roles.ORIGIN_INFO)),
+                )
             )
-        )
-        return True
+        else:
+            for origin_info, count in origin_counts.items():
+                self.print_info.emit(
+                    self.tr("Add {} sources {}").format(count, origin_info)
+                )
+        return len(items)
 
     def setData(self, index, data, role):
         if index.column() == SourceModel.Columns.IS_CATALOGUE:
@@ -425,7 +772,15 @@ class SourceModel(QStandardItemModel):
         return QStandardItemModel.setData(self, index, data, role)
 
     def remove_sources(self, indices):
-        for index in sorted(indices):
+        """
+        Removes the rows of the given indices (of any column) with one row removal per contiguous range and one log entry.
+        """
+        rows = sorted({index.row() for index in indices})
+        if not rows:
+            return
+
+        if len(rows) == 1:
+            index = self.index(rows[0], SourceModel.Columns.SOURCE)
             path = index.data(int(SourceModel.Roles.PATH))
             self.print_info.emit(
                 self.tr("Remove source {} ({})").format(
@@ -433,19 +788,42 @@ class SourceModel(QStandardItemModel):
                     path if path else "repository",
                 )
             )
-            self.removeRow(index.row())
+        else:
+            self.print_info.emit(self.tr("Remove {} sources").format(len(rows)))
 
-    def _source_in_model(self, name, type, path):
-        match_existing = self.match(
-            self.index(0, 0), int(SourceModel.Roles.NAME), name, -1, Qt.MatchExactly
+        # remove from the bottom up, so the rows of the remaining ranges stay valid
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row:
+                ranges[-1][1] = row + 1
+            else:
+                ranges.append([row, row + 1])
+        for first, last in reversed(ranges):
+            self.removeRows(first, last - first)
+
+    def _source_key(self, row):
+        index = self.index(row, SourceModel.Columns.SOURCE)
+        return (
+            index.data(int(SourceModel.Roles.NAME)),
+            index.data(int(SourceModel.Roles.TYPE)),
+            index.data(int(SourceModel.Roles.PATH)),
         )
-        if (
-            match_existing
-            and type == match_existing[0].data(int(SourceModel.Roles.TYPE))
-            and path == match_existing[0].data(int(SourceModel.Roles.PATH))
-        ):
-            return True
-        return False
+
+    def _index_rows(self, parent, first, last):
+        if not parent.isValid():
+            for row in range(first, last + 1):
+                self._source_keys[self._source_key(row)] += 1
+
+    def _unindex_rows(self, parent, first, last):
+        if not parent.isValid():
+            for row in range(first, last + 1):
+                key = self._source_key(row)
+                self._source_keys[key] -= 1
+                if self._source_keys[key] <= 0:
+                    del self._source_keys[key]
+
+    def _source_in_model(self, name, type, path):
+        return (name, type, path) in self._source_keys
 
 
 class ImportModelsModel(SourceModel):
@@ -1072,9 +1450,11 @@ class SchemaBasketsModel(CheckEntriesModel):
         ]
 
 
-class DatasetModel(QStandardItemModel):
+class DatasetModel(QAbstractTableModel):
     """
-    ItemModel providing all the datasets from the database.
+    ItemModel providing the datasets from the database with the number of baskets and objects in it.
+    The datasets are filtered by name on the database and fetched page by page when the view scrolls.
+    The counts are kept per schema until they are invalidated after a write.
     """
 
     class Roles(Enum):
@@ -1084,26 +1464,137 @@ class DatasetModel(QStandardItemModel):
         def __int__(self):
             return self.value
 
-    def __init__(self):
+    class Columns(IntEnum):
+        DATASETNAME = 0
+        BASKETS = 1
+        OBJECTS = 2
+
+    def __init__(self, page_size=DatasetStore.PAGE_SIZE):
         super().__init__()
+        self.page_size = page_size
+        self.filter_text = ""
+        self._store = None
+        self._schema_identificator = None
+        self._datasets = []
+        self._complete = True
+        # schema identificator -> {dataset t_id: (baskets, objects)}
+        self._counts = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._datasets)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(DatasetModel.Columns)
 
     def flags(self, index):
         return Qt.ItemIsSelectable | Qt.ItemIsEnabled
 
-    def refresh_model(self, db_connector=None):
+    def headerData(self, section, orientation, role):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            if section == DatasetModel.Columns.DATASETNAME:
+                return self.tr("Dataset")
+            if section == DatasetModel.Columns.BASKETS:
+                return self.tr("Baskets")
+            if section == DatasetModel.Columns.OBJECTS:
+                return self.tr("Objects")
+
+    def data(self, index, role):
+        if not index.isValid():
+            return None
+        tid, datasetname = self._datasets[index.row()]
+        if role == int(Qt.DisplayRole):
+            if index.column() == DatasetModel.Columns.DATASETNAME:
+                return datasetname
+            counts = self._schema_counts().get(tid, (0, 0))
+            if index.column() == DatasetModel.Columns.BASKETS:
+                return counts[0]
+            if index.column() == DatasetModel.Columns.OBJECTS:
+                return counts[1]
+        elif role == int(Qt.TextAlignmentRole):
+            if index.column() != DatasetModel.Columns.DATASETNAME:
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+        elif role == int(DatasetModel.Roles.DATASETNAME):
+            return datasetname
+        elif role == int(DatasetModel.Roles.TID):
+            return tid
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._complete
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        page = self._store.datasets(
+            self.filter_text,
+            self._datasets[-1][1] if self._datasets else None,
+            self.page_size,
+        )
+        self._complete = len(page) < self.page_size
+        if page:
+            self.beginInsertRows(
+                QModelIndex(),
+                len(self._datasets),
+                len(self._datasets) + len(page) - 1,
+            )
+            self._datasets.extend(page)
+            self.endInsertRows()
+
+    def fetch_until(self, datasetname):
+        """
+        Fetches the pages until the given dataset is loaded or the model is complete and returns its row (or -1).
+        The names are not compared for the ordering here, since the database collation may differ from Python's.
+        """
+        row = 0
+        while True:
+            for row in range(row, len(self._datasets)):
+                if self._datasets[row][1] == datasetname:
+                    return row
+            row = len(self._datasets)
+            if not self.canFetchMore():
+                return -1
+            self.fetchMore()
+
+    def refresh_model(self, db_connector=None, schema_identificator=None):
         self.beginResetModel()
-        self.clear()
-        if db_connector:
-            datasets_info = db_connector.get_datasets_info()
-            for record in datasets_info:
-                if record["datasetname"] == CATALOGUE_DATASETNAME:
-                    continue
-                item = QStandardItem()
-                item.setData(record["datasetname"], int(Qt.DisplayRole))
-                item.setData(record["datasetname"], int(DatasetModel.Roles.DATASETNAME))
-                item.setData(record["t_id"], int(DatasetModel.Roles.TID))
-                self.appendRow(item)
+        self._store = DatasetStore(db_connector) if db_connector else None
+        self._schema_identificator = schema_identificator
+        self._datasets = []
+        self._complete = self._store is None
         self.endResetModel()
+        self.fetchMore()
+        return self.rowCount()
+
+    def set_filter_text(self, filter_text):
+        if filter_text == self.filter_text:
+            return
+        self.filter_text = filter_text
+        self.beginResetModel()
+        self._datasets = []
+        self._complete = self._store is None
+        self.endResetModel()
+        self.fetchMore()
+
+    def clear(self):
+        self.refresh_model()
+
+    def invalidate_counts(self):
+        """
+        Drops the counts of the current schema. To be called after writing baskets or objects.
+        """
+        self._counts.pop(self._schema_identificator, None)
+        if self._datasets:
+            self.dataChanged.emit(
+                self.index(0, DatasetModel.Columns.BASKETS),
+                self.index(len(self._datasets) - 1, DatasetModel.Columns.OBJECTS),
+            )
+
+    def _schema_counts(self):
+        if not self._store:
+            return {}
+        if self._schema_identificator not in self._counts:
+            self._counts[self._schema_identificator] = self._store.counts()
+        return self._counts[self._schema_identificator]
 
 
 class BasketSourceModel(QStandardItemModel):
@@ -0,0 +1,191 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import contextvars
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import uuid
+from contextlib import contextmanager
+
+# the fields every log record is tagged with (when they are set in the log context)
+LOG_CONTEXT_FIELDS = ["plugin_session", "workflow_id", "session_id", "schema", "phase"]
+
+_log_context = contextvars.ContextVar("modelbaker_log_context", default={})
+
+# the QueueHandler and the QueueListener of the running logging pipeline
+_logging_pipeline = None
+
+
+def new_log_id():
+    return uuid.uuid4().hex[:12]
+
+
+def current_log_context():
+    return dict(_log_context.get())
+
+
+def update_log_context(**fields):
+    """
+    Sets the fields in the log context until they are changed again (e.g. the phase of a wizard).
+    Fields set to None are removed.
+    """
+    context = {**_log_context.get(), **fields}
+    _log_context.set({key: value for key, value in context.items() if value})
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Sets the fields in the log context for the records logged within this context (e.g. an ili2db session).
+    """
+    token = _log_context.set(
+        {key: value for key, value in {**_log_context.get(), **fields}.items() if value}
+    )
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class LogContextFilter(logging.Filter):
+    """
+    Tags the records with the fields of the log context.
+    It's added to the QueueHandler, so the fields are taken in the thread logging the record and not in the one writing it.
+    """
+
+    def filter(self, record):
+        context = _log_context.get()
+        for field in LOG_CONTEXT_FIELDS:
+            if getattr(record, field, None) is None:
+                setattr(record, field, context.get(field))
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats a record as a JSON object on a single line.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in LOG_CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    Rotates the log file at midnight and additionally when it would exceed max_bytes.
+    Files rotated on the same day get an incrementing suffix (ModelBaker.log.2026-10-19.1), so they don't replace each other.
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes=10 * 1024 * 1024,
+        when="midnight",
+        backupCount=10,
+        encoding="utf-8",
+    ):
+        super().__init__(
+            filename, when=when, backupCount=backupCount, encoding=encoding
+        )
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.seek(0, os.SEEK_END)
+            return (
+                self.stream.tell() + len(self.format(record)) + len(self.terminator)
+                > self.max_bytes
+            )
+        return False
+
+    def rotation_filename(self, default_name):
+        rotation_filename = super().rotation_filename(default_name)
+        candidate = rotation_filename
+        index = 1
+        while os.path.exists(candidate):
+            candidate = f"{rotation_filename}.{index}"
+            index += 1
+        return candidate
+
+
+def start_logging(
+    log_file_path, level=logging.DEBUG, max_bytes=10 * 1024 * 1024, backup_count=10
+):
+    """
+    Configures the root logger to write JSON lines to the log file without blocking the caller.
+    Logging only puts the records to a queue (QueueHandler) and a QueueListener writes them in its own thread.
+    A running pipeline is stopped first.
+    """
+    global _logging_pipeline
+    stop_logging()
+
+    file_handler = SizedTimedRotatingFileHandler(
+        log_file_path, max_bytes=max_bytes, backupCount=backup_count
+    )
+    file_handler.setFormatter(JsonLinesFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(LogContextFilter())
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(queue_handler)
+    listener.start()
+
+    _logging_pipeline = (queue_handler, listener)
+    update_log_context(plugin_session=new_log_id())
+
+
+def stop_logging():
+    """
+    Writes the records still in the queue and closes the log file.
+    """
+    global _logging_pipeline
+    if not _logging_pipeline:
+        return
+    queue_handler, listener = _logging_pipeline
+    _logging_pipeline = None
+    logging.getLogger().removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
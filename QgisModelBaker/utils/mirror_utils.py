@@ -0,0 +1,429 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import copy
+import datetime
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as CET
+import zipfile
+
+from qgis.PyQt.QtCore import QObject
+
+from QgisModelBaker.utils.repository_utils import (
+    ILIDATA_FILE,
+    ILIMODELS_FILE,
+    BatchDownloader,
+    child_text,
+    is_url,
+    local_name,
+    repository_file,
+    shared_repository_index,
+)
+
+MODEL_CATEGORY = "http://codes.interlis.ch/model/"
+# ilidata ids referenced in metaconfigs, project toppings etc.
+ILIDATA_REFERENCE = re.compile(r"ilidata:([\w.\-]+)")
+
+
+class MirrorBundleError(RuntimeError):
+    pass
+
+
+class MirrorBundleCanceled(MirrorBundleError):
+    pass
+
+
+def offline_model_directories(custom_model_directories, mirror_directory):
+    """
+    Returns the model directories with the repositories replaced by the directory of the mirror.
+    The placeholders like %ILI_FROM_DB or %XTF_DIR are kept.
+    """
+    placeholders = [
+        directory.strip()
+        for directory in (custom_model_directories or "").split(";")
+        if directory.strip().startswith("%")
+    ]
+    return ";".join(placeholders + [mirror_directory])
+
+
+class RepositoryMirror(QObject):
+    """
+    Writes the content of the repositories needed for a set of models into one archive (offline bundle) and imports such an archive as a file-based repository.
+
+    The bundle contains the model files of the models and the models they depend on, the datasets (metaconfigs, toppings, referenced data) categorized for these models
+    and the datasets referenced by them (ilidata:...). Every repository (and subsidiary site) gets its own folder and the ilimodels.xml and ilidata.xml at the root index all of them.
+    The manifest lists every file with its checksum.
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    FORMAT = "qgismodelbaker-offline-repository"
+    FORMAT_VERSION = 1
+
+    def __init__(self, repository_index=None, timeout=30000):
+        super().__init__()
+        self.repository_index = repository_index or shared_repository_index()
+        self.timeout = timeout
+        self._failed = {}
+        self._feedback = None
+
+    def _is_canceled(self):
+        return bool(self._feedback and self._feedback.isCanceled())
+
+    def _check_canceled(self):
+        if self._is_canceled():
+            raise MirrorBundleCanceled(self.tr("Export of the offline bundle canceled"))
+
+    def _set_progress(self, progress):
+        if self._feedback:
+            self._feedback.setProgress(progress)
+
+    def export_bundle(self, repositories, models, archive_path, feedback=None):
+        """
+        Writes the bundle for the models (all models when empty) found in the repositories to the archive and returns the manifest.
+        The feedback (like a QgsTask) gets the progress and is checked for cancelation, what raises a MirrorBundleCanceled.
+        """
+        self._failed = {}
+        self._feedback = feedback
+        self.repository_index.revalidate(repositories, force=True)
+        self.repository_index.wait(self.timeout, self._is_canceled)
+        self._check_canceled()
+        self._set_progress(10)
+        tree = self.repository_index.repository_tree(repositories)
+        prefixes = {repository: f"r{i}" for i, repository in enumerate(tree)}
+
+        model_entries = self._metadata_entries(tree, ILIMODELS_FILE, "ModelMetadata")
+        models_by_name = {}
+        for entry in model_entries:
+            models_by_name.setdefault(child_text(entry[2], "Name"), []).append(entry)
+        selected_models = self._model_closure(models, models_by_name)
+
+        datasets = {}
+        for entry in self._metadata_entries(tree, ILIDATA_FILE, "DatasetMetadata"):
+            # the datasets of the repositories listed first have priority
+            datasets.setdefault(child_text(entry[2], "id"), entry)
+        pending_ids = [
+            dataset_id
+            for dataset_id, entry in datasets.items()
+            if not models
+            or {MODEL_CATEGORY + model for model in selected_models}
+            & set(self._values(entry[2], "categories"))
+        ]
+
+        with tempfile.TemporaryDirectory() as staging_directory:
+            files = {}
+            selected_model_entries = [
+                entry
+                for model in sorted(selected_models)
+                for entry in models_by_name.get(model, [])
+            ]
+            files.update(
+                self._fetch(
+                    [
+                        (prefixes[entry[0]], entry[0], child_text(entry[2], "File"))
+                        for entry in selected_model_entries
+                    ],
+                    staging_directory,
+                )
+            )
+            self._check_canceled()
+            self._set_progress(40)
+
+            progress = 40
+            selected_dataset_ids = []
+            missing_dataset_ids = []
+            while pending_ids:
+                dataset_ids = []
+                for dataset_id in dict.fromkeys(pending_ids):
+                    if dataset_id in selected_dataset_ids + missing_dataset_ids:
+                        continue
+                    if dataset_id in datasets:
+                        dataset_ids.append(dataset_id)
+                    else:
+                        missing_dataset_ids.append(dataset_id)
+                selected_dataset_ids.extend(dataset_ids)
+                fetched_files = self._fetch(
+                    [
+                        (
+                            prefixes[datasets[dataset_id][0]],
+                            datasets[dataset_id][0],
+                            path,
+                        )
+                        for dataset_id in dataset_ids
+                        for path in self._values(
+                            datasets[dataset_id][2], "file", "path"
+                        )
+                    ],
+                    staging_directory,
+                )
+                files.update(fetched_files)
+                self._check_canceled()
+                # the number of rounds of referenced datasets is unknown, so the progress approaches 90
+                progress += (90 - progress) / 2
+                self._set_progress(progress)
+                # the datasets referenced by the fetched ones are needed as well
+                pending_ids = [
+                    dataset_id
+                    for staged_path in fetched_files.values()
+                    for dataset_id in self._ilidata_references(staged_path)
+                ]
+
+            index_files = {
+                ILIMODELS_FILE: self._merged_index(
+                    selected_model_entries, prefixes, "File"
+                ),
+                ILIDATA_FILE: self._merged_index(
+                    [datasets[dataset_id] for dataset_id in selected_dataset_ids],
+                    prefixes,
+                    "path",
+                ),
+            }
+            for index_file, content in index_files.items():
+                if content is None:
+                    continue
+                staged_path = os.path.join(staging_directory, index_file)
+                with open(staged_path, "wb") as f:
+                    f.write(content)
+                files[index_file] = staged_path
+
+            manifest = {
+                "format": self.FORMAT,
+                "format_version": self.FORMAT_VERSION,
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "repositories": {
+                    prefix: repository for repository, prefix in prefixes.items()
+                },
+                "models": sorted(selected_models),
+                "datasets": selected_dataset_ids,
+                "missing_datasets": missing_dataset_ids,
+                "failed": self._failed,
+                "files": {
+                    archive_name: self._file_info(staged_path)
+                    for archive_name, staged_path in sorted(files.items())
+                },
+            }
+
+            with zipfile.ZipFile(
+                archive_path, "w", compression=zipfile.ZIP_DEFLATED
+            ) as archive:
+                archive.writestr(self.MANIFEST_FILE, json.dumps(manifest, indent=2))
+                for archive_name, staged_path in sorted(files.items()):
+                    archive.write(staged_path, archive_name)
+        return manifest
+
+    def import_bundle(self, archive_path, target_directory):
+        """
+        Extracts the bundle to the target directory (to be used as model directory) and returns the manifest.
+        Raises a MirrorBundleError when the archive is not a valid bundle or a file does not match its checksum.
+        """
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                try:
+                    manifest = json.loads(archive.read(self.MANIFEST_FILE))
+                except (KeyError, ValueError):
+                    raise MirrorBundleError(
+                        self.tr("No valid manifest in {}").format(archive_path)
+                    )
+                if (
+                    manifest.get("format") != self.FORMAT
+                    or manifest.get("format_version", 0) > self.FORMAT_VERSION
+                ):
+                    raise MirrorBundleError(
+                        self.tr("{} is not a supported offline bundle").format(
+                            archive_path
+                        )
+                    )
+                # all the files are verified before any is written, so a broken bundle leaves nothing behind
+                target_paths = {}
+                for archive_name, file_info in manifest.get("files", {}).items():
+                    relative_path = self._safe_relative_path(archive_name)
+                    if not relative_path:
+                        raise MirrorBundleError(
+                            self.tr("Invalid path in bundle: {}").format(archive_name)
+                        )
+                    if self._archive_sha256(archive, archive_name) != file_info.get(
+                        "sha256"
+                    ):
+                        raise MirrorBundleError(
+                            self.tr("Checksum mismatch of {}").format(archive_name)
+                        )
+                    target_paths[archive_name] = os.path.join(
+                        target_directory, *relative_path.split("/")
+                    )
+
+                os.makedirs(target_directory, exist_ok=True)
+                for archive_name, target_path in target_paths.items():
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    with archive.open(archive_name) as source, open(
+                        target_path, "wb"
+                    ) as target:
+                        shutil.copyfileobj(source, target)
+                with open(os.path.join(target_directory, self.MANIFEST_FILE), "w") as f:
+                    json.dump(manifest, f, indent=2)
+        except (OSError, KeyError, zipfile.BadZipFile) as e:
+            raise MirrorBundleError(str(e))
+        return manifest
+
+    def _archive_sha256(self, archive, archive_name):
+        checksum = hashlib.sha256()
+        with archive.open(archive_name) as archived_file:
+            for chunk in iter(lambda: archived_file.read(1024 * 1024), b""):
+                checksum.update(chunk)
+        return checksum.hexdigest()
+
+    def _metadata_entries(self, repositories, information_file, metadata_name):
+        # list of tuples (repository, basket element, metadata element, root element)
+        entries = []
+        for repository in repositories:
+            content = self.repository_index.content(repository, information_file)
+            if not content:
+                continue
+            try:
+                root = CET.fromstring(content)
+            except CET.ParseError as e:
+                self._failed[repository_file(repository, information_file)] = str(e)
+                continue
+            for basket in root.iter():
+                for element in basket:
+                    if local_name(element).endswith(f".{metadata_name}"):
+                        entries.append((repository, basket, element, root))
+        return entries
+
+    def _model_closure(self, models, models_by_name):
+        selected_models = set(models or models_by_name.keys())
+        pending_models = list(selected_models)
+        while pending_models:
+            model = pending_models.pop()
+            for entry in models_by_name.get(model, []):
+                for dependency in self._values(entry[2], "dependsOnModel"):
+                    if dependency not in selected_models:
+                        selected_models.add(dependency)
+                        pending_models.append(dependency)
+        return selected_models
+
+    def _values(self, element, container_name, value_name="value"):
+        values = []
+        for container in element.iter():
+            if local_name(container) != container_name:
+                continue
+            for value_element in container.iter():
+                if local_name(value_element) == value_name and value_element.text:
+                    values.append(value_element.text.strip())
+        return values
+
+    def _safe_relative_path(self, path):
+        if not path:
+            return None
+        normalized_path = posixpath.normpath(path.replace("\\", "/"))
+        if normalized_path.startswith(("/", "../")) or normalized_path in [".", ".."]:
+            return None
+        return normalized_path
+
+    def _fetch(self, files, staging_directory):
+        """
+        Copies or downloads the files (tuples of prefix, repository and relative path) to the staging directory.
+        Returns a dict with the archive name as key and the staged path as value.
+        """
+        staged_files = {}
+        downloads = []
+        for prefix, repository, relative_path in files:
+            safe_path = self._safe_relative_path(relative_path)
+            location = repository_file(repository, relative_path or "")
+            if not safe_path:
+                self._failed[location] = self.tr("Path outside of the repository")
+                continue
+            archive_name = f"{prefix}/{safe_path}"
+            if archive_name in staged_files:
+                continue
+            staged_path = os.path.join(staging_directory, *archive_name.split("/"))
+            if is_url(repository):
+                downloads.append((archive_name, location, staged_path))
+            else:
+                try:
+                    os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+                    shutil.copyfile(location, staged_path)
+                    staged_files[archive_name] = staged_path
+                except OSError as e:
+                    self._failed[location] = str(e)
+
+        downloader = BatchDownloader()
+        download_locations = {key: url for key, url, _ in downloads}
+        downloader.failed.connect(
+            lambda key, error: self._failed.__setitem__(
+                download_locations.get(key, key), error
+            )
+        )
+        staged_files.update(downloader.run(downloads, self.timeout, self._is_canceled))
+        return staged_files
+
+    def _ilidata_references(self, staged_path):
+        try:
+            with open(staged_path, "rb") as f:
+                content = f.read().decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            # binary files (like geopackages) do not reference datasets
+            return []
+        return ILIDATA_REFERENCE.findall(content)
+
+    def _merged_index(self, entries, prefixes, path_name):
+        """
+        Returns one index file (bytes) with the metadata elements of all the repositories.
+        The paths are prefixed with the folder of their repository in the bundle.
+        """
+        if not entries:
+            return None
+        first_root = entries[0][3]
+        namespace = first_root.tag[1:].split("}")[0] if "}" in first_root.tag else ""
+        if namespace:
+            CET.register_namespace("", namespace)
+        root = CET.Element(first_root.tag)
+        for element in first_root:
+            if local_name(element) == "HEADERSECTION":
+                root.append(copy.deepcopy(element))
+        data_section = CET.SubElement(
+            root, f"{{{namespace}}}DATASECTION" if namespace else "DATASECTION"
+        )
+        baskets = {}
+        for repository, basket, element, _ in entries:
+            if basket.tag not in baskets:
+                baskets[basket.tag] = CET.SubElement(
+                    data_section, basket.tag, BID=f"b{len(baskets) + 1}"
+                )
+            merged_element = copy.deepcopy(element)
+            prefix = prefixes[repository]
+            if merged_element.get("TID"):
+                merged_element.set("TID", f"{prefix}.{merged_element.get('TID')}")
+            for path_element in merged_element.iter():
+                if local_name(path_element) == path_name and path_element.text:
+                    path_element.text = f"{prefix}/{path_element.text.strip()}"
+            baskets[basket.tag].append(merged_element)
+        return CET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    def _file_info(self, staged_path):
+        with open(staged_path, "rb") as f:
+            content = f.read()
+        return {
+            "sha256": hashlib.sha256(content).hexdigest(),
+            "size": len(content),
+        }
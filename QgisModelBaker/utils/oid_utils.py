@@ -0,0 +1,208 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import re
+
+# the prefix in the default value expression of a STANDARDOID like "'ch100000' || lpad( T_Id, 8, 0 )"
+STANDARDOID_PREFIX_EXPRESSION = re.compile(r"^\s*'([^']{8})'\s*\|\|")
+
+# UUID version 4 with the functions of SQLite
+SQLITE_UUID = (
+    "lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || substr(hex(randomblob(2)), 2) || '-' "
+    "|| substr('89ab', 1 + (abs(random()) % 4), 1) || substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)))"
+)
+
+
+class OidBackfillError(RuntimeError):
+    pass
+
+
+def uuid_expression(dialect, connection=None):
+    """
+    Returns the SQL expression of a new UUID (as text) in the dialect ("postgres", "gpkg" or "mssql").
+    """
+    if dialect == OidBackfiller.POSTGRES:
+        # gen_random_uuid is a core function since PostgreSQL 13, before the uuid-ossp extension (as used by ili2pg) is needed
+        if getattr(connection, "server_version", 0) >= 130000:
+            return "CAST(gen_random_uuid() AS text)"
+        return "CAST(uuid_generate_v4() AS text)"
+    if dialect == OidBackfiller.MSSQL:
+        return "LOWER(CONVERT(nvarchar(36), NEWID()))"
+    return SQLITE_UUID
+
+
+def text_expression(dialect, expression):
+    """
+    Returns the SQL expression casting the (integer) expression to text.
+    """
+    if dialect == OidBackfiller.MSSQL:
+        return f"CONVERT(nvarchar(20), {expression})"
+    return f"CAST({expression} AS text)"
+
+
+def standardoid_expression(dialect, prefix, tid):
+    """
+    Returns the SQL expression of a STANDARDOID out of the prefix expression and the t_id padded to 8 chars.
+    """
+    if dialect == OidBackfiller.POSTGRES:
+        return f"{prefix} || lpad(CAST({tid} AS text), 8, '0')"
+    if dialect == OidBackfiller.MSSQL:
+        return f"{prefix} + RIGHT('00000000' + CONVERT(nvarchar(20), {tid}), 8)"
+    return f"{prefix} || substr('00000000' || {tid}, -8, 8)"
+
+
+def anyoid_expression(dialect, connection=None):
+    """
+    Returns the SQL expression of a new OID of any other domain: an underscore (to be a valid XML ID) and a UUID.
+    """
+    concat = "+" if dialect == OidBackfiller.MSSQL else "||"
+    return f"'_' {concat} {uuid_expression(dialect, connection)}"
+
+
+def oid_kind(oid_domain):
+    """
+    Returns the kind of the OID domain (UUIDOID, STANDARDOID, I32OID or ANYOID for all the others).
+    """
+    for kind in ["UUIDOID", "STANDARDOID", "I32OID"]:
+        if oid_domain and oid_domain.endswith(kind):
+            return kind
+    return "ANYOID"
+
+
+def standardoid_prefix(default_value_expression):
+    """
+    Returns the 8 char prefix of the STANDARDOID default value expression or None if there is none.
+    """
+    match = STANDARDOID_PREFIX_EXPRESSION.match(default_value_expression or "")
+    return match.group(1) if match else None
+
+
+class OidBackfillTable:
+    """
+    A table with an OID column to fill.
+    """
+
+    def __init__(self, name, schema, table, oid_domain, prefix=None):
+        self.name = name
+        self.schema = schema
+        self.table = table
+        self.oid_kind = oid_kind(oid_domain)
+        self.prefix = prefix
+
+
+class OidBackfiller:
+    """
+    Fills the missing OIDs (t_ili_tid is NULL) of tables in one database with one UPDATE statement per table, so there is no need to edit the features in QGIS.
+
+    The values follow the default value expressions Model Baker sets on the layers:
+    - UUIDOID: a UUID
+    - STANDARDOID: the prefix and the t_id padded to 8 chars
+    - I32OID: the t_id
+    - any other: an underscore and a UUID
+    All the tables are filled in one transaction. On a dry run only the missing OIDs are counted.
+    """
+
+    POSTGRES = "postgres"
+    GPKG = "gpkg"
+    MSSQL = "mssql"
+
+    def __init__(self, connection, dialect, tid_column="t_id", oid_column="t_ili_tid"):
+        if dialect not in [self.POSTGRES, self.GPKG, self.MSSQL]:
+            raise OidBackfillError(f"Filling OIDs is not supported for {dialect}.")
+        self.connection = connection
+        self.dialect = dialect
+        self.tid_column = tid_column
+        self.oid_column = oid_column
+
+    def _quote(self, name):
+        if self.dialect == self.MSSQL:
+            return "[{}]".format(name.replace("]", "]]"))
+        return '"{}"'.format(name.replace('"', '""'))
+
+    def _table_name(self, table):
+        if table.schema and self.dialect != self.GPKG:
+            return f"{self._quote(table.schema)}.{self._quote(table.table)}"
+        return self._quote(table.table)
+
+    def value_expression(self, table):
+        """
+        Returns the SQL expression of the new OID and its parameters.
+        """
+        tid = self._quote(self.tid_column)
+        if table.oid_kind == "UUIDOID":
+            return uuid_expression(self.dialect, self.connection), []
+        if table.oid_kind == "I32OID":
+            return text_expression(self.dialect, tid), []
+        if table.oid_kind == "STANDARDOID":
+            if not table.prefix:
+                raise OidBackfillError(
+                    f"No STANDARDOID prefix defined for {table.name}."
+                )
+            placeholder = "%s" if self.dialect == self.POSTGRES else "?"
+            return standardoid_expression(self.dialect, placeholder, tid), [
+                table.prefix
+            ]
+        return anyoid_expression(self.dialect, self.connection), []
+
+    def statements(self, table):
+        """
+        Returns the statement counting the missing OIDs, the statement filling them and the parameters of the latter.
+        """
+        table_name = self._table_name(table)
+        oid = self._quote(self.oid_column)
+        value_expression, parameters = self.value_expression(table)
+        count_statement = f"SELECT COUNT(*) FROM {table_name} WHERE {oid} IS NULL"
+        update_statement = (
+            f"UPDATE {table_name} SET {oid} = {value_expression} WHERE {oid} IS NULL"
+        )
+        return count_statement, update_statement, parameters
+
+    def run(self, tables, dry_run=False):
+        """
+        Returns a dict with the table names and the number of missing (or filled) OIDs.
+        Raises an OidBackfillError and rolls back everything when a statement fails.
+        """
+        missing_oids = {}
+        cursor = self.connection.cursor()
+        try:
+            for table in tables:
+                count_statement, update_statement, parameters = self.statements(table)
+                cursor.execute(count_statement)
+                missing_oids[table.name] = cursor.fetchone()[0]
+                if not dry_run and missing_oids[table.name]:
+                    cursor.execute(update_statement, parameters)
+            if dry_run:
+                self.connection.rollback()
+            else:
+                self.connection.commit()
+        except OidBackfillError:
+            self.connection.rollback()
+            raise
+        except Exception as e:
+            self.connection.rollback()
+            raise OidBackfillError(str(e))
+        finally:
+            cursor.close()
+        return missing_oids
+
+    def close(self):
+        """
+        Closes the connection, the backfiller can't be run anymore.
+        """
+        self.connection.close()
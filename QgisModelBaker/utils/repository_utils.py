@@ -0,0 +1,625 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+import json
+import os
+import time
+import xml.etree.ElementTree as CET
+from urllib.parse import urljoin, urlsplit
+
+from qgis.core import QgsNetworkAccessManager
+from qgis.PyQt.QtCore import QEventLoop, QObject, QSettings, QTimer, QUrl, pyqtSignal
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
+
+from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import IliCache
+
+DEFAULT_REPOSITORY = "http://models.interlis.ch/"
+
+ILIMODELS_FILE = "ilimodels.xml"
+ILIDATA_FILE = "ilidata.xml"
+ILISITE_FILE = "ilisite.xml"
+
+
+def repository_directories(base_configuration):
+    """
+    Returns the repositories (urls or local directories) configured in the base configuration.
+    Placeholders like %ILI_FROM_DB or %XTF_DIR are not repositories and skipped.
+    """
+    directories = [DEFAULT_REPOSITORY]
+    if (
+        base_configuration
+        and base_configuration.custom_model_directories_enabled
+        and base_configuration.custom_model_directories
+    ):
+        directories = base_configuration.custom_model_directories.split(";")
+    return [
+        directory.strip()
+        for directory in directories
+        if directory.strip() and not directory.strip().startswith("%")
+    ]
+
+
+def is_url(repository):
+    return urlsplit(repository).scheme in ["http", "https"]
+
+
+def repository_file(repository, relative_path):
+    """
+    Returns the url or the local path of a file in the repository.
+    """
+    if is_url(repository):
+        return urljoin(
+            repository if repository.endswith("/") else f"{repository}/", relative_path
+        )
+    return os.path.join(repository, relative_path)
+
+
+def local_name(element):
+    return element.tag.rsplit("}", 1)[-1]
+
+
+def child_text(element, name):
+    for child in element:
+        if local_name(child) == name:
+            return (child.text or "").strip()
+    return None
+
+
+def parse_ilidata(content):
+    """
+    Parses an ilidata.xml (DatasetIdx16) and returns a dict with the dataset id as key and the relative path of the first file as value.
+    """
+    datasets = {}
+    root = CET.fromstring(content)
+    for element in root.iter():
+        if local_name(element) != "DatasetIdx16.DataIndex.DatasetMetadata":
+            continue
+        dataset_id = child_text(element, "id")
+        if not dataset_id or dataset_id in datasets:
+            continue
+        for path_element in element.iter():
+            if local_name(path_element) == "path" and path_element.text:
+                datasets[dataset_id] = path_element.text.strip()
+                break
+    return datasets
+
+
+def parse_ilisite(content):
+    """
+    Parses an ilisite.xml (IliSite09) and returns the locations of the subsidiary sites.
+    """
+    sites = []
+    root = CET.fromstring(content)
+    for element in root.iter():
+        if local_name(element) != "subsidiarySite":
+            continue
+        for value_element in element.iter():
+            if local_name(value_element) == "value" and value_element.text:
+                sites.append(value_element.text.strip())
+    return sites
+
+
+def cancel_timer(loop, is_canceled, interval=100):
+    """
+    Returns a started timer quitting the event loop as soon as is_canceled returns True (None when there is nothing to check).
+    The timer has to be kept while the loop runs.
+    """
+    if not is_canceled:
+        return None
+    timer = QTimer()
+    timer.timeout.connect(lambda: is_canceled() and loop.quit())
+    timer.start(interval)
+    return timer
+
+
+class BatchDownloader(QObject):
+    """
+    Downloads a batch of files concurrently with the QGIS network access manager.
+    The requests are all started at once, so they share the (keep-alive) connections per host the network access manager keeps open.
+    Waits for all of them in one single event loop instead of one loop per file.
+    """
+
+    # key, bytes received, bytes total
+    progress = pyqtSignal(str, int, int)
+    # key, local file path or empty string for in-memory downloads
+    succeeded = pyqtSignal(str, str)
+    # key, error message
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._replies = {}
+
+    def run(self, downloads, timeout=30000, is_canceled=None):
+        """
+        :param downloads: list of tuples (key, url, target file path). When the target file path is None, the content is kept in memory.
+        :param timeout: milliseconds until the downloads not finished are aborted
+        :param is_canceled: optional function returning True when the downloads not finished have to be aborted
+        :return: dict with the key and as value the file path or the content (bytes) of the successful downloads
+        """
+        results = {}
+        if not downloads:
+            return results
+
+        loop = QEventLoop()
+        network_access_manager = QgsNetworkAccessManager.instance()
+        for key, url, target_path in downloads:
+            request = QNetworkRequest(QUrl(url))
+            request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+            reply = network_access_manager.get(request)
+            reply.downloadProgress.connect(
+                lambda received, total, key=key: self.progress.emit(
+                    key, received, total
+                )
+            )
+            reply.finished.connect(
+                lambda key=key, reply=reply, target_path=target_path: self._finished(
+                    key, reply, target_path, results, loop
+                )
+            )
+            self._replies[key] = reply
+
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(loop.quit)
+        timer.start(timeout)
+        canceled_timer = cancel_timer(loop, is_canceled)
+
+        if self._replies:
+            loop.exec()
+
+        # abort what did not finish in time
+        error = (
+            self.tr("Canceled")
+            if canceled_timer and is_canceled()
+            else self.tr("Timeout")
+        )
+        for key, reply in list(self._replies.items()):
+            reply.finished.disconnect()
+            reply.abort()
+            reply.deleteLater()
+            self.failed.emit(key, error)
+        self._replies = {}
+        return results
+
+    def _finished(self, key, reply, target_path, results, loop):
+        self._replies.pop(key, None)
+        if reply.error() == QNetworkReply.NoError:
+            content = bytes(reply.readAll())
+            if target_path:
+                try:
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    with open(target_path, "wb") as target_file:
+                        target_file.write(content)
+                    results[key] = target_path
+                    self.succeeded.emit(key, target_path)
+                except OSError as e:
+                    self.failed.emit(key, str(e))
+            else:
+                results[key] = content
+                self.succeeded.emit(key, "")
+        else:
+            self.failed.emit(key, reply.errorString())
+        reply.deleteLater()
+
+        if not self._replies:
+            loop.quit()
+
+
+class RepositoryIndex(QObject):
+    """
+    Persistent index of the information files (ilimodels.xml, ilidata.xml and ilisite.xml) of the repositories and their subsidiary sites.
+
+    The files are stored on disk together with their ETag and Last-Modified header. Files checked within the ttl are considered fresh,
+    older ones are revalidated with conditional requests, so unchanged files are not downloaded again. The subsidiary sites of one level are fetched in parallel.
+    The revalidation runs in the background and meanwhile the stored (possibly stale) files are served.
+    """
+
+    INDEX_FILE = "repository_index.json"
+    INFORMATION_FILES = [ILIMODELS_FILE, ILIDATA_FILE, ILISITE_FILE]
+    DEFAULT_TTL = 3600
+
+    # the repositories with changed information files (files loaded for the first time are no change)
+    revalidated = pyqtSignal(list)
+    # location of the file, error message
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, cache_path=None, ttl=None, timeout=30000, parent=None):
+        super().__init__(parent)
+        self.cache_path = cache_path or os.path.join(
+            IliCache.CACHE_PATH, "repository_index"
+        )
+        # seconds a checked file is considered fresh
+        self.ttl = (
+            ttl
+            if ttl is not None
+            else QSettings().value(
+                "QgisModelBaker/repository_index_ttl", self.DEFAULT_TTL, int
+            )
+        )
+        self.timeout = timeout
+        # location -> dict with repository, file, etag, last_modified, checked and sha1
+        self._entries = self._load_entries()
+        # (location, sha1) -> parsed content
+        self._parsed = {}
+
+        self._replies = {}
+        self._running_repositories = None
+        self._changed_repositories = []
+        self._visited_repositories = set()
+        self._timeout_timer = QTimer(self)
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.timeout.connect(self._abort)
+
+    def _index_file_path(self):
+        return os.path.join(self.cache_path, self.INDEX_FILE)
+
+    def _load_entries(self):
+        try:
+            with open(self._index_file_path()) as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_entries(self):
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            with open(self._index_file_path(), "w") as index_file:
+                json.dump(self._entries, index_file)
+        except OSError as e:
+            self.failed.emit(self._index_file_path(), str(e))
+
+    def clear(self):
+        self._abort()
+        self._entries = {}
+        self._parsed = {}
+        try:
+            os.remove(self._index_file_path())
+        except OSError:
+            pass
+
+    def stored_file(self, repository, information_file):
+        """
+        Returns the path of the stored (or local) information file of the repository or None if there is none.
+        It does not wait for a running revalidation.
+        """
+        location = repository_file(repository, information_file)
+        if not is_url(repository):
+            return location if os.path.isfile(location) else None
+        entry = self._entries.get(location)
+        if not entry or not entry.get("file"):
+            return None
+        path = os.path.join(self.cache_path, entry["file"])
+        return path if os.path.isfile(path) else None
+
+    def content(self, repository, information_file):
+        """
+        Returns the stored content (bytes) of the information file of the repository or None if there is none.
+        It does not wait for a running revalidation.
+        """
+        path = self.stored_file(repository, information_file)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as stored_file:
+                return stored_file.read()
+        except OSError:
+            return None
+
+    def _content_version(self, repository, information_file):
+        location = repository_file(repository, information_file)
+        if is_url(repository):
+            entry = self._entries.get(location)
+            return entry.get("sha1") if entry else None
+        try:
+            return os.stat(location).st_mtime_ns
+        except OSError:
+            return None
+
+    def _parsed_content(self, repository, information_file, parser):
+        location = repository_file(repository, information_file)
+        version = self._content_version(repository, information_file)
+        if version is None:
+            return None
+        key = (location, version)
+        if key not in self._parsed:
+            content = self.content(repository, information_file)
+            parsed = None
+            if content:
+                try:
+                    parsed = parser(content)
+                except CET.ParseError as e:
+                    self.failed.emit(location, str(e))
+            self._parsed[key] = parsed
+        return self._parsed[key]
+
+    def subsidiary_sites(self, repository):
+        return [
+            site
+            if is_url(site) or os.path.isabs(site)
+            else repository_file(repository, site)
+            for site in self._parsed_content(repository, ILISITE_FILE, parse_ilisite)
+            or []
+        ]
+
+    def repository_tree(self, repositories):
+        """
+        Returns the repositories and all their (known) subsidiary sites, level by level.
+        """
+        tree = []
+        level = list(repositories)
+        while level:
+            level = [
+                repository
+                for repository in dict.fromkeys(level)
+                if repository not in tree
+            ]
+            tree.extend(level)
+            level = [
+                site
+                for repository in level
+                for site in self.subsidiary_sites(repository)
+            ]
+        return tree
+
+    def ilidata_index(self, repositories):
+        """
+        Returns a dict with the dataset id as key and the tuple (repository, relative path) as value.
+        The datasets of the repositories listed first have priority.
+        """
+        index = {}
+        for repository in self.repository_tree(repositories):
+            for dataset_id, relative_path in (
+                self._parsed_content(repository, ILIDATA_FILE, parse_ilidata) or {}
+            ).items():
+                index.setdefault(dataset_id, (repository, relative_path))
+        return index
+
+    def is_fresh(self, repositories):
+        """
+        Returns True when all the information files of the repositories (and their known subsidiary sites) are checked within the ttl.
+        """
+        now = time.time()
+        for repository in self.repository_tree(repositories):
+            if not is_url(repository):
+                continue
+            for information_file in self.INFORMATION_FILES:
+                entry = self._entries.get(repository_file(repository, information_file))
+                if not entry or now - entry.get("checked", 0) > self.ttl:
+                    return False
+        return True
+
+    def has_content(self, repositories):
+        """
+        Returns True when the information files of the repositories have been loaded before (even if they are stale now).
+        """
+        return all(
+            not is_url(repository)
+            or any(
+                repository_file(repository, information_file) in self._entries
+                for information_file in self.INFORMATION_FILES
+            )
+            for repository in repositories
+        )
+
+    def is_running(self):
+        return self._running_repositories is not None
+
+    def revalidate(self, repositories, force=False):
+        """
+        Starts the revalidation of the repositories in the background. Files checked within the ttl are skipped unless force is set.
+        Emits revalidated when finished.
+        """
+        repositories = list(repositories)
+        if self.is_running():
+            if self._running_repositories == repositories:
+                return
+            self._abort()
+        self._running_repositories = repositories
+        self._force = force
+        self._changed_repositories = []
+        self._visited_repositories = set()
+        self._timeout_timer.start(self.timeout)
+        self._start_level(repositories)
+
+    def wait(self, timeout=None, is_canceled=None):
+        """
+        Waits for the running revalidation. Returns False when it did not finish in time.
+        When is_canceled returns True, the revalidation is aborted.
+        """
+        if not self.is_running():
+            return True
+        loop = QEventLoop()
+        self.revalidated.connect(loop.quit)
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(loop.quit)
+        timer.start(timeout or self.timeout)
+        canceled_timer = cancel_timer(loop, is_canceled)
+        loop.exec()
+        self.revalidated.disconnect(loop.quit)
+        if canceled_timer and is_canceled():
+            self._abort()
+            return False
+        return not self.is_running()
+
+    def _start_level(self, level):
+        level = [
+            repository
+            for repository in dict.fromkeys(level)
+            if repository not in self._visited_repositories
+        ]
+        self._visited_repositories.update(level)
+        self._level = level
+
+        now = time.time()
+        network_access_manager = QgsNetworkAccessManager.instance()
+        for repository in level:
+            for information_file in self.INFORMATION_FILES:
+                location = repository_file(repository, information_file)
+                entry = self._entries.get(location)
+                if not is_url(repository):
+                    self._check_local_file(repository, location)
+                    continue
+                if (
+                    entry
+                    and not self._force
+                    and now - entry.get("checked", 0) <= self.ttl
+                ):
+                    continue
+                request = QNetworkRequest(QUrl(location))
+                request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+                # the validators are handled here and not by the cache of the network access manager
+                request.setAttribute(
+                    QNetworkRequest.CacheLoadControlAttribute,
+                    QNetworkRequest.AlwaysNetwork,
+                )
+                request.setAttribute(QNetworkRequest.CacheSaveControlAttribute, False)
+                if entry and entry.get("file"):
+                    if entry.get("etag"):
+                        request.setRawHeader(
+                            b"If-None-Match", entry["etag"].encode("latin-1")
+                        )
+                    if entry.get("last_modified"):
+                        request.setRawHeader(
+                            b"If-Modified-Since",
+                            entry["last_modified"].encode("latin-1"),
+                        )
+                reply = network_access_manager.get(request)
+                reply.finished.connect(
+                    lambda repository=repository, location=location, reply=reply: self._reply_finished(
+                        repository, location, reply
+                    )
+                )
+                self._replies[location] = reply
+
+        if not self._replies:
+            self._level_finished()
+
+    def _check_local_file(self, repository, location):
+        # local repositories are read directly, only the modification time is kept to detect changes
+        try:
+            last_modified = str(os.stat(location).st_mtime_ns)
+        except OSError:
+            last_modified = None
+        entry = self._entries.get(location)
+        if entry and entry.get("last_modified") != last_modified:
+            self._changed(repository)
+        self._entries[location] = {
+            "repository": repository,
+            "file": None,
+            "last_modified": last_modified,
+            "checked": time.time(),
+        }
+
+    def _reply_finished(self, repository, location, reply):
+        self._replies.pop(location, None)
+        entry = self._entries.get(location)
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status == 304 and entry:
+            entry["checked"] = time.time()
+        elif reply.error() == QNetworkReply.NoError:
+            content = bytes(reply.readAll())
+            sha1 = hashlib.sha1(content).hexdigest()
+            file_name = "{}.xml".format(
+                hashlib.sha1(location.encode("utf-8")).hexdigest()
+            )
+            try:
+                os.makedirs(self.cache_path, exist_ok=True)
+                with open(os.path.join(self.cache_path, file_name), "wb") as f:
+                    f.write(content)
+                if entry and entry.get("sha1") not in [None, sha1]:
+                    self._changed(repository)
+                self._entries[location] = {
+                    "repository": repository,
+                    "file": file_name,
+                    "etag": self._raw_header(reply, b"ETag"),
+                    "last_modified": self._raw_header(reply, b"Last-Modified"),
+                    "checked": time.time(),
+                    "sha1": sha1,
+                }
+            except OSError as e:
+                self.failed.emit(location, str(e))
+        elif reply.error() == QNetworkReply.ContentNotFoundError:
+            # not every repository provides every information file
+            if entry and entry.get("file"):
+                self._changed(repository)
+            self._entries[location] = {
+                "repository": repository,
+                "file": None,
+                "checked": time.time(),
+            }
+        else:
+            # keep serving the stored file
+            self.failed.emit(location, reply.errorString())
+        reply.deleteLater()
+
+        if not self._replies:
+            self._level_finished()
+
+    def _raw_header(self, reply, name):
+        if reply.hasRawHeader(name):
+            return bytes(reply.rawHeader(name)).decode("latin-1")
+        return None
+
+    def _changed(self, repository):
+        if repository not in self._changed_repositories:
+            self._changed_repositories.append(repository)
+
+    def _level_finished(self):
+        next_level = [
+            site
+            for repository in self._level
+            for site in self.subsidiary_sites(repository)
+        ]
+        if next_level and self.is_running():
+            self._start_level(next_level)
+            return
+        self._finish()
+
+    def _abort(self):
+        if not self.is_running():
+            return
+        for location, reply in list(self._replies.items()):
+            reply.finished.disconnect()
+            reply.abort()
+            reply.deleteLater()
+            self.failed.emit(location, self.tr("Timeout"))
+        self._replies = {}
+        self._finish()
+
+    def _finish(self):
+        self._timeout_timer.stop()
+        self._running_repositories = None
+        self._save_entries()
+        self.revalidated.emit(list(self._changed_repositories))
+
+
+_shared_repository_index = None
+
+
+def shared_repository_index():
+    """
+    Returns the repository index shared by the wizards of the session.
+    """
+    global _shared_repository_index
+    if _shared_repository_index is None:
+        _shared_repository_index = RepositoryIndex()
+    return _shared_repository_index
@@ -0,0 +1,406 @@
+"""
+/***************************************************************************
+                              -------------------
+        begin                : 19.10.2026
+        git sha              : :%H$
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from qgis.PyQt.QtCore import QObject, pyqtSignal
+from qgis.PyQt.QtXml import QDomDocument
+
+from QgisModelBaker.libs.modelbaker.iliwrapper.ilicache import IliToppingFileCache
+from QgisModelBaker.utils.repository_utils import (
+    ILIDATA_FILE,
+    BatchDownloader,
+    is_url,
+    repository_directories,
+    repository_file,
+    shared_repository_index,
+)
+
+
+class QmlStyleCache:
+    """
+    Keeps the parsed QML documents by the hash of their content.
+    The same QML topping is often used for multiple layers (and in multiple projects), so it's parsed only once.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._documents = OrderedDict()
+        # to avoid hashing an unchanged file again: (path, mtime, size) -> content hash
+        self._file_hashes = {}
+
+    def document(self, style_file_path):
+        """
+        Returns the QDomDocument of the QML file and an error message (empty when successful).
+        """
+        try:
+            stat = os.stat(style_file_path)
+        except OSError as e:
+            return None, str(e)
+
+        file_key = (style_file_path, stat.st_mtime_ns, stat.st_size)
+        content_hash = self._file_hashes.get(file_key)
+        if content_hash is None or content_hash not in self._documents:
+            with open(style_file_path, "rb") as style_file:
+                content = style_file.read()
+            content_hash = hashlib.sha1(content).hexdigest()
+            self._file_hashes[file_key] = content_hash
+            if content_hash not in self._documents:
+                document = QDomDocument("qgis")
+                success, error_msg, error_line, error_column = document.setContent(
+                    content
+                )
+                if not success:
+                    return None, "{} (line {}, column {})".format(
+                        error_msg, error_line, error_column
+                    )
+                self._documents[content_hash] = document
+                if len(self._documents) > self.max_entries:
+                    self._documents.popitem(last=False)
+
+        self._documents.move_to_end(content_hash)
+        return self._documents[content_hash], ""
+
+    def clear(self):
+        self._documents.clear()
+        self._file_hashes.clear()
+
+
+# shared over all the project generations of the session
+qml_style_cache = QmlStyleCache()
+
+
+def apply_qml_styles(layer_styles, canvas=None):
+    """
+    Applies QML files to layers in one batch.
+    The map canvas is frozen while applying, so there is one single repaint at the end instead of one per style.
+
+    :param layer_styles: list of tuples (QgsMapLayer, style file path)
+    :param canvas: the map canvas to freeze
+    :return: list of tuples (QgsMapLayer, style file path, error message) of the styles that could not be applied
+    """
+    failed_styles = []
+    if canvas:
+        canvas.freeze(True)
+    try:
+        for layer, style_file_path in layer_styles:
+            document, error_msg = qml_style_cache.document(style_file_path)
+            if document is not None:
+                success, error_msg = layer.importNamedStyle(document)
+                if success:
+                    layer.emitStyleChanged()
+                    continue
+            failed_styles.append((layer, style_file_path, error_msg))
+    finally:
+        if canvas:
+            canvas.freeze(False)
+            canvas.refresh()
+    return failed_styles
+
+
+class ToppingFileResolver(QObject):
+    """
+    Resolves the ilidata ids of topping files to local files.
+    All the ids are resolved with one lookup in the ilidata index (ilidata.xml of the repositories and their subsidiary sites kept in the RepositoryIndex)
+    and the files are downloaded concurrently in one batch.
+    The resolved files are kept, so the same id is not resolved twice.
+    """
+
+    ILIDATA_PREFIX = "ilidata:"
+
+    # topping id, bytes received, bytes total
+    file_progress = pyqtSignal(str, int, int)
+    # topping id, local file path
+    file_resolved = pyqtSignal(str, str)
+    # topping id, error message
+    file_failed = pyqtSignal(str, str)
+
+    def __init__(
+        self, base_configuration, cache_path=None, timeout=30000, repository_index=None
+    ):
+        super().__init__()
+        self.base_configuration = base_configuration
+        self.cache_path = cache_path or IliToppingFileCache.CACHE_PATH
+        self.timeout = timeout
+        self.repository_index = repository_index or shared_repository_index()
+        self.repository_index.failed.connect(self.file_failed)
+        # topping id -> local file path
+        self._resolved_files = {}
+
+        self.downloader = BatchDownloader(self)
+        self.downloader.progress.connect(self.file_progress)
+        self.downloader.succeeded.connect(self.file_resolved)
+        self.downloader.failed.connect(self.file_failed)
+
+    def resolve(self, topping_ids):
+        """
+        Returns a dict with the topping ids that could be resolved as keys and the local file paths as values.
+        """
+        missing_ids = [
+            topping_id
+            for topping_id in dict.fromkeys(topping_ids)
+            if topping_id
+            and topping_id.startswith(self.ILIDATA_PREFIX)
+            and topping_id not in self._resolved_files
+        ]
+
+        if missing_ids:
+            ilidata_index = self.ilidata_index()
+            if self.repository_index.is_running() and any(
+                topping_id[len(self.ILIDATA_PREFIX) :].strip() not in ilidata_index
+                for topping_id in missing_ids
+            ):
+                # the stored index might be outdated, so wait for the revalidation
+                self.repository_index.wait(self.timeout)
+                ilidata_index = self.ilidata_index()
+            downloads = []
+            for topping_id in missing_ids:
+                entry = ilidata_index.get(
+                    topping_id[len(self.ILIDATA_PREFIX) :].strip()
+                )
+                if not entry:
+                    continue
+                repository, relative_path = entry
+                if is_url(repository):
+                    url = repository_file(repository, relative_path)
+                    url_parts = urlsplit(url)
+                    downloads.append(
+                        (
+                            topping_id,
+                            url,
+                            os.path.join(
+                                self.cache_path,
+                                url_parts.netloc,
+                                *url_parts.path.strip("/").split("/"),
+                            ),
+                        )
+                    )
+                else:
+                    local_file_path = repository_file(repository, relative_path)
+                    if os.path.isfile(local_file_path):
+                        self._resolved_files[topping_id] = local_file_path
+                        self.file_resolved.emit(topping_id, local_file_path)
+
+            self._resolved_files.update(self.downloader.run(downloads, self.timeout))
+
+        return {
+            topping_id: self._resolved_files[topping_id]
+            for topping_id in topping_ids
+            if topping_id in self._resolved_files
+        }
+
+    def ilidata_index(self):
+        """
+        Returns the index of all the datasets in the configured repositories.
+        Outdated entries are served while they are revalidated in the background. Only when nothing is stored yet, it waits for the download.
+        """
+        repositories = repository_directories(self.base_configuration)
+        if not self.repository_index.is_fresh(repositories):
+            self.repository_index.revalidate(repositories)
+            if not self.repository_index.has_content(repositories):
+                self.repository_index.wait(self.timeout)
+        return self.repository_index.ilidata_index(repositories)
+
+    @staticmethod
+    def metaconfig_topping_ids(metaconfig):
+        """
+        Returns all the topping ids referenced in a metaconfig (ConfigParser).
+        """
+        topping_ids = []
+        if not metaconfig:
+            return topping_ids
+        if "ch.ehi.ili2db" in metaconfig.sections():
+            ili2db_metaconfig = metaconfig["ch.ehi.ili2db"]
+            for key in ["iliMetaAttrs", "preScript", "postScript"]:
+                if key in ili2db_metaconfig:
+                    topping_ids.extend(ili2db_metaconfig.get(key).split(";"))
+        if "CONFIGURATION" in metaconfig.sections():
+            configuration_section = metaconfig["CONFIGURATION"]
+            for key in [
+                "ch.interlis.referenceData",
+                "qgis.modelbaker.projecttopping",
+                "qgis.modelbaker.layertree",
+            ]:
+                if key in configuration_section:
+                    topping_ids.extend(configuration_section[key].split(";"))
+        if "qgis.modelbaker.qml" in metaconfig.sections():
+            topping_ids.extend(dict(metaconfig["qgis.modelbaker.qml"]).values())
+        return list(
+            dict.fromkeys(
+                [topping_id.strip() for topping_id in topping_ids if topping_id.strip()]
+            )
+        )
+
+    @staticmethod
+    def projecttopping_ids(projecttopping_data):
+        """
+        Returns all the topping ids referenced in the (parsed) project topping like QML, QLR or layout template files.
+        """
+        topping_ids = []
+        items = [projecttopping_data]
+        while items:
+            item = items.pop()
+            if isinstance(item, dict):
+                items.extend(item.values())
+            elif isinstance(item, list):
+                items.extend(item)
+            elif isinstance(item, str) and item.startswith(
+                ToppingFileResolver.ILIDATA_PREFIX
+            ):
+                topping_ids.append(item)
+        return list(dict.fromkeys(topping_ids))
+
+
+TOPPING_MANIFEST_FILE = "toppingmanifest.json"
+
+# the parts of the ilidata.xml that change on every generation even when the indexed files are the same
+ILIDATA_VOLATILE_CONTENT = re.compile(
+    rb'\s(?:TID|BID)="[^"]*"|<version>[^<]*</version>|<publishingDate>[^<]*</publishingDate>'
+)
+
+
+class ToppingManifest:
+    """
+    Keeps the content hashes of the files generated to a topping target folder in a manifest file (toppingmanifest.json).
+    The toppings are generated to a staging folder and synced to the target folder, where only the files with changed content are written.
+
+    Since the ilidata.xml gets new TIDs (and version) on every generation, it's compared without them and it's only written when its datasets or any of the other files changed.
+    """
+
+    FORMAT = 1
+
+    def __init__(self, target_dir):
+        self.target_dir = target_dir
+        self.path = os.path.join(target_dir, TOPPING_MANIFEST_FILE)
+        # relative path -> {"sha256", "size", "mtime"} of the file in the target folder
+        self.files = {}
+        self.load()
+
+    def load(self):
+        self.files = {}
+        try:
+            with open(self.path, encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return
+        if manifest.get("format") == self.FORMAT:
+            self.files = manifest.get("files", {})
+
+    def save(self):
+        os.makedirs(self.target_dir, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as manifest_file:
+            json.dump(
+                {"format": self.FORMAT, "files": self.files},
+                manifest_file,
+                indent=2,
+                sort_keys=True,
+            )
+
+    @staticmethod
+    def content_hash(relative_path, content):
+        if relative_path == ILIDATA_FILE:
+            content = ILIDATA_VOLATILE_CONTENT.sub(b"", content)
+        return hashlib.sha256(content).hexdigest()
+
+    def target_hash(self, relative_path):
+        """
+        Returns the content hash of the file in the target folder or None if it does not exist.
+        The file is only read when it has been changed since it's been written according to the manifest.
+        """
+        target_path = os.path.join(self.target_dir, *relative_path.split("/"))
+        try:
+            stat = os.stat(target_path)
+        except OSError:
+            return None
+        entry = self.files.get(relative_path)
+        if (
+            entry
+            and entry.get("size") == stat.st_size
+            and entry.get("mtime") == stat.st_mtime_ns
+        ):
+            return entry.get("sha256")
+        with open(target_path, "rb") as target_file:
+            return self.content_hash(relative_path, target_file.read())
+
+    def sync(self, staging_dir):
+        """
+        Writes the files of the staging folder with changed content to the target folder and removes the files that are not generated anymore (when they have not been modified since).
+        Returns the lists of the written, the unchanged and the removed files (relative paths).
+        """
+        staged_files = {}
+        for dirpath, _, filenames in os.walk(staging_dir):
+            for filename in filenames:
+                staged_path = os.path.join(dirpath, filename)
+                relative_path = os.path.relpath(staged_path, staging_dir).replace(
+                    os.sep, "/"
+                )
+                staged_files[relative_path] = staged_path
+
+        stale_files = [
+            relative_path
+            for relative_path in self.files
+            if relative_path not in staged_files
+        ]
+
+        written_files = []
+        unchanged_files = []
+        # the ilidata.xml is the last one, since it depends on the others
+        for relative_path in sorted(
+            staged_files, key=lambda relative_path: relative_path == ILIDATA_FILE
+        ):
+            with open(staged_files[relative_path], "rb") as staged_file:
+                content = staged_file.read()
+            content_hash = self.content_hash(relative_path, content)
+            target_path = os.path.join(self.target_dir, *relative_path.split("/"))
+
+            changed = self.target_hash(relative_path) != content_hash
+            if relative_path == ILIDATA_FILE and (written_files or stale_files):
+                changed = True
+
+            if changed:
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                with open(target_path, "wb") as target_file:
+                    target_file.write(content)
+                written_files.append(relative_path)
+            else:
+                unchanged_files.append(relative_path)
+
+            stat = os.stat(target_path)
+            self.files[relative_path] = {
+                "sha256": content_hash,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+            }
+
+        removed_files = []
+        for relative_path in stale_files:
+            if self.target_hash(relative_path) == self.files[relative_path].get(
+                "sha256"
+            ):
+                os.remove(os.path.join(self.target_dir, *relative_path.split("/")))
+                removed_files.append(relative_path)
+            del self.files[relative_path]
+
+        self.save()
+        return written_files, unchanged_files, removed_files
@@ -17,10 +17,17 @@
  ***************************************************************************/
 """
 
+import hashlib
+import pickle
 import re
+from collections import OrderedDict
 
 import yaml
 
+# use the libyaml based loaders when PyYAML is compiled with it
+LIBYAML_AVAILABLE = getattr(yaml, "__with_libyaml__", False)
+FastSafeLoader = yaml.CSafeLoader if LIBYAML_AVAILABLE else yaml.SafeLoader
+
 
 def extend_constructor(loader, node):
     """
@@ -51,47 +58,72 @@ class YamlReaderError(RuntimeError):
     pass
 
 
-class InheritanceLoader(yaml.Loader):
-    def __init__(self, stream):
-        yaml.Loader.__init__(self, stream)
-
+class InheritanceMixin:
     """
-    We override the main entry point
+    Resolves the '<<<' inheritance after the loading of the document.
+    It's used for the pure Python loader as well as for the libyaml based loader.
+
+    The resolved nodes are memoized by their identity, so an anchor used multiple times is resolved only once.
+    Resolved subtrees are treated as immutable and shared. Containers are only copied when they change (copy on write),
+    what means a base is never modified by the objects extending it.
     """
 
     def get_single_data(self):
-        data = yaml.Loader.get_single_data(self)
-        return self.recursive_extend(data)
+        data = super().get_single_data()
+        # node identity -> (node, resolved node). The node is kept to keep its identity valid.
+        self._resolved_nodes = {}
+        try:
+            return self.recursive_extend(data)
+        finally:
+            self._resolved_nodes = {}
 
     def recursive_extend(self, item):
+        if not isinstance(item, (list, dict, ExtendObject)):
+            return item
+
+        resolved_nodes = getattr(self, "_resolved_nodes", None)
+        if resolved_nodes is None:
+            resolved_nodes = self._resolved_nodes = {}
+        if id(item) in resolved_nodes:
+            return resolved_nodes[id(item)][1]
+
         if isinstance(item, list):
-            return [self.recursive_extend(data) for data in item]
+            resolved_list = [self.recursive_extend(data) for data in item]
+            result = (
+                item
+                if all(resolved is data for resolved, data in zip(resolved_list, item))
+                else resolved_list
+            )
         elif isinstance(item, dict):
             result = {}
             base = None
+            changed = False
             for key, value in item.items():
                 if isinstance(key, ExtendObject):
                     base = value
+                    changed = True
                 else:
                     result[key] = self.recursive_extend(value)
+                    changed = changed or result[key] is not value
 
             if base:
-                self.data_merge(result, base)
-
-            return result
-        elif isinstance(item, ExtendObject):
-            return "ay"
+                result = self.data_merge(result, self.recursive_extend(base))
+            elif not changed:
+                result = item
         else:
-            return item
+            result = "ay"
+
+        resolved_nodes[id(item)] = (item, result)
+        return result
 
     @classmethod
     def data_merge(cls, a, b):
         """merges b into a and return merged result
 
+        Neither a nor b are modified, the containers that change are copied and the rest is shared.
+
         NOTE: tuples and arbitrary objects are not handled as it is totally ambiguous what should happen"""
         key = None
-        # ## debug output
-        # sys.stderr.write("DEBUG: %s to %s\n" %(b,a))
         try:
             if (
                 a is None
@@ -105,18 +137,20 @@ class InheritanceLoader(yaml.Loader):
                 # lists can be only appended
                 if isinstance(b, list):
                     # merge lists
-                    a.extend(b)
+                    a = a + b
                 else:
                     # append to list
-                    a.append(b)
+                    a = a + [b]
             elif isinstance(a, dict):
                 # dicts must be merged
                 if isinstance(b, dict):
+                    merged = dict(a)
                     for key in b:
-                        if key in a:
-                            a[key] = cls.data_merge(a[key], b[key])
+                        if key in merged:
+                            merged[key] = cls.data_merge(merged[key], b[key])
                         else:
-                            a[key] = b[key]
+                            merged[key] = b[key]
+                    a = merged
                 else:
                     raise YamlReaderError(
                         'Cannot merge non-dict "{}" into dict "{}"'.format(b, a)
@@ -129,3 +163,71 @@ class InheritanceLoader(yaml.Loader):
                 % (e, key, b, a)
             )
         return a
+
+
+class InheritanceLoader(InheritanceMixin, yaml.Loader):
+    def __init__(self, stream):
+        yaml.Loader.__init__(self, stream)
+
+
+if LIBYAML_AVAILABLE:
+
+    class CInheritanceLoader(InheritanceMixin, yaml.CLoader):
+        """
+        The libyaml based variant of the InheritanceLoader. The parsing is done in C, only the '<<<' inheritance is resolved in Python.
+        """
+
+        def __init__(self, stream):
+            yaml.CLoader.__init__(self, stream)
+
+    yaml.add_implicit_resolver(
+        "tag:opengis.ch,2016:extend",
+        re.compile(r"^(?:<<<)$"),
+        ["<"],
+        Loader=CInheritanceLoader,
+    )
+    yaml.add_constructor(
+        "tag:opengis.ch,2016:extend", extend_constructor, Loader=CInheritanceLoader
+    )
+else:
+    CInheritanceLoader = InheritanceLoader
+
+
+class YamlCache:
+    """
+    Keeps the loaded documents by the hash of their content (and the loader), so an unchanged topping is not parsed again on the next wizard run.
+    The data is stored pickled, so every request gets its own copy and the cached data cannot be modified by the callers.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def load(self, stream, Loader=FastSafeLoader):
+        content = stream.read() if hasattr(stream, "read") else stream
+        content_bytes = content.encode("utf-8") if isinstance(content, str) else content
+        key = (hashlib.sha1(content_bytes).hexdigest(), Loader.__name__)
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return pickle.loads(self._entries[key])
+
+        data = yaml.load(content, Loader=Loader)
+        self._entries[key] = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return data
+
+    def clear(self):
+        self._entries.clear()
+
+
+# shared over all the wizard runs of the session
+yaml_cache = YamlCache()
+
+
+def safe_load_cached(stream):
+    """
+    Like yaml.safe_load but with the libyaml based loader (when available) and cached by the content.
+    """
+    return yaml_cache.load(stream, FastSafeLoader)